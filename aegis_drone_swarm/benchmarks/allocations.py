@@ -0,0 +1,65 @@
+"""
+Allocations per simulation step, and a check that they stay bounded.
+
+The threat_clusters wave is warmed up (bid storage and pools grow to
+size, the wave closes in), then profiled for --frames more frames with
+an AllocationProfiler, once as is and once in steady-state mode. The
+report shows net and peak bytes per stage; the run fails (exit status
+1) if steady-state net growth per step after warm-up exceeds --max-net
+bytes, i.e. if something accumulates frame after frame.
+
+    python -m benchmarks.allocations --warmup 400 --frames 400 --max-net 256
+    python -m benchmarks.allocations --sites     # where growth comes from
+"""
+
+import argparse
+import sys
+
+from simulation.alloc_profile import AllocationProfiler
+from simulation.scenarios import saturation_wave
+
+
+def profile(args, steady):
+    sim = saturation_wave(args.friendlies, args.enemies, args.groups, 15.0, args.seed)
+    sim.steady_state = steady
+    for _ in range(args.warmup):
+        sim.update()
+    profiler = AllocationProfiler(sites=args.sites)
+    profiler.start()
+    sim.alloc_profiler = profiler
+    try:
+        for _ in range(args.frames):
+            sim.update()
+    finally:
+        sim.alloc_profiler = None
+        profiler.stop()
+    return profiler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile and bound per-step allocations")
+    parser.add_argument("--friendlies", type=int, default=40)
+    parser.add_argument("--enemies", type=int, default=150)
+    parser.add_argument("--groups", type=int, default=15)
+    parser.add_argument("--warmup", type=int, default=400)
+    parser.add_argument("--frames", type=int, default=400)
+    parser.add_argument("--max-net", type=float, default=256.0, help="allowed net bytes per step")
+    parser.add_argument("--sites", action="store_true", help="attribute growth to source lines (slow)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failed = False
+    for steady in (False, True):
+        profiler = profile(args, steady)
+        print(f"{'steady-state' if steady else 'default'} mode")
+        print(profiler.report())
+        net = sum(profiler.metrics()["net_per_tick"].values())
+        if steady and net > args.max_net:
+            print(f"FAIL: {net:.1f} net bytes per step exceeds {args.max_net:.0f}")
+            failed = True
+        print()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
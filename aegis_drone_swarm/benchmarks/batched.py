@@ -0,0 +1,61 @@
+"""
+Episodes per second: default-scenario episodes run one by one through
+AegisSimulation against K worlds stepped together by BatchedAegis.
+
+Each mode runs until at least max(K, --episodes) episodes have finished
+(mission complete or --max-frames). Outcome means are printed next to
+the throughput so the two engines can be compared on the same scenario.
+
+    python -m benchmarks.batched --worlds 1,64,1024 --episodes 16
+"""
+
+import argparse
+import time
+
+from simulation.batched import BatchedAegis
+from simulation.simulation import AegisSimulation
+
+
+def run_sequential(episodes, max_frames, seed):
+    frames = neutralized = breached = 0
+    started = time.perf_counter()
+    for i in range(episodes):
+        sim = AegisSimulation(headless=True, verbose=False, seed=seed + i)
+        while not sim.mission_complete and sim.frame_count < max_frames:
+            sim.update()
+        frames += sim.frame_count
+        neutralized += sim.enemies_neutralized
+        breached += sim.enemies_breached
+    elapsed = time.perf_counter() - started
+    return elapsed, frames / episodes, neutralized / episodes, breached / episodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched multi-world stepping")
+    parser.add_argument("--worlds", default="1,64,1024", help="comma-separated K values")
+    parser.add_argument("--episodes", type=int, default=16)
+    parser.add_argument("--max-frames", type=int, default=4000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'engine':<12} {'K':>5} {'episodes':>9} {'seconds':>8} {'episodes/s':>11} "
+          f"{'frames/ep':>10} {'neutral/ep':>11} {'breach/ep':>10}")
+    elapsed, frames, neutralized, breached = run_sequential(args.episodes, args.max_frames, args.seed)
+    baseline = args.episodes / elapsed
+    print(f"{'one by one':<12} {1:>5} {args.episodes:>9} {elapsed:>8.2f} {baseline:>11.2f} "
+          f"{frames:>10.0f} {neutralized:>11.2f} {breached:>10.2f}")
+
+    for worlds in (int(k) for k in args.worlds.split(",")):
+        batch = BatchedAegis(worlds, seed=args.seed, max_frames=args.max_frames)
+        started = time.perf_counter()
+        batch.run(max(worlds, args.episodes))
+        elapsed = time.perf_counter() - started
+        stats = batch.metrics()
+        rate = stats["episodes"] / elapsed
+        print(f"{'batched':<12} {worlds:>5} {stats['episodes']:>9} {elapsed:>8.2f} {rate:>11.2f} "
+              f"{stats['frames_per_episode']:>10.0f} {stats['neutralized_per_episode']:>11.2f} "
+              f"{stats['breached_per_episode']:>10.2f}   x{rate / baseline:.1f}")
+
+
+if __name__ == "__main__":
+    main()
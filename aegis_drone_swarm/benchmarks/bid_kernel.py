@@ -0,0 +1,44 @@
+"""
+BidKernel against the scalar auction: milliseconds per flat auction (bid,
+resolve, assign) at each swarm size. Exactness is covered by
+tests/test_bid_kernel.py.
+
+    python -m benchmarks.bid_kernel --sizes 20x60 60x300 120x600
+"""
+
+import argparse
+import time
+
+from simulation.bid_kernel import BidKernel
+from simulation.scenarios import saturation_wave
+
+
+def auction_ms(friendlies, enemies, seed, kernel, ticks):
+    sim = saturation_wave(friendlies, enemies, max(1, enemies // 10), 15.0, seed)
+    sim.bid_kernel = BidKernel() if kernel else None
+    for _ in range(40):  # close in so pairs are within sensor range
+        sim.update()
+    started = time.perf_counter()
+    for _ in range(ticks):
+        sim.run_flat_auction()
+    return (time.perf_counter() - started) * 1000 / ticks, sim.total_bids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bid matrix kernel")
+    parser.add_argument("--sizes", nargs="+", default=["20x60", "60x300", "120x600"], help="FRIENDLIESxENEMIES")
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'swarm':>9} {'scalar ms':>10} {'kernel ms':>10} {'speedup':>8} {'bids/tick':>10}")
+    for size in args.sizes:
+        friendlies, enemies = (int(n) for n in size.split("x"))
+        scalar, bids = auction_ms(friendlies, enemies, args.seed, False, args.ticks)
+        kernel, kernel_bids = auction_ms(friendlies, enemies, args.seed, True, args.ticks)
+        assert bids == kernel_bids
+        print(f"{size:>9} {scalar:>10.1f} {kernel:>10.1f} {scalar / kernel:>7.1f}x {bids / args.ticks:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
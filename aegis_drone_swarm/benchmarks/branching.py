@@ -0,0 +1,81 @@
+"""
+Cost of branching a live simulation versus re-creating the scenario, and
+wall time of K what-if branches run through fork and copy.
+
+The scenario is benchmarks.protocol_frames' engagement advanced to
+--warmup frames; re-creating it means building it and replaying those
+frames.
+
+    python -m benchmarks.branching --variants 4 --frames 600
+"""
+
+import argparse
+import time
+
+from benchmarks.protocol_frames import build
+from simulation.branching import clone, run_branches
+from simulation.squads import SquadCoordinator
+from simulation.threat_clusters import ThreatClusterer
+
+
+def advance(sim, frames):
+    for _ in range(frames):
+        sim.update()
+    return sim
+
+
+def use_squads(sim):
+    sim.squad_coordinator = SquadCoordinator()
+
+
+def use_clusters(sim):
+    sim.threat_clusters = ThreatClusterer()
+
+
+def discrete_engagement(sim):
+    sim.engagement_mode = "discrete"
+
+
+VARIANTS = [("flat", None), ("squads", use_squads), ("clusters", use_clusters),
+            ("discrete", discrete_engagement)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark what-if branching")
+    parser.add_argument("--friendlies", type=int, default=60)
+    parser.add_argument("--enemies", type=int, default=120)
+    parser.add_argument("--warmup", type=int, default=600)
+    parser.add_argument("--variants", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    sim = advance(build(args.friendlies, args.enemies, args.seed), args.warmup)
+    recreate = time.perf_counter() - started
+    state = (sim.frame_count, sim.enemies_neutralized, sim.rng.getstate())
+
+    started = time.perf_counter()
+    run_branches(sim, {"noop": None}, frames=0, method="fork")
+    fork = time.perf_counter() - started
+    started = time.perf_counter()
+    clone(sim)
+    copied = time.perf_counter() - started
+    print(f"re-create scenario {recreate * 1000:9.1f} ms")
+    print(f"fork branch        {fork * 1000:9.1f} ms  ({recreate / fork:.0f}x cheaper)")
+    print(f"copy branch        {copied * 1000:9.1f} ms  ({recreate / copied:.0f}x cheaper)")
+
+    variants = dict((VARIANTS * args.variants)[:args.variants])
+    for method in ("fork", "copy"):
+        started = time.perf_counter()
+        results = run_branches(sim, variants, frames=args.frames, method=method)
+        elapsed = time.perf_counter() - started
+        print(f"\n{method}: {len(variants)} branches x {args.frames} frames in {elapsed:.2f}s")
+        for name, result in results.items():
+            print(f"  {name:<9} neutralized {result['neutralized']:>3}  breached {result['breached']:>3}  "
+                  f"losses {result['friendly_losses']:>3}  ({result['wall_s']:.2f}s)")
+    assert state == (sim.frame_count, sim.enemies_neutralized, sim.rng.getstate()), "parent run was disturbed"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Allocation rate and GC pauses during a long saturation run.
+
+Hostile waves are redeployed whenever the spawn queue drains, so drones
+are spawned and destroyed constantly. Reports, per window of frames,
+newly constructed drones, pool reuses, live memory blocks, GC
+collections and GC pause time.
+
+    python -m benchmarks.churn --frames 20000 --window 2000 [--no-pool]
+"""
+
+import argparse
+import gc
+import sys
+import time
+
+from simulation.simulation import AegisSimulation
+
+
+class GCTimer:
+    def __init__(self):
+        self.pauses = []
+        self._started = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            self.pauses.append(time.perf_counter() - self._started)
+            self._started = None
+
+    def take(self):
+        pauses, self.pauses = self.pauses, []
+        return pauses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure allocation churn under constant spawn/kill")
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--window", type=int, default=2000)
+    parser.add_argument("--wave", type=int, default=6, help="hostiles per redeployment")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-pool", action="store_true", help="disable drone recycling for comparison")
+    args = parser.parse_args()
+
+    sim = AegisSimulation(headless=True, verbose=False, seed=args.seed)
+    sim.pool.enabled = not args.no_pool
+    sim.auto_spawn = True  # replace friendly losses so the run never ends
+
+    timer = GCTimer()
+    gc.callbacks.append(timer)
+
+    print(f"{'frames':>12} {'new drones':>10} {'reused':>7} {'live blocks':>11} "
+          f"{'GCs':>5} {'GC ms':>7} {'max ms':>7} {'drones':>7}")
+    started = time.perf_counter()
+    created, reused = sim.pool.created, sim.pool.reused
+    collections = sum(stat["collections"] for stat in gc.get_stats())
+    for frame in range(1, args.frames + 1):
+        if not sim.spawn_queue:
+            sim.add_enemy_drones(args.wave)
+        sim.mission_complete = False
+        sim.update()
+        if frame % args.window == 0:
+            now_collections = sum(stat["collections"] for stat in gc.get_stats())
+            pauses = timer.take()
+            print(f"{frame - args.window:>5}-{frame:<6} {sim.pool.created - created:>10} "
+                  f"{sim.pool.reused - reused:>7} {sys.getallocatedblocks():>11} "
+                  f"{now_collections - collections:>5} {sum(pauses) * 1000:>7.2f} "
+                  f"{max(pauses, default=0) * 1000:>7.3f} "
+                  f"{len(sim.friendly_drones) + len(sim.enemy_drones):>7}")
+            created, reused, collections = sim.pool.created, sim.pool.reused, now_collections
+    elapsed = time.perf_counter() - started
+    gc.callbacks.remove(timer)
+    print(f"neutralized={sim.enemies_neutralized} breached={sim.enemies_breached}  "
+          f"{args.frames / elapsed:,.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
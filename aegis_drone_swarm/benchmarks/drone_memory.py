@@ -0,0 +1,55 @@
+"""
+Memory per drone, measured with tracemalloc.
+
+Builds N friendlies and N enemies; each friendly runs an auction over a
+local group of four enemies so its bid storage is populated the way it
+is during a protocol tick.
+
+    python -m benchmarks.drone_memory --count 5000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+
+from simulation.models.drone import Drone
+
+
+def build(count, rng):
+    friendlies, enemies = [], []
+    for i in range(count):
+        x, y = rng.uniform(100, 1100), rng.uniform(100, 700)
+        friendly = Drone(x, y, "friendly", i, rng=rng)
+        group = [Drone(x + rng.uniform(-80, 80), y + rng.uniform(-80, 80), "enemy", i * 4 + j, rng=rng)
+                 for j in range(4)]
+        friendly.participate_in_auction(group, [friendly])
+        friendlies.append(friendly)
+        enemies.extend(group)
+    return friendlies, enemies
+
+
+def measure(count, seed):
+    rng = random.Random(seed)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    friendlies, enemies = build(count, rng)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    drones = len(friendlies) + len(enemies)
+    return (after - before) / drones, drones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory per Drone")
+    parser.add_argument("--count", type=int, default=5000, help="friendlies (enemies are 4x)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    per_drone, drones = measure(args.count, args.seed)
+    print(f"{drones} drones: {per_drone:,.0f} bytes per drone (incl. populated bids)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Engagement detection cost and tunnelling: the legacy per-friendly enemy
+scan with an end-of-frame distance test versus the swept detector.
+
+Each friendly pursues a random enemy; drones move `--step` px per frame,
+as they would in a fast-forward mode.
+
+    python -m benchmarks.engagement --counts 100 1000 5000 --step 30
+"""
+
+import argparse
+import math
+import random
+import time
+
+from simulation.engagement import EngagementDetector
+from simulation.models.drone import Drone
+
+
+def make_scene(count, step, rng):
+    friendlies, enemies = [], []
+    for i in range(count):
+        enemy = Drone(rng.uniform(0, 20000), rng.uniform(0, 20000), "enemy", i, rng=rng)
+        enemies.append(enemy)
+    for i, enemy in enumerate(enemies):
+        # Start near the target so a fair share of pairs meet within the frame
+        angle = rng.uniform(0, 2 * math.pi)
+        gap = rng.uniform(0, 3 * step)
+        friendly = Drone(enemy.x + gap * math.cos(angle), enemy.y + gap * math.sin(angle), "friendly", i, rng=rng)
+        friendly.assigned_target = enemy.id
+        friendlies.append(friendly)
+    for friendly, enemy in zip(friendlies, enemies):
+        # Friendly heads through the enemy's position; enemy drifts sideways
+        dx, dy = enemy.x - friendly.x, enemy.y - friendly.y
+        norm = math.hypot(dx, dy) or 1.0
+        friendly.prev_x, friendly.prev_y = friendly.x, friendly.y
+        friendly.x += dx / norm * step
+        friendly.y += dy / norm * step
+        heading = rng.uniform(0, 2 * math.pi)
+        enemy.prev_x, enemy.prev_y = enemy.x, enemy.y
+        enemy.x += math.cos(heading) * step * 0.3
+        enemy.y += math.sin(heading) * step * 0.3
+    return friendlies, enemies
+
+
+def legacy_scan(friendlies, enemies):
+    hits = 0
+    for friendly in friendlies:
+        for enemy in enemies:
+            if enemy.health > 0 and enemy.id == friendly.assigned_target:
+                if friendly.distance_to(enemy) <= friendly.engagement_range:
+                    hits += 1
+                break
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark engagement detection")
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--step", type=float, default=30.0, help="px moved per frame")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'pairs':>6} {'legacy ms':>10} {'swept ms':>9} {'legacy hits':>12} {'swept hits':>11} {'narrow tests':>13}")
+    for count in args.counts:
+        friendlies, enemies = make_scene(count, args.step, random.Random(args.seed))
+        started = time.perf_counter()
+        legacy_hits = legacy_scan(friendlies, enemies)
+        legacy_ms = (time.perf_counter() - started) * 1000
+
+        detector = EngagementDetector(Drone.engagement_range)
+        started = time.perf_counter()
+        contacts = detector.detect(friendlies, enemies)
+        swept_ms = (time.perf_counter() - started) * 1000
+        print(f"{count:>6} {legacy_ms:>10.2f} {swept_ms:>9.2f} {legacy_hits:>12} {len(contacts):>11} "
+              f"{detector.narrow_tests:>13}")
+
+
+if __name__ == "__main__":
+    main()
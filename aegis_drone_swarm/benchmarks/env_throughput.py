@@ -0,0 +1,52 @@
+"""
+Environment steps per second for AegisEnv and VectorAegisEnv.
+
+    python -m benchmarks.env_throughput --steps 2000 --num-envs 16
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from simulation.env import AegisEnv, VectorAegisEnv
+
+
+def bench_single(steps, seed):
+    env = AegisEnv()
+    env.reset(seed)
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    for _ in range(steps):
+        actions = np.where(rng.random(env.max_friendlies) < 0.1,
+                           rng.integers(0, env.max_enemies, env.max_friendlies), -1)
+        _, _, terminated, truncated, _ = env.step(actions)
+        if terminated or truncated:
+            env.reset()
+    return steps / (time.perf_counter() - started)
+
+
+def bench_vector(num_envs, steps, seed):
+    venv = VectorAegisEnv(num_envs, seed=seed)
+    venv.reset()
+    started = time.perf_counter()
+    for _ in range(steps):
+        venv.step()
+    return steps * num_envs / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure AEGIS environment throughput")
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--num-envs", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    single = bench_single(args.steps, args.seed)
+    print(f"AegisEnv:            {single:,.0f} env steps/s ({single * 8:,.0f} sim frames/s)")
+    vector = bench_vector(args.num_envs, max(1, args.steps // args.num_envs), args.seed)
+    print(f"VectorAegisEnv x{args.num_envs:<3}: {vector:,.0f} env steps/s")
+
+
+if __name__ == "__main__":
+    main()
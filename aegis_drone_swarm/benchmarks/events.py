@@ -0,0 +1,72 @@
+"""
+Engagement and breach checking per frame: the swept detector polling
+every pursuit and every enemy each frame against the event-driven
+ContactSchedule testing only pairs and enemies whose time-to-contact or
+time-to-breach bound has come due.
+
+Both modes fly the same threat_clusters saturation wave from the same
+seed; "tests/frame" counts precise pursuit tests plus breach tests
+(swept: narrow-phase tests plus one breach test per enemy), and
+"check ms/frame" is the wall time of check_engagements + check_breaches.
+
+    python -m benchmarks.events --friendlies 40 --enemies 150 --frames 1500 --dt 0.1
+"""
+
+import argparse
+import time
+
+from simulation.scenarios import saturation_wave
+
+
+def run(mode, args):
+    sim = saturation_wave(args.friendlies, args.enemies, args.groups, 15.0, args.seed)
+    sim.engagement_mode = mode
+    spent = 0.0
+    breach_tests = 0
+    for name in ("check_engagements", "check_breaches"):
+        check = getattr(sim, name)
+
+        def timed(check=check):
+            nonlocal spent
+            started = time.perf_counter()
+            check()
+            spent += time.perf_counter() - started
+        setattr(sim, name, timed)
+
+    frames = 0
+    while frames < args.frames and not sim.mission_complete:
+        if mode == "swept":
+            breach_tests += sum(1 for enemy in sim.enemy_drones if enemy.health > 0)
+        sim.update(args.dt)
+        frames += 1
+    if mode == "swept":
+        tests = sim.engagement_detector.narrow_tests + breach_tests
+    else:
+        tests = sim.contact_schedule.checks
+    return sim, frames, tests, spent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event-driven engagement checks")
+    parser.add_argument("--friendlies", type=int, default=40)
+    parser.add_argument("--enemies", type=int, default=150)
+    parser.add_argument("--groups", type=int, default=15)
+    parser.add_argument("--frames", type=int, default=1500)
+    parser.add_argument("--dt", type=float, default=1 / 60, help="seconds per update")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'updates':>8} {'neutralized':>12} {'breached':>9} {'lost':>5} "
+          f"{'tests/frame':>12} {'check ms/frame':>15}")
+    for mode in ("swept", "event"):
+        sim, frames, tests, spent = run(mode, args)
+        print(f"{mode:<6} {frames:>8} {sim.enemies_neutralized:>12} {sim.enemies_breached:>9} "
+              f"{sim.friendly_losses:>5} {tests / frames:>12.1f} {spent * 1000 / frames:>15.3f}")
+        if mode == "event":
+            stats = sim.contact_schedule.metrics()
+            print(f"       {stats['scheduled']} events scheduled, {stats['stale']} stale, "
+                  f"{stats['pending']} pending")
+
+
+if __name__ == "__main__":
+    main()
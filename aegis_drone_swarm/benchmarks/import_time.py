@@ -0,0 +1,60 @@
+"""
+Cold start of a fresh interpreter: importing the simulation core, building
+a headless simulation and taking a first step, as every process-pool
+worker does. Each probe runs in its own subprocess so nothing is cached
+in-process; the rendering import is measured separately for comparison.
+
+    python -m benchmarks.import_time --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROBES = {
+    "core import": "import simulation.simulation",
+    "headless start": (
+        "from simulation.simulation import AegisSimulation\n"
+        "AegisSimulation(headless=True, verbose=False, seed=0).update()"
+    ),
+    "rendering import": "import simulation.rendering",
+}
+
+REPORT = (
+    "\nimport sys\n"
+    "print(int('pygame' in sys.modules), int('numpy' in sys.modules))"
+)
+
+
+def probe(code, root):
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1", SDL_VIDEODRIVER="dummy")
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code + REPORT], cwd=root, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    elapsed = (time.perf_counter() - started) * 1000
+    pygame_loaded, numpy_loaded = out.split()[-2:]
+    return elapsed, pygame_loaded == "1", numpy_loaded == "1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interpreter cold start")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    baseline = statistics.median(probe("pass", root)[0] for _ in range(args.runs))
+    print(f"bare interpreter: {baseline:.1f} ms (subtracted below)")
+    print(f"{'probe':<17} {'median ms':>10} {'min ms':>8} {'pygame':>7} {'numpy':>6}")
+    for name, code in PROBES.items():
+        results = [probe(code, root) for _ in range(args.runs)]
+        times = [elapsed - baseline for elapsed, _, _ in results]
+        _, pygame_loaded, numpy_loaded = results[-1]
+        print(f"{name:<17} {statistics.median(times):>10.1f} {min(times):>8.1f} "
+              f"{'yes' if pygame_loaded else 'no':>7} {'yes' if numpy_loaded else 'no':>6}")
+
+
+if __name__ == "__main__":
+    main()
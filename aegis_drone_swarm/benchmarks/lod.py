@@ -0,0 +1,67 @@
+"""
+Update cost with and without level-of-detail sleeping and kinematic
+enemies, in a wide theatre: half the inbound wave hits one sector, so
+most patrols along the guard line have nothing in range, and half
+crosses an undefended flank far from any friendly.
+
+    python -m benchmarks.lod --friendlies 400 --enemies 200 --frames 600
+"""
+
+import argparse
+import time
+
+from simulation.lod import LevelOfDetail
+from simulation.models.drone import Drone
+from simulation.simulation import AegisSimulation
+
+
+def build(friendlies, enemies, seed, width=12000, height=800, sector=1500, flank=2000):
+    sim = AegisSimulation(width=width, height=height, headless=True, verbose=False, seed=seed)
+    sim.spawn_queue = []
+    sim.friendly_drones = []
+    sim.enemy_drones = []
+    rng = sim.rng
+    for _ in range(friendlies):
+        x, y = rng.uniform(200, width - flank), 550  # on the guard line
+        friendly = Drone(x, y, "friendly", sim.allocate_friendly_id(), rng=rng)
+        friendly.patrol_point = (x, y)
+        sim.friendly_drones.append(friendly)
+    for i in range(enemies):
+        x = rng.uniform(200, sector) if i % 2 == 0 else rng.uniform(width - flank + 500, width - 200)
+        enemy = Drone(x, rng.uniform(30, 200), "enemy", sim.allocate_enemy_id(), rng=rng)
+        enemy.target_x, enemy.target_y = x, height - 100
+        sim.enemy_drones.append(enemy)
+    return sim
+
+
+def run(sim, frames):
+    started = time.perf_counter()
+    for _ in range(frames):
+        sim.update()
+    return (time.perf_counter() - started) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark level-of-detail updates")
+    parser.add_argument("--friendlies", type=int, default=400)
+    parser.add_argument("--enemies", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for use_lod in (False, True):
+        sim = build(args.friendlies, args.enemies, args.seed)
+        if use_lod:
+            sim.lod = LevelOfDetail()
+        # Let the patrols settle on their guard points first
+        run(sim, 240)
+        ms = run(sim, args.frames)
+        label = "lod" if use_lod else "full"
+        detail = ""
+        if sim.lod is not None:
+            detail = f"  asleep {sim.lod.sleeping}/{len(sim.friendly_drones)}  kinematic {sim.lod.kinematic}/{len(sim.enemy_drones)}"
+        print(f"{label:<5} {ms:8.2f} ms/frame{detail}")
+
+
+if __name__ == "__main__":
+    main()
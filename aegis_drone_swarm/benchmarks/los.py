@@ -0,0 +1,85 @@
+"""
+Line-of-sight throughput against hundreds of obstacles, and what
+occlusion adds to a protocol tick.
+
+Queries: every friendly x enemy pair in sensor range is checked per
+round, batched through World.visibility() and one pair at a time through
+World.line_of_sight(); queries/s counts pairs in range.
+
+Protocol: the threat_clusters saturation scenario is stepped with and
+without the world, and the cost of update_sight() is reported against
+the protocol time.
+
+    python -m benchmarks.los --obstacles 400 --friendlies 100 --enemies 200
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from simulation.models.drone import Drone
+from simulation.models.world import random_world
+from simulation.scenarios import saturation_wave
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark line-of-sight queries")
+    parser.add_argument("--obstacles", type=int, default=400)
+    parser.add_argument("--friendlies", type=int, default=100)
+    parser.add_argument("--enemies", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    world = random_world(1200, 800, args.obstacles, rng, min_size=10, max_size=40)
+    sources = np.array([(rng.uniform(0, 1200), rng.uniform(300, 700)) for _ in range(args.friendlies)])
+    targets = np.array([(rng.uniform(0, 1200), rng.uniform(0, 600)) for _ in range(args.enemies)])
+    pairs = [(sx, sy, tx, ty) for sx, sy in sources.tolist() for tx, ty in targets.tolist()
+             if (sx - tx) ** 2 + (sy - ty) ** 2 <= Drone.sensor_range ** 2]
+
+    world.visibility(sources, targets)  # build the index and neighbourhood cache
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        visible = world.visibility(sources, targets)
+    batched = (time.perf_counter() - started) / args.rounds
+    started = time.perf_counter()
+    clear = sum(world.line_of_sight(*pair) for pair in pairs)
+    single = time.perf_counter() - started
+    if clear != int(visible.sum()):
+        raise AssertionError(f"batched and per-pair queries disagree: {int(visible.sum())} vs {clear}")
+
+    print(f"{args.obstacles} obstacles, {args.friendlies} x {args.enemies} drones, "
+          f"{len(pairs)} pairs in range, {clear} clear")
+    print(f"{'query':<10} {'ms/round':>9} {'queries/s':>11}")
+    print(f"{'batched':<10} {batched * 1000:>9.2f} {len(pairs) / batched:>11.0f}")
+    print(f"{'per-pair':<10} {single * 1000:>9.2f} {len(pairs) / single:>11.0f}")
+
+    print(f"\n{'protocol':<10} {'ms/tick':>8} {'sight ms':>9} {'neutralized':>12} {'breached':>9}")
+    for mode in ("open", "occluded"):
+        sim = saturation_wave(args.friendlies, args.enemies, max(1, args.enemies // 8), 25.0, args.seed)
+        sight = 0.0
+        if mode == "occluded":
+            sim.world = random_world(sim.width, sim.height, args.obstacles, random.Random(args.seed),
+                                     min_size=10, max_size=40)
+            update_sight = sim.world.update_sight
+
+            def timed(friendlies, enemies):
+                nonlocal sight
+                started = time.perf_counter()
+                update_sight(friendlies, enemies)
+                sight += time.perf_counter() - started
+            sim.world.update_sight = timed
+        for _ in range(args.frames):
+            sim.update()
+        ticks = max(1, len(sim.metrics.columns()["frame"]))
+        ms = sim.metrics.columns()["protocol_ms"].sum() / ticks
+        print(f"{mode:<10} {ms:>8.2f} {sight * 1000 / ticks:>9.2f} "
+              f"{sim.enemies_neutralized:>12} {sim.enemies_breached:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Frame-time spikes of the all-at-once protocol versus the amortized
+ProtocolScheduler.
+
+Builds a larger engagement than the default scenario and records the
+wall time of every update() in each mode.
+
+    python -m benchmarks.protocol_frames --friendlies 60 --enemies 120 --budget-ms 2
+"""
+
+import argparse
+import time
+
+from simulation.models.drone import Drone
+from simulation.scheduler import ProtocolScheduler
+from simulation.simulation import AegisSimulation
+
+
+def build(friendlies, enemies, seed):
+    sim = AegisSimulation(headless=True, verbose=False, seed=seed)
+    sim.spawn_queue = []
+    sim.friendly_drones = []
+    sim.enemy_drones = []
+    rng = sim.rng
+    for _ in range(friendlies):
+        friendly = Drone(rng.uniform(100, 1100), rng.uniform(400, 600), "friendly", sim.allocate_friendly_id(), rng=rng)
+        friendly.patrol_point = (friendly.x, friendly.y)
+        sim.friendly_drones.append(friendly)
+    for i in range(enemies):
+        sim.spawn_enemy_drone(i)
+    return sim
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(sim, frames):
+    times = []
+    for _ in range(frames):
+        started = time.perf_counter()
+        sim.update()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark protocol frame-time spikes")
+    parser.add_argument("--friendlies", type=int, default=60)
+    parser.add_argument("--enemies", type=int, default=120)
+    parser.add_argument("--frames", type=int, default=480)
+    parser.add_argument("--budget-ms", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'neutralized':>12}")
+    for mode in ("classic", "scheduled"):
+        sim = build(args.friendlies, args.enemies, args.seed)
+        if mode == "scheduled":
+            sim.protocol_scheduler = ProtocolScheduler(budget_ms=args.budget_ms)
+        times = measure(sim, args.frames)
+        print(f"{mode:<10} {percentile(times, 0.5):>8.2f} {percentile(times, 0.99):>8.2f} {max(times):>8.2f} "
+              f"{sim.enemies_neutralized:>12}")
+        if sim.protocol_scheduler is not None:
+            print(f"           {sim.protocol_scheduler.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Sweep time with the content-addressed results cache: a seeds x bid
+weight sweep run cold (every episode simulated), then warm (every
+episode a hit), then by several worker processes at once over a fresh
+cache, checking every worker saw identical results.
+
+    python -m benchmarks.results_cache --seeds 4 --commitment 0.2 0.5 --workers 3
+"""
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from simulation.results_cache import ResultsCache, scenario_config
+
+
+def sweep(args):
+    return [scenario_config(seed=seed, max_frames=args.max_frames, bid_weights={"commitment": weight})
+            for weight in args.commitment for seed in range(args.seeds)]
+
+
+def worker(directory, configs, max_bytes):
+    cache = ResultsCache(directory, max_bytes)
+    results = [metrics for metrics, _ in cache.run_batch(configs)]
+    return results, cache.metrics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scenario results cache")
+    parser.add_argument("--seeds", type=int, default=4)
+    parser.add_argument("--commitment", type=float, nargs="+", default=[0.2, 0.5])
+    parser.add_argument("--max-frames", type=int, default=4000)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--max-bytes", type=int, default=64 * 1024 * 1024)
+    args = parser.parse_args()
+    configs = sweep(args)
+
+    print(f"{'run':<10} {'episodes':>9} {'seconds':>8} {'hits':>5} {'misses':>7} {'stores':>7} "
+          f"{'evictions':>10} {'entries':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultsCache(directory, args.max_bytes)
+        for run in ("cold", "warm"):
+            before = cache.metrics()
+            started = time.perf_counter()
+            cache.run_batch(configs)
+            elapsed = time.perf_counter() - started
+            stats = cache.metrics()
+            print(f"{run:<10} {len(configs):>9} {elapsed:>8.2f} {stats['hits'] - before['hits']:>5} "
+                  f"{stats['misses'] - before['misses']:>7} {stats['stores'] - before['stores']:>7} "
+                  f"{stats['evictions']:>10} {stats['entries']:>8}")
+
+        # A cache too small for the sweep keeps only the most recent entries
+        small = ResultsCache(directory, max_bytes=cache.metrics()["bytes"] // 2)
+        small.evict()
+        stats = small.metrics()
+        print(f"{'half size':<10} {'':>9} {'':>8} {'':>5} {'':>7} {'':>7} {stats['evictions']:>10} "
+              f"{stats['entries']:>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        with ProcessPoolExecutor(args.workers) as pool:
+            futures = [pool.submit(worker, directory, configs, args.max_bytes) for _ in range(args.workers)]
+            outcomes = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+        agree = all(results == outcomes[0][0] for results, _ in outcomes)
+        hits = sum(stats["hits"] for _, stats in outcomes)
+        misses = sum(stats["misses"] for _, stats in outcomes)
+        stores = sum(stats["stores"] for _, stats in outcomes)
+        entries = ResultsCache(directory).metrics()["entries"]
+        print(f"{f'{args.workers} workers':<10} {len(configs) * args.workers:>9} {elapsed:>8.2f} {hits:>5} "
+              f"{misses:>7} {stores:>7} {0:>10} {entries:>8}   results agree: {agree}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Local load test for the simulation control server.
+
+Starts a server subprocess on a temporary Unix socket (or connects to
+--port), opens several client sessions that pipeline requests, and reports
+commands per second and latency percentiles.
+
+    python -m benchmarks.server_load --clients 16 --depth 32 --duration 5
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from simulation.server import AegisClient
+
+MIX = [("ping", {}), ("observe", {}), ("step", {"frames": 1}), ("ping", {})]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def client_worker(connect, depth, deadline, latencies):
+    client = await connect()
+    in_flight = set()
+    counter = 0
+    try:
+        while time.perf_counter() < deadline:
+            while len(in_flight) < depth:
+                cmd, args = MIX[counter % len(MIX)]
+                counter += 1
+                sent = time.perf_counter()
+                future = client.send(cmd, **args)
+                future.sent_at = sent
+                in_flight.add(future)
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            now = time.perf_counter()
+            for future in done:
+                latencies.append(now - future.sent_at)
+        if in_flight:
+            await asyncio.wait(in_flight)
+    finally:
+        await client.close()
+
+
+async def run_load(connect, clients, depth, duration):
+    latencies = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(client_worker(connect, depth, deadline, latencies) for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    stats_client = await connect()
+    stats = await stats_client.call("stats")
+    await stats_client.close()
+    return latencies, elapsed, stats
+
+
+def spawn_server(socket_path, max_batch):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "simulation.server", "--unix", socket_path, "--max-batch", str(max_batch)],
+        stdout=subprocess.DEVNULL,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    for _ in range(200):
+        if os.path.exists(socket_path):
+            return process
+        time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the AEGIS control server")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=16, help="pipelined requests in flight per client")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--port", type=int, help="use an already running TCP server")
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+
+    process = None
+    tmpdir = tempfile.TemporaryDirectory()
+    if args.port:
+        connect = lambda: AegisClient.connect(args.host, args.port)
+    else:
+        socket_path = os.path.join(tmpdir.name, "aegis.sock")
+        process = spawn_server(socket_path, args.max_batch)
+        connect = lambda: AegisClient.connect(unix_path=socket_path)
+
+    try:
+        latencies, elapsed, stats = asyncio.run(run_load(connect, args.clients, args.depth, args.duration))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+        tmpdir.cleanup()
+
+    latencies.sort()
+    ms = lambda seconds: seconds * 1000
+    print(f"clients={args.clients} depth={args.depth} duration={elapsed:.2f}s")
+    print(f"commands: {len(latencies)}  throughput: {len(latencies) / elapsed:,.0f} cmd/s")
+    print(f"latency ms  p50={ms(percentile(latencies, 0.50)):.2f}  p95={ms(percentile(latencies, 0.95)):.2f}  "
+          f"p99={ms(percentile(latencies, 0.99)):.2f}  max={ms(latencies[-1] if latencies else 0):.2f}")
+    if stats["batches_processed"]:
+        print(f"server batches: {stats['batches_processed']}  "
+              f"avg batch size: {stats['commands_processed'] / stats['batches_processed']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
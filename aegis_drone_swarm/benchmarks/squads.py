@@ -0,0 +1,77 @@
+"""
+Coordination work and interception quality of the flat swarm-wide
+auction versus hierarchical squads, at growing swarm sizes.
+
+The theatre widens with the swarm so density stays comparable; enemies
+come in across the whole width. Each run steps until the first bid (the
+wave reaching sensor range) and then measures `--frames` frames, so
+both modes are compared while there is something to coordinate. Work is
+counted on the same basis in both modes (see simulation.squads): peers
+examined by scoring, target selection and resolution, plus clustering
+and the top-level auction in hierarchical mode. Quality is what each
+mode neutralized and let through over the same seeded run.
+
+    python -m benchmarks.squads --sizes 32 64 128 --frames 2400
+"""
+
+import argparse
+
+from simulation.models.drone import Drone
+from simulation.simulation import AegisSimulation
+from simulation.squads import SquadCoordinator
+
+MAX_APPROACH_FRAMES = 3600  # give up waiting for the wave after a minute
+
+def build(friendlies, enemies, seed, height=800):
+    width = max(1200, friendlies * 15)
+    sim = AegisSimulation(width=width, height=height, headless=True, verbose=False, seed=seed)
+    sim.spawn_queue = []
+    sim.friendly_drones = []
+    sim.enemy_drones = []
+    rng = sim.rng
+    for _ in range(friendlies):
+        friendly = Drone(rng.uniform(100, width - 100), rng.uniform(450, 600), "friendly",
+                         sim.allocate_friendly_id(), rng=rng)
+        friendly.patrol_point = (friendly.x, friendly.y)
+        sim.friendly_drones.append(friendly)
+    for _ in range(enemies):
+        enemy = Drone(rng.uniform(100, width - 100), rng.uniform(30, 200), "enemy",
+                      sim.allocate_enemy_id(), rng=rng)
+        enemy.target_x, enemy.target_y = rng.uniform(100, width - 100), height - 100
+        sim.enemy_drones.append(enemy)
+    sim.metrics.resync(friendlies, enemies)
+    return sim
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark flat versus squad coordination")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--enemy-ratio", type=float, default=1.0)
+    parser.add_argument("--frames", type=int, default=2400)
+    parser.add_argument("--squad-size", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>5} {'mode':<13} {'work/tick':>10} {'ms/tick':>8} {'neutralized':>12} "
+          f"{'breached':>9} {'lost':>5}")
+    for size in args.sizes:
+        for mode in ("flat", "hierarchical"):
+            sim = build(size, int(size * args.enemy_ratio), args.seed)
+            if mode == "hierarchical":
+                sim.squad_coordinator = SquadCoordinator(max_squad_size=args.squad_size)
+            while sim.total_bids == 0 and sim.frame_count < MAX_APPROACH_FRAMES:
+                sim.update()
+            contact = sim.frame_count
+            for _ in range(args.frames):
+                sim.update()
+            columns = sim.metrics.columns()
+            engaged = columns["frame"] > contact
+            ticks = max(1, engaged.sum())
+            work = columns["coordination_work"][engaged].sum() / ticks
+            ms = (columns["auction_ms"] + columns["resolve_ms"] + columns["assign_ms"])[engaged].sum() / ticks
+            print(f"{size:>5} {mode:<13} {work:>10.0f} {ms:>8.2f} {sim.enemies_neutralized:>12} "
+                  f"{sim.enemies_breached:>9} {sim.friendly_losses:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Bytes per frame of the delta-compressed state stream versus naive
+full-state serialization (JSON, and binary keyframes every frame).
+
+    python -m benchmarks.stream_bandwidth --frames 600 --large 5000
+"""
+
+import argparse
+import json
+import time
+
+from simulation.models.drone import Drone
+from simulation.server import serialize_state
+from simulation.simulation import AegisSimulation
+from simulation.snapshot import HandleTable, capture_snapshot
+from simulation.streaming import StateDecoder, StateEncoder
+
+
+def default_scenario(seed):
+    sim = AegisSimulation(headless=True, verbose=False, seed=seed)
+    sim.add_enemy_drones(12)
+    return sim
+
+
+def large_scenario(total, seed):
+    """Half friendlies on patrol, half enemies inbound; AEGIS off keeps stepping cheap."""
+    sim = AegisSimulation(headless=True, verbose=False, seed=seed)
+    sim.spawn_queue = []
+    sim.friendly_drones = []
+    sim.enemy_drones = []
+    rng = sim.rng
+    for i in range(total // 2):
+        friendly = Drone(rng.uniform(100, 1100), rng.uniform(400, 600), "friendly", i, rng=rng)
+        friendly.patrol_point = (friendly.x, friendly.y)
+        sim.friendly_drones.append(friendly)
+    for i in range(total - total // 2):
+        sim.spawn_enemy_drone(1000 + i)
+    sim.aegis_active = False
+    sim.on_aegis_toggle()
+    return sim
+
+
+def measure(sim, frames, keyframe_interval, json_every):
+    handles = HandleTable()
+    encoder = StateEncoder(keyframe_interval)
+    full_encoder = StateEncoder(keyframe_interval=1)
+    decoder = StateDecoder()
+    json_bytes = json_samples = 0
+    encode_time = 0.0
+    for frame in range(frames):
+        sim.update()
+        snapshot = capture_snapshot(sim, handles)
+        started = time.perf_counter()
+        record = encoder.encode(snapshot)
+        encode_time += time.perf_counter() - started
+        decoder.decode(record)
+        full_encoder.encode(snapshot)
+        if frame % json_every == 0:
+            json_bytes += len(json.dumps(serialize_state(sim), separators=(",", ":")))
+            json_samples += 1
+    return {
+        "drones": len(sim.friendly_drones) + len(sim.enemy_drones),
+        "stream": encoder.bytes_written / frames,
+        "keyframes_only": full_encoder.bytes_written / frames,
+        "json": json_bytes / max(1, json_samples),
+        "encode_ms": encode_time / frames * 1000,
+    }
+
+
+def report(name, result):
+    print(f"{name}: {result['drones']} drones")
+    print(f"  delta stream      {result['stream']:>12,.0f} bytes/frame  (encode {result['encode_ms']:.2f} ms)")
+    print(f"  binary keyframes  {result['keyframes_only']:>12,.0f} bytes/frame  "
+          f"({result['keyframes_only'] / result['stream']:.1f}x)")
+    print(f"  JSON full state   {result['json']:>12,.0f} bytes/frame  ({result['json'] / result['stream']:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure state stream bandwidth")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--large", type=int, default=5000, help="drone count for the large scenario")
+    parser.add_argument("--keyframe-interval", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report("default scenario", measure(default_scenario(args.seed), args.frames, args.keyframe_interval, 1))
+    report(f"{args.large}-drone scenario",
+           measure(large_scenario(args.large, args.seed), max(120, args.frames // 5), args.keyframe_interval, 10))
+
+
+if __name__ == "__main__":
+    main()
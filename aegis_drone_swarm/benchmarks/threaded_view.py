@@ -0,0 +1,89 @@
+"""
+Viewer frame intervals with update() and render() in series versus the
+threaded run mode, on the protocol-heavy scenario from
+benchmarks.protocol_frames. Both loops are paced at --fps like run();
+the threaded worker is paced at --sim-rate steps/s (0 = flat out). Renders offscreen with SDL's dummy
+driver.
+
+    python -m benchmarks.threaded_view --seconds 5
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from benchmarks.protocol_frames import build, percentile  # noqa: E402
+from simulation.simulation import AegisSimulation  # noqa: E402
+from simulation.threaded import SimulationThread, SnapshotBuffer  # noqa: E402
+
+
+def attach_screen(sim):
+    pygame.init()
+    sim.screen = pygame.display.set_mode((sim.width, sim.height))
+
+
+def serial(sim, seconds, fps, sim_rate):
+    attach_screen(sim)
+    clock = pygame.time.Clock()
+    frames = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        pygame.event.pump()
+        sim.update()
+        sim.render()
+        clock.tick(fps)
+        frames.append((time.perf_counter() - started) * 1000)
+    return frames, len(frames)
+
+
+def threaded(sim, seconds, fps, sim_rate):
+    viewer = AegisSimulation(sim.width, sim.height, headless=True, verbose=False)
+    attach_screen(viewer)
+    buffer = SnapshotBuffer()
+    worker = SimulationThread(sim, buffer, deque(), steps_per_second=sim_rate or None)
+    worker.start()
+    clock = pygame.time.Clock()
+    frames, cache, shown = [], {}, None
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        pygame.event.pump()
+        snapshot = buffer.latest()
+        if snapshot is not None and snapshot is not shown:
+            snapshot.apply_to(viewer, cache)
+            shown = snapshot
+        if shown is not None:
+            viewer.render()
+        clock.tick(fps)
+        frames.append((time.perf_counter() - started) * 1000)
+    worker.stop()
+    worker.join()
+    return frames, worker.steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the threaded run mode")
+    parser.add_argument("--friendlies", type=int, default=60)
+    parser.add_argument("--enemies", type=int, default=120)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--sim-rate", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<9} {'frames/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'sim steps/s':>12}")
+    for name, mode in (("serial", serial), ("threaded", threaded)):
+        frames, steps = mode(build(args.friendlies, args.enemies, args.seed), args.seconds, args.fps, args.sim_rate)
+        print(f"{name:<9} {len(frames) / args.seconds:>9.1f} {percentile(frames, 0.5):>8.2f} "
+              f"{percentile(frames, 0.99):>8.2f} {max(frames):>8.2f} {steps / args.seconds:>12.1f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Bids per protocol tick with and without enemy threat clustering, against
+a saturation wave of tight enemy groups.
+
+    python -m benchmarks.threat_clusters --enemies 500 --groups 25 --friendlies 60
+"""
+
+import argparse
+
+from simulation.scenarios import saturation_wave
+from simulation.threat_clusters import ThreatClusterer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cluster-first bidding")
+    parser.add_argument("--friendlies", type=int, default=60)
+    parser.add_argument("--enemies", type=int, default=500)
+    parser.add_argument("--groups", type=int, default=25)
+    parser.add_argument("--spread", type=float, default=15.0, help="std dev of a group, px")
+    parser.add_argument("--frames", type=int, default=1200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'bids/tick':>10} {'ms/tick':>8} {'neutralized':>12} {'breached':>9}")
+    for mode in ("flat", "clustered"):
+        sim = saturation_wave(args.friendlies, args.enemies, args.groups, args.spread, args.seed)
+        if mode == "clustered":
+            sim.threat_clusters = ThreatClusterer()
+        for _ in range(args.frames):
+            sim.update()
+        columns = sim.metrics.columns()
+        ticks = max(1, len(columns["frame"]))
+        bids = columns["bids"].sum() / ticks
+        ms = columns["protocol_ms"].sum() / ticks
+        print(f"{mode:<10} {bids:>10.0f} {ms:>8.2f} {sim.enemies_neutralized:>12} {sim.enemies_breached:>9}")
+        if sim.threat_clusters is not None:
+            print(f"           {sim.threat_clusters.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
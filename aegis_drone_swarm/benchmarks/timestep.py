@@ -0,0 +1,66 @@
+"""
+Coarse timesteps: accuracy of the integrators against the 1/60 s
+reference, and wall time of a full scenario at dt = 1/60 versus 1/10.
+
+    python -m benchmarks.timestep --seconds 120 --enemies 24
+"""
+
+import argparse
+import math
+import time
+
+from simulation.models.drone import Drone
+from simulation.physics import REFERENCE_DT, Integrator
+from simulation.simulation import AegisSimulation
+
+
+def chase(dt, integrator, seconds=3.0):
+    """Final position of a drone steering from rest to a fixed point."""
+    drone = Drone(200.0, 600.0, "friendly", 0)
+    drone.target_x, drone.target_y = 260.0, 560.0
+    for _ in range(round(seconds / dt)):
+        drone.move(1200, 800, dt=dt, integrator=integrator)
+    return drone.x, drone.y
+
+
+def accuracy(dt):
+    ref_x, ref_y = chase(REFERENCE_DT, None)
+    rows = [("semi_implicit, no substeps", Integrator(max_substeps=1)),
+            ("semi_implicit", Integrator()),
+            ("rk2", Integrator("rk2"))]
+    for name, integrator in rows:
+        x, y = chase(dt, integrator)
+        print(f"  {name:<28} error {math.hypot(x - ref_x, y - ref_y):8.4f} px")
+
+
+def scenario(dt, seconds, enemies, seed):
+    sim = AegisSimulation(headless=True, verbose=False, seed=seed, dt=dt)
+    sim.add_enemy_drones(enemies)
+    steps = round(seconds / dt)
+    substepped = 0
+    started = time.perf_counter()
+    for _ in range(steps):
+        sim.update()
+        substepped += sim.integrator.substepped_drones
+    elapsed = time.perf_counter() - started
+    print(f"  dt=1/{round(1 / dt):<3} {steps:>6} steps {elapsed:7.2f} s  "
+          f"neutralized {sim.enemies_neutralized:>3} breached {sim.enemies_breached:>3}  "
+          f"substepped {substepped / steps:5.2f} drones/step")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark coarse-timestep integration")
+    parser.add_argument("--seconds", type=float, default=120.0, help="simulated seconds per scenario")
+    parser.add_argument("--enemies", type=int, default=24, help="extra enemies added to the default scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("chase accuracy at dt=1/10 vs the 1/60 s reference:")
+    accuracy(1 / 10)
+    print(f"scenario, {args.seconds:.0f} simulated seconds:")
+    for dt in (REFERENCE_DT, 1 / 10):
+        scenario(dt, args.seconds, args.enemies, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Render cost against world population, with viewport culling.
+
+1. Property check: a populated large world runs with random pans and
+   zooms, extra spawns and AEGIS toggles; every CullGrid query must
+   return exactly the drones a full scan finds inside the (margin-grown)
+   viewport, in draw order, across rebuilds, drift, spawns and removals.
+2. Timing: a --world x --world world holding N drones scattered
+   uniformly, seen at zoom 1 through a 1200 x 800 window; ms per render()
+   with culling against drawing every drone through the same camera
+   (SDL clips the offscreen ones). The clock advances a frame per render
+   so grid rebuilds are amortized as in a running simulation.
+
+    python -m benchmarks.viewport --world 20000 --sizes 1000 4000 16000
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from simulation.camera import Camera, CullGrid  # noqa: E402
+from simulation.simulation import AegisSimulation  # noqa: E402
+
+
+class NoCull(CullGrid):
+    """Every drone, every time: what render() drew before culling."""
+
+    def query(self, sim, left, top, right, bottom):
+        return list(sim.all_drones())
+
+
+def scan(sim, left, top, right, bottom):
+    return [d for d in sim.all_drones() if left <= d.x <= right and top <= d.y <= bottom]
+
+
+def check(frames, seed):
+    rng = random.Random(seed)
+    sim = AegisSimulation(4000, 3000, headless=True, verbose=False, seed=seed)
+    sim.initial_enemies = 40
+    sim.reset_simulation()
+    camera = Camera(1200, 800, sim.width, sim.height)
+    queries = mismatches = 0
+    for frame in range(frames):
+        sim.update()
+        if rng.random() < 0.05:
+            camera.zoom_at(rng.choice((0.5, 0.8, 1.25, 2.0)), rng.uniform(0, 1200), rng.uniform(0, 800))
+        if rng.random() < 0.2:
+            camera.pan(rng.uniform(-300, 300), rng.uniform(-300, 300))
+        if rng.random() < 0.01:
+            sim.add_enemy_drones(rng.randint(1, 5))
+        if rng.random() < 0.005:
+            sim.aegis_active = not sim.aegis_active
+            sim.on_aegis_toggle()
+        margin = rng.choice((0.0, 40.0, 250.0))
+        queries += 1
+        mismatches += camera.visible(sim, margin) != scan(sim, *camera.viewport(margin))
+    return queries, mismatches, camera.grid.builds
+
+
+def populate(world, count, seed):
+    rng = random.Random(seed)
+    sim = AegisSimulation(world, world, headless=True, verbose=False, seed=seed)
+    sim.pool.release_all(sim.friendly_drones)
+    sim.pool.release_all(sim.enemy_drones)
+    sim.spawn_queue = []
+    sim.population += 1
+    for i in range(count):
+        if i % 2:
+            drone = sim.pool.acquire(rng.uniform(0, world), rng.uniform(0, world), "enemy", sim.allocate_enemy_id())
+            sim.enemy_drones.append(drone)
+        else:
+            drone = sim.pool.acquire(rng.uniform(0, world), rng.uniform(0, world), "friendly",
+                                     sim.allocate_friendly_id())
+            sim.friendly_drones.append(drone)
+        drone.velocity_x, drone.velocity_y = rng.uniform(-0.2, 0.2), rng.uniform(-0.2, 0.2)
+    sim.screen = pygame.Surface((1200, 800))
+    return sim
+
+
+def render_ms(sim, cull, renders):
+    camera = sim.camera = Camera(1200, 800, sim.width, sim.height)
+    camera.zoom = 1.0
+    camera.center_on(sim.width / 2, sim.height / 2)
+    if not cull:
+        camera.grid = NoCull()
+    sim.render()  # warm fonts and fills
+    started = time.perf_counter()
+    for _ in range(renders):
+        sim.frame_count += 1
+        sim.render()
+    return (time.perf_counter() - started) * 1000 / renders, camera.drawn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check viewport culling and time render() against population")
+    parser.add_argument("--frames", type=int, default=1500)
+    parser.add_argument("--world", type=int, default=20000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000])
+    parser.add_argument("--renders", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # render() flips the display
+    queries, mismatches, builds = check(args.frames, args.seed)
+    print(f"property check: {queries} queries, {mismatches} differ from a full scan ({builds} grid builds)")
+
+    print(f"{'drones':>7} {'drawn':>6} {'all ms':>8} {'culled ms':>10} {'speedup':>8}")
+    for count in args.sizes:
+        sim = populate(args.world, count, args.seed)
+        full, _ = render_ms(sim, False, args.renders)
+        culled, drawn = render_ms(sim, True, args.renders)
+        print(f"{count:>7} {drawn:>6} {full:>8.2f} {culled:>10.2f} {full / culled:>7.1f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,23 +2,67 @@
 """
 Main entry point for the Aegis Drone Swarm simulation.
 Run this file to start the simulation.
+
+    python main.py                                 # interactive window
+    python main.py --headless --steps 3600 --seed 7 --quiet
+    python main.py --world 20000x20000             # pan/zoom a large world
 """
 
+import argparse
+import os
+
 from simulation.simulation import AegisSimulation
 
 def main():
     """Initialize and run the simulation."""
-    print("Starting Aegis Drone Swarm Simulation...")
-    print("=== AEGIS PROTOCOL ACTIVATED ===")
-    print("Features: Decentralized Auction System, Swarm Intelligence")
-    
+    parser = argparse.ArgumentParser(description="Aegis Drone Swarm simulation")
+    parser.add_argument("--threaded", action="store_true",
+                        help="step the simulation on a worker thread while rendering")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a window (pygame is never imported)")
+    parser.add_argument("--steps", type=int, default=3600,
+                        help="frames to simulate in headless mode (default: 3600)")
+    parser.add_argument("--seed", type=int, help="seed for a reproducible run")
+    parser.add_argument("--quiet", action="store_true",
+                        help="no banner or event log")
+    parser.add_argument("--world", default="1200x800", metavar="WIDTHxHEIGHT",
+                        help="world size in px; larger than the window it is panned and zoomed")
+    parser.add_argument("--window", default="1200x800", metavar="WIDTHxHEIGHT",
+                        help="window size in px (default: 1200x800)")
+    args = parser.parse_args()
+    if args.headless and args.threaded:
+        parser.error("--threaded renders a window and cannot be combined with --headless")
+    try:
+        width, height = (int(n) for n in args.world.lower().split("x"))
+        view_width, view_height = (int(n) for n in args.window.lower().split("x"))
+    except ValueError:
+        parser.error("--world and --window take WIDTHxHEIGHT, e.g. 20000x20000")
+
+    if args.quiet:
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    else:
+        print("Starting Aegis Drone Swarm Simulation...")
+        print("=== AEGIS PROTOCOL ACTIVATED ===")
+        print("Features: Decentralized Auction System, Swarm Intelligence")
+
     # Create simulation instance
-    sim = AegisSimulation()
-    
+    sim = AegisSimulation(width, height, headless=args.headless, verbose=not args.quiet, seed=args.seed,
+                          view_size=(view_width, view_height))
+
+    if args.headless:
+        for _ in range(args.steps):
+            sim.update()
+            if sim.mission_complete:
+                break
+        print(f"frames={sim.frame_count} neutralized={sim.enemies_neutralized} "
+              f"breached={sim.enemies_breached} friendly_losses={sim.friendly_losses} "
+              f"success={sim.get_success_rate():.1f}%")
+        return
+
     # Run the main loop
-    sim.run()
-    
+    sim.run(threaded=args.threaded)
+
     print("Simulation ended.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
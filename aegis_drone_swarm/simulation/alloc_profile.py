@@ -0,0 +1,135 @@
+"""
+Per-stage, per-tick allocation accounting backed by tracemalloc.
+
+Set sim.alloc_profiler = AllocationProfiler() and AegisSimulation.update
+marks its stage boundaries (STAGES, in step order). Between two marks
+the profiler reads tracemalloc's traced size and peak:
+
+- net: bytes still allocated at the end of the stage that were not at
+  its start - growth, which must settle to ~0 once warmed up;
+- peak: the stage's high-water mark above its starting size - the
+  transient garbage (temporary lists, tuples, floats) it churned.
+
+Per-tick rows are kept in a bounded deque; totals per stage accumulate
+for the report. With sites=True every mark also takes a tracemalloc
+snapshot and charges the net size change of each allocation site
+(file:line, `frames` deep) to the stage - precise but slow, for finding
+where growth comes from rather than for measuring.
+
+tracemalloc itself slows the simulation several times over and adds
+its own bookkeeping to the traced size; profile, then switch it off.
+"""
+
+import linecache
+import tracemalloc
+from collections import Counter, deque
+
+STAGES = ("spawn", "protocol", "movement", "engagement", "bookkeeping")
+
+
+class AllocationProfiler:
+    """Net and peak bytes per simulation stage and tick, plus top allocation sites."""
+
+    def __init__(self, frames=1, sites=False, history=1024):
+        self.frames = frames
+        self.sites = sites
+        self.ticks = 0
+        self.net = dict.fromkeys(STAGES, 0)  # total net bytes per stage
+        self.peak = dict.fromkeys(STAGES, 0)  # total of per-tick peaks per stage
+        self.max_peak = dict.fromkeys(STAGES, 0)
+        self.history = deque(maxlen=history)  # (frame, {stage: (net, peak)})
+        self.site_bytes = {stage: Counter() for stage in STAGES}
+        self.started_tracing = False
+        self._tick = None
+        self._size = 0
+        self._snapshot = None
+
+    def start(self):
+        """Start tracemalloc (unless something else already traces)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+
+    def stop(self):
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def begin_tick(self):
+        if not tracemalloc.is_tracing():
+            self.start()
+        self._tick = {}
+        if self.sites:
+            self._snapshot = self._take_snapshot()
+        # Measured after the snapshot, as in mark(), so "spawn" is not charged for it
+        self._size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def mark(self, stage):
+        """Close `stage`: charge it the allocations since the previous mark."""
+        if self._tick is None:
+            return
+        size, peak = tracemalloc.get_traced_memory()
+        net, high = size - self._size, max(0, peak - self._size)
+        self._tick[stage] = (net, high)
+        self.net[stage] += net
+        self.peak[stage] += high
+        self.max_peak[stage] = max(self.max_peak[stage], high)
+        if self.sites:
+            snapshot = self._take_snapshot()
+            for stat in snapshot.compare_to(self._snapshot, "lineno"):
+                if stat.size_diff:
+                    frame = stat.traceback[0]
+                    self.site_bytes[stage][(frame.filename, frame.lineno)] += stat.size_diff
+            self._snapshot = snapshot
+        # Measured after the snapshot so the profiler's own work is not charged
+        self._size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def end_tick(self, frame):
+        if self._tick is None:
+            return
+        self.history.append((frame, self._tick))
+        self.ticks += 1
+        self._tick = None
+        self._snapshot = None
+
+    @staticmethod
+    def _take_snapshot():
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    # Reporting
+
+    def top_sites(self, stage=None, limit=10):
+        """[(bytes, "file:line", source), ...] with the most net growth."""
+        counts = Counter()
+        for name in (STAGES if stage is None else (stage,)):
+            counts.update(self.site_bytes[name])
+        return [(size, f"{filename}:{lineno}", linecache.getline(filename, lineno).strip())
+                for (filename, lineno), size in counts.most_common(limit)]
+
+    def metrics(self):
+        ticks = max(1, self.ticks)
+        return {
+            "ticks": self.ticks,
+            "net_per_tick": {stage: self.net[stage] / ticks for stage in STAGES},
+            "peak_per_tick": {stage: self.peak[stage] / ticks for stage in STAGES},
+            "max_peak": dict(self.max_peak),
+        }
+
+    def report(self, limit=10):
+        ticks = max(1, self.ticks)
+        lines = [f"{'stage':<11} {'net B/tick':>11} {'peak B/tick':>12} {'max peak B':>11}"]
+        for stage in STAGES:
+            lines.append(f"{stage:<11} {self.net[stage] / ticks:>11.1f} {self.peak[stage] / ticks:>12.1f} "
+                         f"{self.max_peak[stage]:>11}")
+        lines.append(f"{'total':<11} {sum(self.net.values()) / ticks:>11.1f} "
+                     f"{sum(self.peak.values()) / ticks:>12.1f}   over {self.ticks} ticks")
+        if self.sites:
+            lines.append("top allocation sites (net bytes):")
+            for size, where, source in self.top_sites(limit=limit):
+                lines.append(f"  {size:>9}  {where}  {source}")
+        return "\n".join(lines)
@@ -0,0 +1,512 @@
+"""
+Many independent AEGIS episodes stepped together in NumPy.
+
+An episode at the default size (8 friendlies against 8 staggered
+enemies) is too small to keep a process busy, so running thousands of
+them pays the per-object and per-process overhead thousands of times.
+BatchedAegis holds K worlds as arrays with a leading world dimension -
+friendlies (K, F), enemies (K, E), bids (K, F, E) - with alive masks for
+the padding left by destroyed and not yet spawned drones, and advances
+all of them with the same array operations:
+
+1. Spawning: the staggered spawn schedule, entry points and targets of
+   AegisSimulation.spawn_enemy_drone.
+2. Protocol, every 8th frame of each world (on the worlds due, gathered):
+   mission check, last line of defense, target validation, isolated
+   threat detection, the flat auction - roles, the cost function of
+   Drone.calculate_bid, resolution against peers in communication range -
+   and execute_assignment. The last runs as a loop over friendly slots,
+   because each friendly's choice changes the targeter counts the next
+   one sees; each iteration covers every world.
+3. Movement: steering, speed limit and damping of Drone.apply_physics.
+4. Swept engagements (earliest contact per enemy wins) and breaches,
+   with breach response.
+
+Finished worlds (mission complete or max_frames) record their outcome
+in per-world metrics and are reset in place.
+
+Random draws come from a counter-based hash of (world seed, episode,
+frame, stream, slot), so every world has its own reproducible random
+stream whatever K is and whichever worlds it is batched with. The
+streams differ from AegisSimulation's random.Random, so episodes match
+the object simulation in rules and in distribution rather than draw for
+draw. Engagement detection is the swept kind only. LOD, scheduling,
+squads, clusters, worlds with obstacles and policy overrides are not
+modelled. Layout and zone lines scale with width x height as they do in
+AegisSimulation.
+"""
+
+import numpy as np
+
+from simulation.models.drone import DEFAULT_BID_WEIGHTS, DEFAULT_BOUNDS, Drone, Role
+from simulation.physics import DAMPING_PER_FRAME
+
+ENTRY_POINTS = ((200, 100), (1000, 100), (600, 50), (300, 80), (900, 80), (100, 120), (1100, 120))
+DEFENSE_POSITIONS = ((300, 500), (600, 480), (900, 500), (450, 550),
+                     (750, 550), (600, 450), (400, 600), (800, 600))
+
+# Steering acceleration factor per Role value (Drone.steering_acceleration)
+ROLE_FACTOR = np.array([1.0, 0.8, 1.0, 1.5, 2.0, 1.0])
+
+# Random streams
+STREAM_SPAWN_X, STREAM_SPAWN_Y, STREAM_TARGET, STREAM_DRIFT, STREAM_DRIFT_STEP, STREAM_DAMAGE = range(6)
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_FRAME = np.uint64(0xD1B54A32D192ED03)
+
+
+def _mix(z):
+    """splitmix64 finalizer, elementwise over a uint64 array."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def first_contact_times(ax0, ay0, ax1, ay1, bx0, by0, bx1, by1, radius):
+    """Elementwise engagement.first_contact_time; inf where there is no contact."""
+    dx, dy = ax0 - bx0, ay0 - by0
+    c = dx * dx + dy * dy - radius * radius
+    vx = (ax1 - ax0) - (bx1 - bx0)
+    vy = (ay1 - ay0) - (by1 - by0)
+    a = vx * vx + vy * vy
+    b = dx * vx + dy * vy
+    disc = b * b - a * c
+    closing = (a > 0) & (b < 0) & (disc >= 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (-b - np.sqrt(np.where(closing, disc, 0.0))) / a
+    t = np.where(closing & (t <= 1.0), t, np.inf)
+    return np.where(c <= 0, 0.0, t)
+
+
+class BatchedAegis:
+    """K independent default-scenario worlds advanced by shared array operations."""
+
+    def __init__(self, num_worlds, initial_enemies=8, seed=0, max_frames=4000, width=1200, height=800,
+                 bid_weights=DEFAULT_BID_WEIGHTS):
+        self.num_worlds = K = num_worlds
+        self.bid_weights = bid_weights
+        self.width = width
+        self.height = height
+        self.max_frames = max_frames
+        positions = DEFENSE_POSITIONS[:max(6, int(initial_enemies * 1.1))]
+        self.num_friendlies = F = len(positions)
+        self.num_enemies = E = initial_enemies
+        self.defense = self.layout(positions)
+        self.entries = self.layout(ENTRY_POINTS)
+        self.spawn_frame = np.arange(E) * 30
+        self.seeds = np.arange(K, dtype=np.uint64) + np.uint64(seed)  # world k uses seed + k
+        self.episode = np.zeros(K, dtype=np.int64)
+
+        self.frame = np.zeros(K, dtype=np.int64)
+        self.complete = np.zeros(K, dtype=bool)
+        self.breach_active = np.zeros(K, dtype=bool)
+        self.last_breach = np.zeros(K, dtype=np.int64)
+        self.consecutive = np.zeros(K, dtype=np.int64)
+        self.neutralized = np.zeros(K, dtype=np.int64)
+        self.breached = np.zeros(K, dtype=np.int64)
+        self.losses = np.zeros(K, dtype=np.int64)
+
+        fshape, eshape = (K, F), (K, E)
+        self.f_x, self.f_y = np.zeros(fshape), np.zeros(fshape)
+        self.f_prev_x, self.f_prev_y = np.zeros(fshape), np.zeros(fshape)
+        self.f_vx, self.f_vy = np.zeros(fshape), np.zeros(fshape)
+        self.f_tx, self.f_ty = np.zeros(fshape), np.zeros(fshape)
+        self.f_health = np.zeros(fshape)
+        self.f_ammo = np.zeros(fshape, dtype=np.int64)
+        self.f_alive = np.zeros(fshape, dtype=bool)
+        self.f_role = np.zeros(fshape, dtype=np.int64)
+        self.f_assigned = np.full(fshape, -1, dtype=np.int64)  # enemy slot, -1 for none
+        self.f_target = np.full(fshape, -1, dtype=np.int64)  # Drone.target_enemy as a slot
+        self.f_breach = np.zeros(fshape, dtype=bool)
+        self.f_timer = np.zeros(fshape, dtype=np.int64)
+        self.bids = np.full((K, F, E), np.inf)  # inf: no bid
+
+        self.e_x, self.e_y = np.zeros(eshape), np.zeros(eshape)
+        self.e_prev_x, self.e_prev_y = np.zeros(eshape), np.zeros(eshape)
+        self.e_vx, self.e_vy = np.zeros(eshape), np.zeros(eshape)
+        self.e_tx, self.e_ty = np.zeros(eshape), np.zeros(eshape)
+        self.e_alive = np.zeros(eshape, dtype=bool)
+        self.e_pending = np.zeros(eshape, dtype=bool)
+
+        # Per-world outcome of finished episodes
+        self.episodes = np.zeros(K, dtype=np.int64)
+        self.total_frames = np.zeros(K, dtype=np.int64)
+        self.total_neutralized = np.zeros(K, dtype=np.int64)
+        self.total_breached = np.zeros(K, dtype=np.int64)
+        self.total_losses = np.zeros(K, dtype=np.int64)
+        self.wins = np.zeros(K, dtype=np.int64)  # every enemy neutralized or breached, friendlies left
+
+        self._reset(np.arange(K))
+
+    # Random streams
+
+    def uniform(self, stream, worlds, slots):
+        """Uniform [0, 1) draws for (world, slot) pairs; worlds and slots broadcast."""
+        worlds = np.asarray(worlds)
+        key = _mix(self.seeds[worlds] + self.episode[worlds].astype(np.uint64) * _GOLDEN)
+        key = _mix(key ^ (self.frame[worlds].astype(np.uint64) * _FRAME + np.uint64(stream)))
+        key = _mix(key + np.asarray(slots).astype(np.uint64) * _GOLDEN)
+        return (key >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+    # Episodes
+
+    def _reset(self, worlds):
+        """Start a new episode in the given worlds."""
+        self.frame[worlds] = 0
+        self.complete[worlds] = False
+        self.breach_active[worlds] = False
+        self.last_breach[worlds] = 0
+        self.consecutive[worlds] = 0
+        self.neutralized[worlds] = 0
+        self.breached[worlds] = 0
+        self.losses[worlds] = 0
+
+        x, y = self.defense[:, 0], self.defense[:, 1]
+        for array, value in ((self.f_x, x), (self.f_y, y), (self.f_prev_x, x), (self.f_prev_y, y),
+                             (self.f_tx, x), (self.f_ty, y), (self.f_vx, 0.0), (self.f_vy, 0.0),
+                             (self.f_health, 100.0), (self.f_ammo, 15), (self.f_alive, True),
+                             (self.f_role, int(Role.PATROL)), (self.f_assigned, -1), (self.f_target, -1),
+                             (self.f_breach, False), (self.f_timer, 0), (self.bids, np.inf),
+                             (self.e_alive, False), (self.e_pending, True)):
+            array[worlds] = value
+
+    def _finish(self, worlds):
+        self.episodes[worlds] += 1
+        self.episode[worlds] += 1
+        self.total_frames[worlds] += self.frame[worlds]
+        self.total_neutralized[worlds] += self.neutralized[worlds]
+        self.total_breached[worlds] += self.breached[worlds]
+        self.total_losses[worlds] += self.losses[worlds]
+        cleared = ~self.e_alive[worlds].any(axis=1) & ~self.e_pending[worlds].any(axis=1)
+        self.wins[worlds] += cleared & self.f_alive[worlds].any(axis=1)
+
+    # Stepping
+
+    def step(self):
+        """Advance every world one reference frame; returns the worlds that finished (now reset)."""
+        self.frame += 1
+        self._spawn()
+        expired = self.breach_active & (self.frame - self.last_breach > 180)
+        self.breach_active &= ~expired
+        self.consecutive[expired] = 0
+
+        due = np.flatnonzero((self.frame % 8 == 0) & ~self.complete)
+        if len(due):
+            self._protocol(due)
+        self._move()
+        running = ~self.complete
+        self._engage(running)
+        self._breach(running)
+
+        finished = np.flatnonzero(self.complete | (self.frame >= self.max_frames))
+        if len(finished):
+            self._finish(finished)
+            self._reset(finished)
+        return finished
+
+    def run(self, episodes):
+        """Step until at least `episodes` episodes have finished across the worlds; returns frames stepped."""
+        target = int(self.episodes.sum()) + episodes
+        frames = 0
+        while self.episodes.sum() < target:
+            self.step()
+            frames += 1
+        return frames
+
+    def layout(self, points):
+        """Points of the reference 1200 x 800 layout scaled to this world, as AegisSimulation.layout_x/y."""
+        scale = np.array((self.width, self.height)), np.array(DEFAULT_BOUNDS)
+        return (np.array(points, dtype=np.int64) * scale[0] // scale[1]).astype(float)
+
+    def _spawn(self):
+        due = self.e_pending & (self.spawn_frame <= self.frame[:, None])
+        if not due.any():
+            return
+        w, e = np.nonzero(due)
+        entries = self.entries
+        listed = e < len(ENTRY_POINTS)
+        index = np.minimum(e, len(ENTRY_POINTS) - 1)
+        random_x = 100 + np.floor(self.uniform(STREAM_SPAWN_X, w, e) * (self.width - 199))
+        (_, low_y), (_, high_y) = self.layout(((0, 30), (0, 200)))
+        random_y = low_y + np.floor(self.uniform(STREAM_SPAWN_Y, w, e) * (high_y - low_y + 1))
+        x = np.where(listed, entries[index, 0], random_x)
+        y = np.where(listed, entries[index, 1], random_y)
+
+        draw = self.uniform(STREAM_TARGET, w, e)
+        (left, _), (right, _), (low_x, _), (high_x, _) = self.layout(((200, 0), (1000, 0), (300, 0), (900, 0)))
+        flank = np.where(draw < 0.5, left, right)
+        zigzag = low_x + np.floor(draw * (high_x - low_x + 1))
+        kind = e % 4
+        target_x = np.where(kind == 0, flank, np.where(kind == 1, float(self.width // 2), zigzag))
+
+        for array, value in ((self.e_x, x), (self.e_y, y), (self.e_prev_x, x), (self.e_prev_y, y),
+                             (self.e_vx, 0.0), (self.e_vy, 0.0), (self.e_tx, target_x),
+                             (self.e_ty, float(self.height - 100)), (self.e_alive, True),
+                             (self.e_pending, False)):
+            array[w, e] = value
+
+    def _steer(self, x, y, vx, vy, tx, ty, factor, alive):
+        """One semi-implicit reference frame of Drone.apply_physics, in place."""
+        dx, dy = tx - x, ty - y
+        distance = np.hypot(dx, dy)
+        steering = alive & (distance > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(steering, factor / 60 / distance, 0.0)
+        vx += dx * scale
+        vy += dy * scale
+        speed = np.hypot(vx, vy)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            limit = np.where(steering & (speed > Drone.max_speed_pixels), Drone.max_speed_pixels / speed, 1.0)
+        limit *= np.where(alive, DAMPING_PER_FRAME, 1.0)
+        vx *= limit
+        vy *= limit
+        buffer = Drone.radius + 5
+        np.clip(np.where(alive, x + vx, x), buffer, self.width - buffer, out=x)
+        np.clip(np.where(alive, y + vy, y), buffer, self.height - buffer, out=y)
+
+    def _move(self):
+        alive = self.f_alive
+        self.f_prev_x[:] = self.f_x
+        self.f_prev_y[:] = self.f_y
+        factor = np.where(self.f_breach, 1.5, 1.0) * ROLE_FACTOR[self.f_role]
+        target = np.maximum(self.f_target, 0)
+        chasing = (self.f_assigned >= 0) & (self.f_target >= 0)
+        behind = chasing & (np.take_along_axis(self.e_y, target, axis=1) < self.f_y)
+        factor = np.where(behind, factor * 1.8, factor)
+        self._steer(self.f_x, self.f_y, self.f_vx, self.f_vy, self.f_tx, self.f_ty, factor, alive)
+
+        alive = self.e_alive
+        self.e_prev_x[:] = self.e_x
+        self.e_prev_y[:] = self.e_y
+        self._steer(self.e_x, self.e_y, self.e_vx, self.e_vy, self.e_tx, self.e_ty, 1.0, alive)
+        worlds = np.arange(self.num_worlds)[:, None]
+        slots = np.arange(self.num_enemies)
+        drift = alive & (self.uniform(STREAM_DRIFT, worlds, slots) < 0.002)
+        if drift.any():
+            step = self.uniform(STREAM_DRIFT_STEP, worlds, slots) * 60 - 30
+            np.copyto(self.e_tx, np.clip(self.e_tx + step, 100, self.width - 100), where=drift)
+
+    def _engage(self, running):
+        target = np.maximum(self.f_assigned, 0)
+        pursuing = (running[:, None] & self.f_alive & (self.f_assigned >= 0) & (self.f_ammo > 0)
+                    & np.take_along_axis(self.e_alive, target, axis=1))
+        if not pursuing.any():
+            return
+        ex0, ey0, ex1, ey1 = (np.take_along_axis(array, target, axis=1)
+                              for array in (self.e_prev_x, self.e_prev_y, self.e_x, self.e_y))
+        t = first_contact_times(self.f_prev_x, self.f_prev_y, self.f_x, self.f_y,
+                                ex0, ey0, ex1, ey1, Drone.engagement_range)
+        contact = pursuing & np.isfinite(t)
+        if not contact.any():
+            return
+
+        # Every contact risks damage; the earliest contact on each enemy kills it
+        worlds = np.arange(self.num_worlds)[:, None]
+        hit = contact & (self.uniform(STREAM_DAMAGE, worlds, np.arange(self.num_friendlies)) < 0.1)
+        self.f_health -= 20 * hit
+        lost = hit & self.f_alive & (self.f_health <= 0)
+        self.f_alive &= ~lost
+        self.losses += lost.sum(axis=1)
+
+        t = np.where(contact, t, np.inf)
+        slots = np.arange(self.num_friendlies)
+        same = (target[:, :, None] == target[:, None, :]) & contact[:, None, :]
+        earlier = (t[:, None, :] < t[:, :, None]) | ((t[:, None, :] == t[:, :, None])
+                                                     & (slots[None, None, :] < slots[None, :, None]))
+        winner = contact & ~(same & earlier).any(axis=2)
+        w, f = np.nonzero(winner)
+        self.e_alive[w, target[w, f]] = False
+        self.f_ammo[w, f] -= 1
+        self.f_assigned[w, f] = -1
+        self.neutralized += winner.sum(axis=1)
+
+    def _breach(self, running):
+        breach = running[:, None] & self.e_alive & (self.e_y >= self.height - 170)
+        count = breach.sum(axis=1)
+        hit = count > 0
+        if not hit.any():
+            return
+        self.breached += count
+        self.last_breach[hit] = self.frame[hit]
+        new = hit & ~self.breach_active
+        self.breach_active |= new
+        self.consecutive += new
+        respond = new[:, None] & self.f_alive
+        self.f_breach |= respond
+        self.f_timer[respond] = 180
+        self.f_assigned[respond] = -1
+        self.bids[respond] = np.inf
+        self.e_alive &= ~breach
+
+    # Protocol
+
+    def _protocol(self, worlds):
+        """One AEGIS protocol tick on the worlds due (gathered, then scattered back)."""
+        f_alive = self.f_alive[worlds]
+        e_alive = self.e_alive[worlds]
+        done = (~e_alive.any(axis=1) & ~self.e_pending[worlds].any(axis=1)) | ~f_alive.any(axis=1)
+        self.complete[worlds[done]] = True
+        worlds = worlds[~done]
+        if not len(worlds):
+            return
+        f_alive, e_alive = f_alive[~done], e_alive[~done]
+        n, F, E = len(worlds), self.num_friendlies, self.num_enemies
+        rows = np.arange(n)[:, None]
+        enemy_slots = np.arange(E)
+        fx, fy = self.f_x[worlds], self.f_y[worlds]
+        ex, ey = self.e_x[worlds], self.e_y[worlds]
+        evx, evy = self.e_vx[worlds], self.e_vy[worlds]
+        tx, ty = self.f_tx[worlds], self.f_ty[worlds]
+        role, assigned, target = self.f_role[worlds], self.f_assigned[worlds], self.f_target[worlds]
+        breach, timer = self.f_breach[worlds], self.f_timer[worlds]
+        ammo, health, bids = self.f_ammo[worlds], self.f_health[worlds], self.bids[worlds]
+
+        dx = fx[:, :, None] - ex[:, None, :]
+        dy = fy[:, :, None] - ey[:, None, :]
+        distance = np.hypot(dx, dy)  # (n, F, E)
+        # Drone.calculate_interception_point for every pair
+        speed = np.hypot(evx, evy)
+        lead = distance / (Drone.max_speed_pixels * 60) * 60 * 0.98
+        moving = (speed >= 0.1)[:, None, :]
+        point_x = np.where(moving, np.clip(ex[:, None, :] + evx[:, None, :] * lead, 50, self.width - 50), ex[:, None, :])
+        point_y = np.where(moving, np.clip(ey[:, None, :] + evy[:, None, :] * lead, 50, self.height - 50), ey[:, None, :])
+
+        # Last line of defense: the closest friendly takes each critical enemy
+        critical = e_alive & (ey > self.height - 200)
+        if critical.any():
+            closest = np.argmin(np.where(f_alive[:, :, None], distance, np.inf), axis=1)  # (n, E)
+            picks = critical[:, None, :] & (closest[:, None, :] == np.arange(F)[None, :, None])
+            picks &= f_alive[:, :, None]
+            last = np.where(picks, enemy_slots, -1).max(axis=2)  # later enemies override earlier
+            defend = last >= 0
+            enemy = np.maximum(last, 0)
+            assigned = np.where(defend, last, assigned)
+            tx = np.where(defend, np.take_along_axis(ex, enemy, axis=1), tx)
+            ty = np.where(defend, np.take_along_axis(ey, enemy, axis=1), ty)
+            role = np.where(defend, int(Role.LAST_DEFENSE), role)
+            breach |= defend
+            timer = np.where(defend, 120, timer)
+
+        # validate_assigned_target and update_breach_response
+        has = f_alive & (assigned >= 0)
+        valid = has & np.take_along_axis(e_alive, np.maximum(assigned, 0), axis=1)
+        assigned = np.where(has & ~valid, -1, assigned)
+        target = np.where(valid, assigned, target)
+        timer, breach = self._tick_breach(timer, breach, f_alive)
+
+        # identify_priority_threats
+        sees = (distance <= Drone.sensor_range) & f_alive[:, :, None]
+        covering = sees.sum(axis=1)  # (n, E)
+        threats = (e_alive & (ey > self.height - 350) & (covering <= 1)).any(axis=1) & ~self.breach_active[worlds]
+        first_three = threats[:, None] & f_alive & (np.cumsum(f_alive, axis=1) <= 3)
+        breach |= first_three
+        timer = np.where(first_three, 90, timer)
+        assigned = np.where(first_three, -1, assigned)
+        bids = np.where(first_three[:, :, None], np.inf, bids)
+
+        # Auction: roles and bids of every participant
+        bidding = f_alive & (role != Role.LAST_DEFENSE)
+        timer, breach = self._tick_breach(timer, breach, bidding)
+        visible = sees & e_alive[:, None, :]
+        count = visible.sum(axis=2)
+        near_zone = (visible & (ey > self.height - 300)[:, None, :]).any(axis=2)
+        new_role = np.where(count == 0, int(Role.PATROL),
+                            np.where(near_zone | (ammo <= 3), int(Role.GUARDIAN),
+                                     np.where(count >= 3, int(Role.SWARM), int(Role.INTERCEPTOR))))
+        role = np.where(bidding, new_role, role)
+
+        total = f_alive.sum(axis=1)
+        average_y = (fy * f_alive).sum(axis=1) / np.maximum(1, total)
+        behind = ey < average_y[:, None]
+        isolation = 1.0 - covering / np.maximum(1, total)[:, None]
+        isolation = np.where(behind, np.minimum(1.0, isolation * 1.5), isolation)
+        priority = np.minimum(1.0, np.where(behind, 0.6, 0.0) + np.maximum(0.1, 1.0 - ey / self.height) * 0.3
+                              + np.minimum(1.0, speed / 5.0) * 0.1)
+        targeters = self._targeters(assigned, f_alive)
+
+        weights = self.bid_weights
+        cost = distance * weights.distance * (1.0 - isolation * weights.isolation)[:, None, :]
+        cost *= np.where(targeters >= 1, 1.0 + targeters * weights.over_targeting, 1.0)[:, None, :]
+        cost *= (1.0 - priority * weights.threat)[:, None, :]
+        cost *= ((1.0 - ammo / 30.0) * (health / 100.0) * np.where(breach, weights.breach_response, 1.0))[:, :, None]
+        cost *= np.where(assigned[:, :, None] == enemy_slots, weights.commitment, 1.0)
+        cost = np.maximum(0.1, cost)
+        placed = bidding[:, :, None] & visible & (ammo > 0)[:, :, None]
+        bids = np.where(placed, cost, np.where(bidding[:, :, None], np.inf, bids))
+
+        # Resolve: a bid wins unless a live peer in range bid strictly lower
+        peer_distance = np.hypot(fx[:, :, None] - fx[:, None, :], fy[:, :, None] - fy[:, None, :])
+        peers = (peer_distance <= Drone.communication_range) & f_alive[:, None, :] & ~np.eye(F, dtype=bool)
+        best_other = np.where(peers[:, :, :, None], bids[:, None, :, :], np.inf).min(axis=2)
+        wins = bidding[:, :, None] & np.isfinite(bids) & ~(best_other < bids)
+        # Bids resolve in order of falling isolation; the last win stands
+        order = np.where(wins, isolation[:, None, :] - enemy_slots * 1e-6, np.inf)
+        won = wins.any(axis=2)
+        pick = np.argmin(order, axis=2)
+        assigned = np.where(won, pick, assigned)
+        target = np.where(won, pick, target)
+        tx = np.where(won, np.take_along_axis(point_x, pick[:, :, None], axis=2)[:, :, 0], tx)
+        ty = np.where(won, np.take_along_axis(point_y, pick[:, :, None], axis=2)[:, :, 0], ty)
+
+        # execute_assignment, friendly by friendly
+        has = f_alive & (assigned >= 0)
+        valid = has & np.take_along_axis(e_alive, np.maximum(assigned, 0), axis=1)
+        assigned = np.where(f_alive & ~valid, -1, assigned)
+        target = np.where(valid, assigned, target)
+        base_score = isolation * 0.6 + priority * 0.4
+        patrol_x = self.defense[:, 0]
+        for f in range(F):
+            active = f_alive[:, f]
+            chosen = assigned[:, f]
+            free = active & (chosen < 0)
+            if free.any():
+                targeters = self._targeters(assigned, f_alive)  # earlier picks count
+                score = base_score - targeters * 0.3
+                seen = visible[:, f, :] & free[:, None]
+                open_ = seen & ((targeters < 2) | (score > 0.7))
+                pick = np.where(open_.any(axis=1), np.argmax(np.where(open_, score, -np.inf), axis=1),
+                                np.argmax(np.where(seen, score, -np.inf), axis=1))
+                picked = seen.any(axis=1)
+                chosen = np.where(picked, pick, chosen)
+                assigned[:, f] = chosen
+                target[:, f] = np.where(picked, pick, target[:, f])
+                tx[:, f] = np.where(free & ~picked, patrol_x[f], tx[:, f])
+                ty[:, f] = np.where(free & ~picked, self.height - 250, ty[:, f])
+            engaged = active & (chosen >= 0)
+            enemy = np.maximum(chosen, 0)
+            tx[:, f] = np.where(engaged, point_x[rows[:, 0], f, enemy], tx[:, f])
+            ty[:, f] = np.where(engaged, point_y[rows[:, 0], f, enemy], ty[:, f])
+
+        self.f_tx[worlds], self.f_ty[worlds] = tx, ty
+        self.f_role[worlds], self.f_assigned[worlds], self.f_target[worlds] = role, assigned, target
+        self.f_breach[worlds], self.f_timer[worlds] = breach, timer
+        self.bids[worlds] = bids
+
+    def _targeters(self, assigned, alive):
+        """Drone.count_targeters for every enemy slot: (worlds, E)."""
+        return ((assigned[:, :, None] == np.arange(self.num_enemies)) & alive[:, :, None]).sum(axis=1)
+
+    @staticmethod
+    def _tick_breach(timer, breach, who):
+        """Drone.update_breach_response for the drones in `who`."""
+        counting = who & breach
+        timer = timer - counting
+        return timer, breach & ~(counting & (timer <= 0))
+
+    # Metrics
+
+    def metrics(self):
+        episodes = int(self.episodes.sum())
+        per = 1 / max(1, episodes)
+        neutralized = int(self.total_neutralized.sum())
+        breached = int(self.total_breached.sum())
+        return {
+            "worlds": self.num_worlds,
+            "episodes": episodes,
+            "frames_per_episode": float(self.total_frames.sum()) * per,
+            "neutralized_per_episode": neutralized * per,
+            "breached_per_episode": breached * per,
+            "losses_per_episode": float(self.total_losses.sum()) * per,
+            "wins": int(self.wins.sum()),
+            "success_rate": 100.0 * neutralized / max(1, neutralized + breached),
+        }
@@ -0,0 +1,266 @@
+"""
+Friendly x enemy bid and score matrices for the flat auction.
+
+Drone.calculate_bid is evaluated per (friendly, enemy) pair, and each
+call rescans the swarm for the enemy's isolation level, its targeters
+and the average friendly line - O(F^2 E) Python per protocol tick, with
+execute_assignment's target scoring repeating the scans. BidKernel
+builds the whole tick in one pass over swarm arrays:
+
+1. Per enemy: isolation level (share of live friendlies that can see
+   it, boosted behind the friendly line), threat priority and
+   targeters; the per-enemy score base is isolation * 0.6 + threat * 0.4.
+2. Per pair: distance, visibility (sensor range, occlusion, alive) and
+   the bid - the same chain of multiplications as calculate_bid, in the
+   same order, so every element is bit-identical: inf for out-of-range,
+   occluded or dead enemies and for friendlies out of ammo or dead,
+   over-targeting, breach response and commitment multipliers, the 0.1
+   floor.
+3. The auction reads rows: a friendly's role, bids (in descending
+   isolation order, as participate_in_auction places them) and, in
+   execute_assignment, its target scores. Targeter counts change as
+   friendlies pick targets, so scores subtract a live per-enemy count.
+4. Resolution reads columns: a matrix of the bids every live drone
+   holds (drones that sat the auction out keep their earlier ones, as
+   bid_for sees them) gives, per bid, the lowest peer bid within
+   communication range; the bid wins unless a peer's is strictly lower.
+
+Cost is O(F E) array work plus O(F + bids) Python per tick, where the
+scalar auction spends O(F^2 E) on bids and O(F bids) bid_for scans.
+"""
+
+import time
+
+import numpy as np
+
+from simulation.models.drone import (BID_ENEMY_ID, BID_STRIDE, BID_VALUE, DEFAULT_BID_WEIGHTS, DEFAULT_BOUNDS,
+                                     LOD_ASLEEP, Drone, Role)
+
+
+class BidKernel:
+    """One protocol tick's bid matrix and target scores, built from swarm arrays."""
+
+    def __init__(self):
+        self.friendlies = []
+        self.enemies = []
+        self.columns = {}  # enemy id -> column
+        self.rows = {}  # friendly id -> row
+        self.visible = None  # (F, E) bool
+        self.bids = None  # (F, E) float, inf where no bid
+        self.isolation = None  # (E,)
+        self.score_base = None  # (E,)
+        self.targeters = None  # (E,) int, kept current through assignment
+        self.enemy_y = None
+        self.guard_y = None  # determine_role's high-priority line
+        self.friendly_xy = None
+        self.friendly_alive = None
+        self.builds = 0
+        self.pairs = 0
+        self.build_s = 0.0
+
+    def build(self, friendlies, enemies):
+        """Compute every matrix for the swarm's current state."""
+        started = time.perf_counter()
+        self.friendlies, self.enemies = friendlies, enemies
+        self.columns = {enemy.id: j for j, enemy in enumerate(enemies)}
+        self.rows = {friendly.id: i for i, friendly in enumerate(friendlies)}
+        F, E = len(friendlies), len(enemies)
+
+        fx = np.array([f.x for f in friendlies], dtype=float)
+        fy = np.array([f.y for f in friendlies], dtype=float)
+        health = np.array([f.health for f in friendlies], dtype=float)
+        ammo = np.array([f.ammo for f in friendlies], dtype=float)
+        alive = np.array([f.health > 0 and not f.is_destroyed for f in friendlies], dtype=bool)
+        breach = np.array([f.breach_response_mode for f in friendlies], dtype=bool)
+        assigned = np.array([-1 if f.assigned_target is None else self.columns.get(f.assigned_target, -1)
+                             for f in friendlies], dtype=np.int64)
+        ex = np.array([e.x for e in enemies], dtype=float)
+        ey = np.array([e.y for e in enemies], dtype=float)
+        evx = np.array([e.velocity_x for e in enemies], dtype=float)
+        evy = np.array([e.velocity_y for e in enemies], dtype=float)
+        e_alive = np.array([e.health > 0 for e in enemies], dtype=bool)
+
+        hidden = np.zeros((F, E), dtype=bool)
+        for i, friendly in enumerate(friendlies):
+            if friendly.hidden:
+                for enemy_id in friendly.hidden:
+                    j = self.columns.get(enemy_id)
+                    if j is not None:
+                        hidden[i, j] = True
+
+        dx = fx[:, None] - ex[None, :]
+        dy = fy[:, None] - ey[None, :]
+        distance = np.sqrt(dx * dx + dy * dy)
+        sees = (distance <= Drone.sensor_range) & ~hidden  # Drone.can_see
+        self.visible = visible = sees & e_alive
+
+        # Per enemy, as calculate_isolation_level / calculate_threat_priority;
+        # the friendly line is summed left to right like the scalar code
+        total = int(alive.sum())
+        live_y = [f.y for f in friendlies if f.health > 0 and not f.is_destroyed]
+        average_y = sum(live_y) / len(live_y) if live_y else np.nan
+        behind = ey < average_y
+        covering = (sees & alive[:, None]).sum(axis=0)
+        isolation = 1.0 - covering / max(1, total)
+        isolation = np.where(behind, np.minimum(1.0, isolation * 1.5), isolation)
+        if total == 0:
+            isolation = np.ones(E)
+        bounds = friendlies[0].bounds if friendlies else DEFAULT_BOUNDS
+        zone = np.maximum(0.1, 1.0 - (ey / bounds.height)) * 0.3
+        speed = np.minimum(1.0, np.sqrt(evx * evx + evy * evy) / 5.0) * 0.1
+        threat = np.minimum(1.0, np.where(behind, 0.6, 0.0) + zone + speed)
+        targeters = np.bincount(assigned[alive & (assigned >= 0)], minlength=E).astype(np.int64)
+        self.isolation = isolation
+        self.score_base = (isolation * 0.6) + (threat * 0.4)
+        self.targeters = targeters
+        self.enemy_y = ey
+        self.guard_y = bounds.height - 300
+        self.friendly_xy = fx, fy
+        self.friendly_alive = alive
+
+        # Per pair, one multiplication at a time in calculate_bid's order
+        weights = friendlies[0].bid_weights if friendlies else DEFAULT_BID_WEIGHTS
+        cost = distance * weights.distance
+        cost = cost * (1.0 - (isolation * weights.isolation))[None, :]
+        cost = np.where((targeters >= 1)[None, :], cost * (1.0 + (targeters * weights.over_targeting))[None, :], cost)
+        cost = cost * (1.0 - (threat * weights.threat))[None, :]
+        cost = cost * (1.0 - (ammo / 30.0))[:, None]
+        cost = cost * (health / 100.0)[:, None]
+        cost = np.where(breach[:, None], cost * weights.breach_response, cost)
+        cost = np.where(assigned[:, None] == np.arange(E)[None, :], cost * weights.commitment, cost)
+        cost = np.maximum(0.1, cost)
+        can_bid = alive & (ammo > 0)
+        self.bids = np.where(can_bid[:, None] & (distance <= Drone.sensor_range) & e_alive[None, :] & ~hidden,
+                             cost, np.inf)
+
+        self.builds += 1
+        self.pairs += F * E
+        self.build_s += time.perf_counter() - started
+
+    # Rows
+
+    def participate(self, friendly):
+        """participate_in_auction from the friendly's matrix rows (breach timer already updated)."""
+        i = self.rows[friendly.id]
+        friendly.clear_bids()
+        columns = np.flatnonzero(self.visible[i])
+        if not len(columns):
+            friendly.role = Role.PATROL
+            return
+        if (self.enemy_y[columns] > self.guard_y).any():
+            friendly.role = Role.GUARDIAN
+        elif len(columns) >= 3:
+            friendly.role = Role.SWARM
+        else:
+            friendly.role = Role.INTERCEPTOR
+        if friendly.ammo <= 3:
+            friendly.role = Role.GUARDIAN
+
+        # Most isolated first; ties keep enemy list order
+        isolation = self.isolation[columns]
+        order = columns[np.argsort(-isolation, kind="stable")]
+        bids = self.bids[i]
+        enemies = self.enemies
+        for j in order.tolist():
+            bid = bids[j]
+            if bid < np.inf:
+                enemy = enemies[j]
+                friendly.add_bid(enemy, float(bid), friendly.calculate_interception_point(enemy),
+                                 float(self.isolation[j]))
+
+    def resolve(self, bidders):
+        """resolve_auctions for every bidder, against a matrix of the bids each drone holds."""
+        friendlies, columns = self.friendlies, self.columns
+        held = np.full((len(friendlies), len(self.enemies)), np.inf)
+        for k, friendly in enumerate(friendlies):
+            if not self.friendly_alive[k]:
+                continue
+            data, row = friendly.bid_data, held[k]
+            # Backwards so the first bid on an enemy is the one kept, as bid_for finds it
+            for index in range(friendly.bid_count - 1, -1, -1):
+                j = columns.get(int(data[index * BID_STRIDE + BID_ENEMY_ID]))
+                if j is not None:
+                    row[j] = data[index * BID_STRIDE + BID_VALUE]
+
+        fx, fy = self.friendly_xy
+        range_ = Drone.communication_range
+        for friendly in bidders:
+            if not friendly.bid_count:
+                continue
+            i = self.rows[friendly.id]
+            dx = fx[i] - fx
+            dy = fy[i] - fy
+            peers = self.friendly_alive & (np.sqrt(dx * dx + dy * dy) <= range_)
+            peers[i] = False
+            data = friendly.bid_data
+            bid_columns = [columns[int(data[index * BID_STRIDE + BID_ENEMY_ID])]
+                           for index in range(friendly.bid_count)]
+            mine = np.array([data[index * BID_STRIDE + BID_VALUE] for index in range(friendly.bid_count)])
+            if peers.any():
+                lowest = held[peers][:, bid_columns].min(axis=0)
+                won = np.flatnonzero(~(lowest < mine))
+            else:
+                won = range(friendly.bid_count)
+            for index in won:
+                friendly.win_bid(int(index))
+
+    def select_target(self, friendly):
+        """Drone.select_target from the friendly's score row and live targeter counts."""
+        columns = np.flatnonzero(self.visible[self.rows[friendly.id]])
+        if not len(columns):
+            return None
+        targeters = self.targeters[columns]
+        scores = self.score_base[columns] - (targeters * 0.3)
+        order = np.argsort(-scores, kind="stable")
+        chosen = order[0]  # fallback to highest score
+        for k in order.tolist():
+            if targeters[k] < 2 or scores[k] > 0.7:
+                chosen = k
+                break
+        j = columns[chosen]
+        self.targeters[j] += 1  # the caller assigns it
+        return self.enemies[j]
+
+    def run_auction(self, sim):
+        """Flat auction, resolve and assign with bids and scores from the matrices."""
+        metrics = sim.metrics
+        friendlies, enemies = sim.friendly_drones, sim.enemy_drones
+        started = time.perf_counter()
+        bidders = [f for f in friendlies
+                   if f.health > 0 and f.role != Role.LAST_DEFENSE and f.lod != LOD_ASLEEP]
+        for friendly in bidders:
+            friendly.update_breach_response()
+        self.build(friendlies, enemies)
+        for friendly in bidders:
+            self.participate(friendly)
+            sim.total_bids += friendly.bid_count
+            metrics.on_bids(friendly.bid_count)
+            metrics.on_coordination(2 * friendly.bid_count * len(friendlies))
+        auctioned = time.perf_counter()
+
+        self.resolve(bidders)
+        for friendly in friendlies:
+            # Sleeping drones still resolve the bids they hold from earlier ticks
+            if friendly.health > 0 and friendly.role != Role.LAST_DEFENSE and friendly.lod == LOD_ASLEEP:
+                friendly.resolve_auctions(friendlies)
+        resolved = time.perf_counter()
+
+        # Targeters as resolution left them
+        alive = [f for f in friendlies if f.health > 0 and not f.is_destroyed]
+        targeted = [self.columns.get(f.assigned_target, -1) for f in alive if f.assigned_target is not None]
+        targeted = np.array([j for j in targeted if j >= 0], dtype=np.int64)
+        self.targeters = np.bincount(targeted, minlength=len(enemies)).astype(np.int64)
+        for friendly in friendlies:
+            if friendly.health > 0 and friendly.lod != LOD_ASLEEP:
+                friendly.execute_assignment(enemies, friendlies, self.select_target)
+                metrics.on_assignment(friendly)
+        metrics.add_stage_time("auction", auctioned - started)
+        metrics.add_stage_time("resolve", resolved - auctioned)
+        metrics.add_stage_time("assign", time.perf_counter() - resolved)
+
+    def metrics(self):
+        return {
+            "builds": self.builds,
+            "pairs": self.pairs,
+            "build_ms": self.build_s * 1000,
+        }
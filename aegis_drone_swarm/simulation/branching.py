@@ -0,0 +1,137 @@
+"""
+What-if branches from the live simulation state.
+
+run_branches() forks the simulation once per variant, applies the
+variant to its copy, simulates it for a number of frames and returns
+each branch's outcome, leaving the parent run untouched:
+
+- "fork" (default on POSIX) uses os.fork(): each branch is a child
+  process sharing the parent's memory copy-on-write, so forking costs a
+  page-table copy rather than a rebuild, and branches run in parallel.
+  Outcomes come back pickled over a pipe.
+- "copy" deep-copies the simulation in-process (minus its window and
+  clock) and runs the branches one after another.
+
+Every branch reseeds its copy of the simulation's random stream (shared
+by its drones and pool) from the seed, fork frame and variant name, so
+branches are reproducible and independent of each other and of the
+parent, whose stream is never drawn from.
+
+Decision points - a breach activating breach response, last-line
+defense overriding assignments - are reported to sim.decision_hooks at
+the end of the frame they happen in, a consistent state to branch from:
+
+    def compare(sim, decisions):
+        results = run_branches(sim, {"flat": None, "squads": use_squads}, frames=600)
+        print({name: result["breached"] for name, result in results.items()})
+    sim.decision_hooks.append(compare)
+"""
+
+import copy
+import os
+import pickle
+import time
+import traceback
+
+
+def outcome(sim, started_from):
+    """Outcome metrics of a branch, counted from the fork point."""
+    return {
+        "frames": sim.frame_count - started_from["frame"],
+        "neutralized": sim.enemies_neutralized - started_from["neutralized"],
+        "breached": sim.enemies_breached - started_from["breached"],
+        "friendly_losses": sim.friendly_losses - started_from["friendly_losses"],
+        "friendlies_alive": sum(1 for d in sim.friendly_drones if d.health > 0),
+        "enemies_alive": sum(1 for d in sim.enemy_drones if d.health > 0),
+        "mission_complete": sim.mission_complete,
+        "success_rate": sim.get_success_rate(),
+    }
+
+
+def _fork_point(sim):
+    return {
+        "frame": sim.frame_count,
+        "neutralized": sim.enemies_neutralized,
+        "breached": sim.enemies_breached,
+        "friendly_losses": sim.friendly_losses,
+    }
+
+
+def _run_branch(sim, name, variant, frames, seed, started_from):
+    """Turn sim (already a private copy) into the branch and simulate it."""
+    sim.headless = True
+    sim.verbose = False
+    sim.screen = sim.clock = None
+    sim.decision_hooks = []  # branches never branch again
+    sim.decisions = []
+    sim.rng.seed(f"branch:{seed}:{started_from['frame']}:{name}")
+    if variant is not None:
+        variant(sim)
+    started = time.perf_counter()
+    for _ in range(frames):
+        sim.update()
+        if sim.mission_complete:
+            break
+    result = outcome(sim, started_from)
+    result["name"] = name
+    result["wall_s"] = time.perf_counter() - started
+    return result
+
+
+def clone(sim):
+    """Deep copy of sim without its window, clock and decision hooks."""
+    memo = {id(sim.screen): None, id(sim.clock): None, id(sim.decision_hooks): []}
+    return copy.deepcopy(sim, memo)
+
+
+def run_branches(sim, variants, frames, seed=0, method=None, parallel=None):
+    """Simulate every variant from sim's current state; returns {name: outcome}.
+
+    variants maps a name to a callable applied to the branch's simulation
+    before it runs (None for the unmodified protocol). parallel caps the
+    live child processes in fork mode (default: CPU count).
+    """
+    if method is None:
+        method = "fork" if hasattr(os, "fork") else "copy"
+    started_from = _fork_point(sim)
+    if method == "copy":
+        return {name: _run_branch(clone(sim), name, variant, frames, seed, started_from)
+                for name, variant in variants.items()}
+    if method != "fork":
+        raise ValueError(f"unknown branch method: {method!r}")
+
+    parallel = parallel or os.cpu_count() or 1
+    pending = list(variants.items())
+    running = {}  # pid -> (name, read fd)
+    results = {}
+    while pending or running:
+        while pending and len(running) < parallel:
+            name, variant = pending.pop(0)
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                # Child: never return into the parent's call stack
+                status = 1
+                try:
+                    os.close(read_fd)
+                    result = _run_branch(sim, name, variant, frames, seed, started_from)
+                    with os.fdopen(write_fd, "wb") as out:
+                        pickle.dump(result, out)
+                    status = 0
+                except BaseException:
+                    traceback.print_exc()
+                finally:
+                    os._exit(status)
+            os.close(write_fd)
+            running[pid] = (name, read_fd)
+
+        # Drain one finished child's pipe, then reap it
+        pid = next(iter(running))
+        name, read_fd = running.pop(pid)
+        with os.fdopen(read_fd, "rb") as data:
+            payload = data.read()
+        _, status = os.waitpid(pid, 0)
+        if status != 0 or not payload:
+            raise RuntimeError(f"branch {name!r} failed (wait status {status})")
+        results[name] = pickle.loads(payload)
+    return {name: results[name] for name in variants}
@@ -0,0 +1,194 @@
+"""
+Camera over a world larger than the window, and viewport culling.
+
+The world is sim.width x sim.height px; the window is view_width x
+view_height. Camera maps one onto the other,
+
+    screen = (world - (x, y)) * zoom
+
+with (x, y) the world point at the window's top-left corner. Panning
+moves that corner, zooming scales about a screen point that stays put,
+and clamp() keeps the view over the world (centred on an axis where the
+world is smaller than the window). When the world and window are the
+same size the camera is the identity, so render() draws exactly what it
+drew before.
+
+CullGrid answers "which drones are inside this world rectangle" for
+render() without visiting every drone every frame:
+
+1. Drones are bucketed by position in a uniform grid (cells keyed
+   (x // cell_size, y // cell_size), as the LOD and threat cluster grids
+   are), with their draw order.
+2. No drone moves more than Drone.max_speed_pixels per move(), and
+   drones move at most twice per reference frame (the step's move plus
+   run_disorganized_behavior's extra one on protocol frames with AEGIS
+   off), so `frames` after a build every drone is within
+   2 * frames * max_speed_pixels of where it was bucketed. A query pads
+   the rectangle by that drift, reads only the cells it covers and tests
+   each candidate's current position.
+3. The grid is rebuilt once the drift bound reaches max_drift px, when
+   the frame clock goes backwards (reset, rewind) and when sim.population
+   changed - the simulation bumps it on every spawn and removal, and
+   Snapshot.apply_to when a viewer's drones come or go.
+
+A query costs the cells it covers plus the drones in them; rebuilds are
+O(N) once every max_drift / (2 * max_speed_pixels) frames (100 at the
+default 40 px), so render cost follows what is on screen rather than how many
+drones the world holds.
+"""
+
+from simulation.models.drone import Drone
+
+
+class CullGrid:
+    """Uniform grid of drone positions, rebuilt lazily within a drift bound."""
+
+    def __init__(self, cell_size=256, max_drift=40.0):
+        self.cell_size = cell_size
+        self.max_drift = max_drift
+        self.cells = {}  # (cx, cy) -> [(draw order, drone), ...]
+        self.key = None
+        self.built_frame = None
+        self.builds = 0
+        self.queries = 0
+        self.candidates = 0
+        self.hits = 0
+
+    def drift(self, sim):
+        """Furthest any drone can be from its bucketed position, or None if a rebuild is due."""
+        if self.built_frame is None or sim.frame_count < self.built_frame:
+            return None
+        # +1 for the fraction of a frame a variable step carries over
+        drift = 2 * (sim.frame_count - self.built_frame + 1) * Drone.max_speed_pixels
+        if drift > self.max_drift or sim.population != self.key:
+            return None
+        return drift
+
+    def build(self, sim):
+        size = self.cell_size
+        cells = {}
+        for order, drone in enumerate(sim.all_drones()):
+            cells.setdefault((int(drone.x // size), int(drone.y // size)), []).append((order, drone))
+        self.cells = cells
+        self.key = sim.population
+        self.built_frame = sim.frame_count
+        self.builds += 1
+
+    def query(self, sim, left, top, right, bottom):
+        """Drones whose position lies in the rectangle, in all_drones() order."""
+        drift = self.drift(sim)
+        if drift is None:
+            self.build(sim)
+            drift = 0.0
+        size = self.cell_size
+        cells = self.cells
+        found = []
+        candidates = 0
+        for cx in range(int((left - drift) // size), int((right + drift) // size) + 1):
+            for cy in range(int((top - drift) // size), int((bottom + drift) // size) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                candidates += len(bucket)
+                for entry in bucket:
+                    drone = entry[1]
+                    if left <= drone.x <= right and top <= drone.y <= bottom:
+                        found.append(entry)
+        found.sort(key=lambda entry: entry[0])  # draw in the uncut order
+        self.queries += 1
+        self.candidates += candidates
+        self.hits += len(found)
+        return [drone for _, drone in found]
+
+
+class Camera:
+    """Pan and zoom over the world; world <-> screen transforms and the visible set."""
+
+    def __init__(self, view_width, view_height, world_width, world_height, max_zoom=4.0):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.max_zoom = max_zoom
+        self.zoom = 1.0
+        self.x = 0.0
+        self.y = 0.0
+        self.grid = CullGrid()
+        self.drawn = 0
+        if world_width > view_width or world_height > view_height:
+            self.fit()
+
+    @property
+    def min_zoom(self):
+        """Zoom at which the whole world fits the window (1.0 if it already does)."""
+        return min(1.0, self.view_width / self.world_width, self.view_height / self.world_height)
+
+    def fit(self):
+        self.zoom = self.min_zoom
+        self.x = self.y = 0.0
+        self.clamp()
+
+    def clamp(self):
+        span_x = self.view_width / self.zoom
+        span_y = self.view_height / self.zoom
+        if span_x >= self.world_width:
+            self.x = (self.world_width - span_x) / 2
+        else:
+            self.x = min(max(self.x, 0.0), self.world_width - span_x)
+        if span_y >= self.world_height:
+            self.y = (self.world_height - span_y) / 2
+        else:
+            self.y = min(max(self.y, 0.0), self.world_height - span_y)
+
+    def to_screen(self, x, y):
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def to_world(self, sx, sy):
+        return sx / self.zoom + self.x, sy / self.zoom + self.y
+
+    def pan(self, dx, dy):
+        """Move the view by (dx, dy) screen px."""
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self.clamp()
+
+    def zoom_at(self, factor, sx, sy):
+        """Scale the zoom by factor, keeping the world point under (sx, sy) in place."""
+        wx, wy = self.to_world(sx, sy)
+        self.zoom = min(self.max_zoom, max(self.min_zoom, self.zoom * factor))
+        self.x = wx - sx / self.zoom
+        self.y = wy - sy / self.zoom
+        self.clamp()
+
+    def center_on(self, x, y):
+        self.x = x - self.view_width / self.zoom / 2
+        self.y = y - self.view_height / self.zoom / 2
+        self.clamp()
+
+    def viewport(self, margin=0.0):
+        """World rectangle (left, top, right, bottom) on screen, grown by margin world px."""
+        return (self.x - margin, self.y - margin,
+                self.x + self.view_width / self.zoom + margin,
+                self.y + self.view_height / self.zoom + margin)
+
+    def in_view(self, left, top, right, bottom, margin=0.0):
+        """Whether a world bounding box overlaps the viewport."""
+        v_left, v_top, v_right, v_bottom = self.viewport(margin)
+        return left <= v_right and right >= v_left and top <= v_bottom and bottom >= v_top
+
+    def visible(self, sim, margin=0.0):
+        """Drones within margin world px of the viewport, in draw order."""
+        return self.grid.query(sim, *self.viewport(margin))
+
+    def metrics(self):
+        grid = self.grid
+        return {
+            "zoom": self.zoom,
+            "viewport": self.viewport(),
+            "drawn": self.drawn,
+            "grid_builds": grid.builds,
+            "grid_cells": len(grid.cells),
+            "candidates_per_query": grid.candidates / max(1, grid.queries),
+            "hits_per_query": grid.hits / max(1, grid.queries),
+        }
+
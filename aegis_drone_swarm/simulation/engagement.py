@@ -0,0 +1,266 @@
+"""
+Swept engagement detection.
+
+Engagements used to be tested only at the end-of-frame positions, so a
+large timestep let a pursuer and its target pass through each other.
+Here every drone's motion over the frame is treated as a segment from
+(prev_x, prev_y) to (x, y):
+
+1. Broad phase: sort-and-sweep over the x extents of the swept boxes
+   (inflated by the engagement range) collects overlapping
+   friendly/enemy pairs that pass the pair filter.
+2. Narrow phase: closest approach of the two linear motions gives the
+   first time t in [0, 1] at which they come within range.
+
+Cost is O(n log n) for the sort plus the overlapping pairs, instead of
+scanning every enemy for every friendly.
+
+ContactSchedule is the event-driven alternative (engagement_mode
+"event"): no drone moves more than max_speed_pixels per reference frame,
+so a pursuit `gap` px outside engagement range cannot close for at least
+gap / (2 * max_speed_pixels) frames, and an enemy `depth` px above the
+breach line cannot cross it for depth / max_speed_pixels frames. Those
+times are pushed on a heap after the precise test an assignment (or a
+new enemy) gets in its first frame; only due events run the test again,
+and a miss reschedules from the new distance. Because the bounds use the speed cap rather than
+current velocities, no velocity change can make a prediction late.
+"""
+
+import heapq
+import math
+from collections import namedtuple
+
+Contact = namedtuple("Contact", "time friendly enemy")
+
+
+def first_contact_time(ax0, ay0, ax1, ay1, bx0, by0, bx1, by1, radius):
+    """First t in [0, 1] where two points moving linearly are within radius, else None."""
+    dx, dy = ax0 - bx0, ay0 - by0
+    c = dx * dx + dy * dy - radius * radius
+    if c <= 0:
+        return 0.0
+    vx = (ax1 - ax0) - (bx1 - bx0)
+    vy = (ay1 - ay0) - (by1 - by0)
+    a = vx * vx + vy * vy
+    if a == 0:
+        return None
+    b = dx * vx + dy * vy
+    if b >= 0:  # moving apart
+        return None
+    disc = b * b - a * c
+    if disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else None
+
+
+def contact_order(contact):
+    """Earliest first; simultaneous contacts in friendly id order."""
+    return contact.time, contact.friendly.id
+
+
+def assigned_pair(friendly, enemy):
+    """Default pair filter: a friendly only engages its assigned target."""
+    return friendly.assigned_target == enemy.id
+
+
+class EngagementDetector:
+    """Broad-phase sweep plus swept narrow phase over one frame's motion."""
+
+    def __init__(self, engagement_range=20, pair_filter=assigned_pair):
+        self.engagement_range = engagement_range
+        self.pair_filter = pair_filter
+        self.broad_pairs = 0
+        self.narrow_tests = 0
+        # With reuse set, detect() refills the same lists every call and the
+        # contacts it returns are only valid until the next call
+        self.reuse = False
+        self._entries = []
+        self._contacts = []
+        self._active = ([], [])
+
+    def detect(self, friendlies, enemies):
+        """Contacts between live friendlies and enemies, earliest first."""
+        r = self.engagement_range
+        if self.reuse:
+            entries, contacts, active = self._entries, self._contacts, self._active
+            entries.clear()
+            contacts.clear()
+            active[0].clear()
+            active[1].clear()
+        else:
+            entries, contacts, active = [], [], ([], [])
+        for drone in friendlies:
+            x0, x1 = drone.prev_x, drone.x
+            entries.append((min(x0, x1) - r, max(x0, x1) + r, 0, drone))
+        for drone in enemies:
+            x0, x1 = drone.prev_x, drone.x
+            entries.append((min(x0, x1), max(x0, x1), 1, drone))
+        entries.sort(key=lambda entry: entry[0])
+
+        # active: (max_x, drone) of friendlies / enemies still open
+        pair_filter = self.pair_filter
+        for min_x, max_x, side, drone in entries:
+            other_side = active[1 - side]
+            write = 0
+            for entry in other_side:
+                if entry[0] < min_x:
+                    continue  # closed before this one opens; drop it
+                other_side[write] = entry
+                write += 1
+                other = entry[1]
+                friendly, enemy = (drone, other) if side == 0 else (other, drone)
+                self.broad_pairs += 1
+                if not pair_filter(friendly, enemy) or not self._y_overlap(friendly, enemy, r):
+                    continue
+                self.narrow_tests += 1
+                t = first_contact_time(friendly.prev_x, friendly.prev_y, friendly.x, friendly.y,
+                                       enemy.prev_x, enemy.prev_y, enemy.x, enemy.y, r)
+                if t is not None:
+                    contacts.append(Contact(t, friendly, enemy))
+            del other_side[write:]
+            active[side].append((max_x, drone))
+
+        contacts.sort(key=contact_order)
+        return contacts
+
+    @staticmethod
+    def _y_overlap(friendly, enemy, r):
+        f_lo, f_hi = sorted((friendly.prev_y, friendly.y))
+        e_lo, e_hi = sorted((enemy.prev_y, enemy.y))
+        return f_lo - r <= e_hi and e_lo <= f_hi + r
+
+
+PURSUIT, BREACH = 0, 1
+
+
+class ContactSchedule:
+    """Time-to-contact and time-to-breach events, checked only when due.
+
+    Events are (due clock, seq, kind, drone id, enemy id, stamp); the
+    clock counts reference frames (frame_count + frame_remainder). A
+    pursuit event is stale once its friendly's stamp moves on (new
+    target, out of ammo, destroyed) and is dropped when popped.
+    """
+
+    def __init__(self, engagement_range=20, max_speed=1.0, margin=1.01):
+        self.engagement_range = engagement_range
+        self.speed = max_speed * margin  # per-frame travel bound, with float slack
+        self.events = []
+        self.seq = 0
+        self.clock = None
+        self.friendlies = {}  # id -> drone
+        self.enemies = {}  # id -> drone
+        self.pursuits = {}  # friendly id -> (target id or None, stamp)
+        self.enemy_mark = None
+        self.scheduled = 0
+        self.checks = 0
+        self.stale = 0
+        # With reuse set, due() refills the same lists every call
+        self.reuse = False
+        self._lists = ([], [], [])
+
+    def reset(self):
+        """Forget every prediction (new episode, or drones moved out of band)."""
+        self.events = []
+        self.clock = None
+        self.friendlies.clear()
+        self.enemies.clear()
+        self.pursuits.clear()
+        self.enemy_mark = None
+
+    def _push(self, due, kind, drone_id, enemy_id, stamp=0):
+        self.seq += 1
+        self.scheduled += 1
+        heapq.heappush(self.events, (due, self.seq, kind, drone_id, enemy_id, stamp))
+
+    def _pursuit_due(self, friendly, enemy, clock):
+        gap = friendly.distance_to(enemy) - self.engagement_range
+        return clock + max(0.0, gap) / (2 * self.speed)
+
+    def _breach_due(self, enemy, breach_y, clock):
+        return clock + max(0.0, breach_y - enemy.y) / self.speed
+
+    def _sync(self, sim, clock, breach_y):
+        """Register new enemies and reschedule pursuits whose assignment changed."""
+        if self.clock is not None and clock < self.clock:
+            self.reset()  # rewound or reset: every prediction is void
+        self.clock = clock
+
+        mark = (sim.next_enemy_id, len(sim.enemy_drones))
+        if mark != self.enemy_mark:
+            self.enemy_mark = mark
+            enemies = self.enemies
+            for enemy in sim.enemy_drones:
+                if enemy.health > 0 and enemies.get(enemy.id) is not enemy:
+                    enemies[enemy.id] = enemy
+                    self._push(clock, BREACH, enemy.id, enemy.id)
+
+        # Assignments change in the protocol, breach response and external
+        # hooks; comparing one id per friendly is all the polling left
+        pursuits, friendlies = self.pursuits, self.friendlies
+        for friendly in sim.friendly_drones:
+            target = friendly.assigned_target if friendly.health > 0 and friendly.ammo > 0 else None
+            fid = friendly.id
+            current = pursuits.get(fid)
+            if current is not None and current[0] == target and friendlies[fid] is friendly:
+                continue
+            stamp = 0 if current is None else current[1] + 1
+            pursuits[fid] = (target, stamp)
+            friendlies[fid] = friendly
+            if target is None:
+                continue
+            # Checked this frame: the contact may lie in the motion just made
+            self._push(clock, PURSUIT, fid, target, stamp)
+
+    def due(self, sim, breach_y):
+        """This frame's contacts (earliest first) and breaching enemies."""
+        clock = sim.frame_count + sim.frame_remainder
+        self._sync(sim, clock, breach_y)
+        r = self.engagement_range
+        if self.reuse:
+            contacts, breaches, again = self._lists
+            contacts.clear()
+            breaches.clear()
+            again.clear()
+        else:
+            contacts, breaches, again = [], [], []
+        events = self.events
+        while events and events[0][0] <= clock:
+            _, _, kind, drone_id, enemy_id, stamp = heapq.heappop(events)
+            enemy = self.enemies.get(enemy_id)
+            if enemy is None or enemy.id != enemy_id or enemy.health <= 0:
+                if kind == BREACH:
+                    self.enemies.pop(enemy_id, None)
+                continue
+            self.checks += 1
+            if kind == BREACH:
+                if enemy.y >= breach_y:
+                    breaches.append(enemy)
+                else:
+                    again.append((self._breach_due(enemy, breach_y, clock), kind, drone_id, enemy_id, stamp))
+                continue
+            pursuit = self.pursuits.get(drone_id)
+            friendly = self.friendlies.get(drone_id)
+            if pursuit is None or pursuit[1] != stamp or friendly.health <= 0 or friendly.ammo <= 0:
+                self.checks -= 1
+                self.stale += 1
+                continue
+            t = first_contact_time(friendly.prev_x, friendly.prev_y, friendly.x, friendly.y,
+                                   enemy.prev_x, enemy.prev_y, enemy.x, enemy.y, r)
+            if t is not None:
+                contacts.append(Contact(t, friendly, enemy))
+            # Rechecked even after a contact: a shared target may go to another pursuer
+            again.append((self._pursuit_due(friendly, enemy, clock), kind, drone_id, enemy_id, stamp))
+        for due, kind, drone_id, enemy_id, stamp in again:
+            self._push(due, kind, drone_id, enemy_id, stamp)
+        contacts.sort(key=contact_order)
+        return contacts, breaches
+
+    def metrics(self):
+        return {
+            "pending": len(self.events),
+            "scheduled": self.scheduled,
+            "checks": self.checks,
+            "stale": self.stale,
+        }
@@ -0,0 +1,262 @@
+"""
+Gymnasium-style training environment around the AEGIS simulation.
+
+Observations are fixed-shape NumPy arrays so policies can be batched:
+
+    friendly        float32 (max_friendlies, 7)  x, y, vx, vy, health, ammo, role
+    friendly_mask   bool    (max_friendlies,)
+    enemy           float32 (max_enemies, 5)     x, y, vx, vy, health
+    enemy_mask      bool    (max_enemies,)
+    assignment      int32   (max_friendlies,)    enemy slot per friendly, -1 if none
+
+Positions are normalized by the world size, health and ammo by their
+maxima. Drones keep their slot for as long as they are alive.
+
+Actions override the protocol for the next step. Either an int array of
+enemy slots per friendly (-1 leaves the AEGIS decision alone), or a dict
+with "assign" (same array) and/or "waypoint" (float (max_friendlies, 2)
+normalized target positions, NaN rows are ignored).
+"""
+
+import numpy as np
+
+from simulation.simulation import AegisSimulation
+
+FRIENDLY_FEATURES = 7
+ENEMY_FEATURES = 5
+
+
+def make_observation_buffers(max_friendlies, max_enemies, batch_shape=()):
+    return {
+        "friendly": np.zeros(batch_shape + (max_friendlies, FRIENDLY_FEATURES), dtype=np.float32),
+        "friendly_mask": np.zeros(batch_shape + (max_friendlies,), dtype=bool),
+        "enemy": np.zeros(batch_shape + (max_enemies, ENEMY_FEATURES), dtype=np.float32),
+        "enemy_mask": np.zeros(batch_shape + (max_enemies,), dtype=bool),
+        "assignment": np.full(batch_shape + (max_friendlies,), -1, dtype=np.int32),
+    }
+
+
+class SlotMap:
+    """Stable slot assignment for drones that come and go."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.slots = {}  # drone id -> slot
+        self.free = list(range(capacity - 1, -1, -1))
+        self.drones = [None] * capacity
+
+    def clear(self):
+        self.slots.clear()
+        self.free = list(range(self.capacity - 1, -1, -1))
+        self.drones = [None] * self.capacity
+
+    def sync(self, alive):
+        """Release slots of drones no longer alive and admit new ones.
+
+        Slots are keyed by drone id because pooled Drone objects are reused.
+        Drones beyond capacity stay unobserved until a slot frees up.
+        """
+        alive_ids = {d.id for d in alive}
+        for drone_id in [i for i in self.slots if i not in alive_ids]:
+            slot = self.slots.pop(drone_id)
+            self.drones[slot] = None
+            self.free.append(slot)
+        for drone in alive:
+            slot = self.slots.get(drone.id)
+            if slot is None and self.free:
+                slot = self.free.pop()
+                self.slots[drone.id] = slot
+            if slot is not None:
+                self.drones[slot] = drone
+
+
+class AegisEnv:
+    """Single simulation exposed through reset(seed) / step(actions)."""
+
+    def __init__(self, max_friendlies=16, max_enemies=32, frames_per_step=8, max_steps=500,
+                 initial_enemies=8, reward_neutralized=1.0, reward_breached=-2.0,
+                 reward_friendly_lost=-0.5):
+        self.max_friendlies = max_friendlies
+        self.max_enemies = max_enemies
+        self.frames_per_step = frames_per_step
+        self.max_steps = max_steps
+        self.reward_neutralized = reward_neutralized
+        self.reward_breached = reward_breached
+        self.reward_friendly_lost = reward_friendly_lost
+
+        self.sim = AegisSimulation(headless=True, verbose=False)
+        self.sim.initial_enemies = initial_enemies
+        self.sim.protocol_hooks.append(self._apply_overrides)
+
+        self.friendly_slots = SlotMap(max_friendlies)
+        self.enemy_slots = SlotMap(max_enemies)
+        self.buffers = make_observation_buffers(max_friendlies, max_enemies)
+        self._assign_override = np.full(max_friendlies, -1, dtype=np.int64)
+        self._waypoint_override = np.full((max_friendlies, 2), np.nan)
+        self.steps = 0
+
+    def reset(self, seed=None, out=None):
+        self.sim.reset(seed)
+        self.friendly_slots.clear()
+        self.enemy_slots.clear()
+        self._assign_override.fill(-1)
+        self._waypoint_override.fill(np.nan)
+        self.steps = 0
+        return self.observe(out), self._info()
+
+    def step(self, actions=None, out=None):
+        self.set_actions(actions)
+        sim = self.sim
+        before = (sim.enemies_neutralized, sim.enemies_breached, sim.friendly_losses)
+        for _ in range(self.frames_per_step):
+            sim.update()
+            self._enforce_overrides()
+            if sim.mission_complete:
+                break
+        self.steps += 1
+
+        reward = (
+            (sim.enemies_neutralized - before[0]) * self.reward_neutralized
+            + (sim.enemies_breached - before[1]) * self.reward_breached
+            + (sim.friendly_losses - before[2]) * self.reward_friendly_lost
+        )
+        terminated = sim.mission_complete
+        truncated = not terminated and self.steps >= self.max_steps
+        return self.observe(out), float(reward), terminated, truncated, self._info()
+
+    def set_actions(self, actions):
+        self._assign_override.fill(-1)
+        self._waypoint_override.fill(np.nan)
+        if actions is None:
+            return
+        if isinstance(actions, dict):
+            assign = actions.get("assign")
+            waypoint = actions.get("waypoint")
+        else:
+            assign, waypoint = actions, None
+        if assign is not None:
+            self._assign_override[:] = np.asarray(assign).reshape(self.max_friendlies)
+        if waypoint is not None:
+            self._waypoint_override[:] = np.asarray(waypoint, dtype=float).reshape(self.max_friendlies, 2)
+
+    def _apply_overrides(self, sim):
+        """Protocol hook: re-impose policy choices after every AEGIS tick."""
+        for slot in np.flatnonzero(self._assign_override >= 0):
+            friendly = self.friendly_slots.drones[slot]
+            enemy_slot = self._assign_override[slot]
+            enemy = self.enemy_slots.drones[enemy_slot] if enemy_slot < self.max_enemies else None
+            if friendly is None or enemy is None or friendly.health <= 0 or enemy.health <= 0:
+                continue
+            friendly.assigned_target = enemy.id
+            friendly.target_enemy = enemy
+            point = friendly.calculate_interception_point(enemy)
+            if point:
+                friendly.target_x, friendly.target_y = point
+        self._enforce_overrides()
+
+    def _enforce_overrides(self):
+        rows = np.flatnonzero(~np.isnan(self._waypoint_override[:, 0]))
+        for slot in rows:
+            friendly = self.friendly_slots.drones[slot]
+            if friendly is not None and friendly.health > 0:
+                friendly.target_x = self._waypoint_override[slot, 0] * self.sim.width
+                friendly.target_y = self._waypoint_override[slot, 1] * self.sim.height
+
+    def observe(self, out=None):
+        """Write the current state into fixed-shape arrays (reused if out is given)."""
+        out = self.buffers if out is None else out
+        sim = self.sim
+        friendlies = [d for d in sim.friendly_drones if d.health > 0 and not d.is_destroyed]
+        enemies = [d for d in sim.enemy_drones if d.health > 0 and not d.is_destroyed]
+        self.friendly_slots.sync(friendlies)
+        self.enemy_slots.sync(enemies)
+
+        for key in ("friendly", "enemy", "friendly_mask", "enemy_mask"):
+            out[key].fill(0)
+        out["assignment"].fill(-1)
+
+        inv_w, inv_h = 1.0 / sim.width, 1.0 / sim.height
+        enemy_slot_by_id = self.enemy_slots.slots
+        if enemy_slot_by_id:
+            slots = np.fromiter(enemy_slot_by_id.values(), dtype=np.intp)
+            drones = [self.enemy_slots.drones[s] for s in slots]
+            rows = np.array([(d.x * inv_w, d.y * inv_h, d.velocity_x, d.velocity_y, d.health / 100.0)
+                             for d in drones], dtype=np.float32)
+            out["enemy"][slots] = rows
+            out["enemy_mask"][slots] = True
+
+        if self.friendly_slots.slots:
+            slots = np.fromiter(self.friendly_slots.slots.values(), dtype=np.intp)
+            drones = [self.friendly_slots.drones[s] for s in slots]
+            rows = np.array([(d.x * inv_w, d.y * inv_h, d.velocity_x, d.velocity_y, d.health / 100.0,
+                              d.ammo / 15.0, int(d.role)) for d in drones], dtype=np.float32)
+            out["friendly"][slots] = rows
+            out["friendly_mask"][slots] = True
+            out["assignment"][slots] = [enemy_slot_by_id.get(d.assigned_target, -1) for d in drones]
+        return out
+
+    def _info(self):
+        sim = self.sim
+        return {
+            "frame": sim.frame_count,
+            "enemies_neutralized": sim.enemies_neutralized,
+            "enemies_breached": sim.enemies_breached,
+            "friendly_losses": sim.friendly_losses,
+            "spawn_queue": len(sim.spawn_queue),
+        }
+
+
+class VectorAegisEnv:
+    """Steps many AegisEnv copies at once into stacked (num_envs, ...) arrays.
+
+    Finished environments reset automatically; the final observation of
+    the finished episode is reported in info["final_observation"].
+    """
+
+    def __init__(self, num_envs, seed=None, **env_kwargs):
+        self.num_envs = num_envs
+        self.envs = [AegisEnv(**env_kwargs) for _ in range(num_envs)]
+        first = self.envs[0]
+        self.buffers = make_observation_buffers(first.max_friendlies, first.max_enemies, (num_envs,))
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self.base_seed = seed
+        self.episode_counts = np.zeros(num_envs, dtype=np.int64)
+
+    def _views(self, index):
+        return {key: value[index] for key, value in self.buffers.items()}
+
+    def _seed_for(self, index):
+        if self.base_seed is None:
+            return None
+        return self.base_seed + index + int(self.episode_counts[index]) * self.num_envs
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.base_seed = seed
+        self.episode_counts.fill(0)
+        infos = [env.reset(self._seed_for(i), out=self._views(i))[1] for i, env in enumerate(self.envs)]
+        return self.buffers, infos
+
+    def step(self, actions=None):
+        infos = []
+        for i, env in enumerate(self.envs):
+            env_actions = None if actions is None else _index_actions(actions, i)
+            views = self._views(i)
+            _, reward, terminated, truncated, info = env.step(env_actions, out=views)
+            self.rewards[i] = reward
+            self.terminated[i] = terminated
+            self.truncated[i] = truncated
+            if terminated or truncated:
+                info["final_observation"] = {key: value.copy() for key, value in views.items()}
+                self.episode_counts[i] += 1
+                env.reset(self._seed_for(i), out=views)
+            infos.append(info)
+        return self.buffers, self.rewards, self.terminated, self.truncated, infos
+
+
+def _index_actions(actions, index):
+    if isinstance(actions, dict):
+        return {key: value[index] for key, value in actions.items()}
+    return actions[index]
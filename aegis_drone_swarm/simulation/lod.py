@@ -0,0 +1,130 @@
+"""
+Level of detail for drones that nothing is happening around.
+
+Two reductions, both driven by a coarse grid whose cells are one extended
+sensor range wide, so a drone's 3x3 cell neighbourhood covers everything
+within that range:
+
+- Sleeping: a patrol friendly with no target that has settled on its
+  patrol point, with no enemy in its neighbourhood, is put to sleep and
+  skipped by physics and the protocol. It wakes when an enemy enters a
+  neighbouring cell (a cell going from empty to occupied is the wake
+  event), when breach response starts, or when AEGIS is toggled.
+- Kinematic enemies: an enemy with no friendly in its neighbourhood
+  coasts straight at its target at cruise speed instead of running the
+  steering physics, and switches back once it comes near a friendly.
+"""
+
+from simulation.models.drone import LOD_ASLEEP, LOD_FULL, LOD_KINEMATIC, Drone, Role
+
+
+class LevelOfDetail:
+    """Puts idle friendlies to sleep and coasts distant enemies."""
+
+    def __init__(self, cell_size=Drone.sensor_range * 1.5, arrive_radius=2.0, settle_speed=0.03):
+        self.cell_size = cell_size
+        self.arrive_radius = arrive_radius
+        self.settle_speed = settle_speed  # px per reference frame
+        self.enemy_cells = set()
+        self.watchers = {}  # cell -> sleeping drones whose neighbourhood includes it
+        self.sleepers = {}  # sleeping drone -> cells it watches
+        self.kinematic = 0
+        self.wakes = 0
+
+    def reset(self):
+        """Forget grid occupancy and sleepers (new episode)."""
+        self.enemy_cells = set()
+        self.watchers = {}
+        self.sleepers = {}
+
+    def cell_of(self, drone):
+        size = self.cell_size
+        return int(drone.x // size), int(drone.y // size)
+
+    @staticmethod
+    def neighbourhood(cell):
+        cx, cy = cell
+        return [(cx + dx, cy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+    def update(self, sim):
+        """Refresh grid occupancy, wake or sleep friendlies and set enemy LOD."""
+        enemy_cells = set()
+        for enemy in sim.enemy_drones:
+            if enemy.health > 0:
+                enemy_cells.add(self.cell_of(enemy))
+        entered = enemy_cells - self.enemy_cells
+        self.enemy_cells = enemy_cells
+
+        for cell in entered:
+            for drone in list(self.watchers.get(cell, ())):
+                self.wake(drone)
+
+        breach = sim.breach_response_active
+        for drone in list(self.sleepers):
+            if breach or drone.lod != LOD_ASLEEP or drone.health <= 0 or drone.breach_response_mode:
+                self.wake(drone)
+
+        friendly_cells = set()
+        for friendly in sim.friendly_drones:
+            if friendly.health <= 0:
+                continue
+            cell = self.cell_of(friendly)
+            friendly_cells.add(cell)
+            if friendly.lod == LOD_FULL and not breach and self.can_sleep(friendly, cell):
+                self.sleep(friendly, cell)
+
+        self.kinematic = 0
+        for enemy in sim.enemy_drones:
+            if enemy.health <= 0:
+                continue
+            near = any(cell in friendly_cells for cell in self.neighbourhood(self.cell_of(enemy)))
+            enemy.lod = LOD_FULL if near else LOD_KINEMATIC
+            if not near:
+                self.kinematic += 1
+
+    def can_sleep(self, drone, cell):
+        if (drone.role != Role.PATROL or drone.assigned_target is not None
+                or drone.breach_response_mode):
+            return False
+        dx, dy = drone.target_x - drone.x, drone.target_y - drone.y
+        if dx * dx + dy * dy > self.arrive_radius * self.arrive_radius:
+            return False
+        vx, vy = drone.velocity_x, drone.velocity_y
+        if vx * vx + vy * vy > self.settle_speed * self.settle_speed:
+            return False
+        return not any(c in self.enemy_cells for c in self.neighbourhood(cell))
+
+    def sleep(self, drone, cell):
+        drone.lod = LOD_ASLEEP
+        drone.velocity_x = drone.velocity_y = 0.0
+        drone.prev_x, drone.prev_y = drone.x, drone.y
+        cells = self.neighbourhood(cell)
+        self.sleepers[drone] = cells
+        for c in cells:
+            self.watchers.setdefault(c, set()).add(drone)
+
+    def wake(self, drone):
+        cells = self.sleepers.pop(drone, None)
+        if cells is None:
+            return
+        for c in cells:
+            watching = self.watchers.get(c)
+            if watching is not None:
+                watching.discard(drone)
+                if not watching:
+                    del self.watchers[c]
+        if drone.lod == LOD_ASLEEP:
+            drone.lod = LOD_FULL
+            drone.evaluated_frame = None  # due for protocol evaluation right away
+        self.wakes += 1
+
+    def wake_all(self, sim):
+        for drone in list(self.sleepers):
+            self.wake(drone)
+        for enemy in sim.enemy_drones:
+            enemy.lod = LOD_FULL
+        self.kinematic = 0
+
+    @property
+    def sleeping(self):
+        return len(self.sleepers)
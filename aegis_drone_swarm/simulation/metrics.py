@@ -0,0 +1,186 @@
+"""
+Time series of simulation metrics on preallocated ring buffers.
+
+MetricsStore is fed by the simulation as things happen - drones spawning,
+neutralizations, breaches, losses, bids, assignment changes, stage timings
+- and keeps running values instead of rescanning drone lists. Every
+`sample_every` reference frames (one protocol tick by default) the running
+values are appended to fixed-capacity ring buffers, so memory stays flat
+however long a run lasts. Time-to-neutralize samples go to their own ring
+as they happen. The rings are stdlib arrays and are read back as NumPy
+arrays, so NumPy is only imported once someone reads the history.
+
+Alive counts are also resynchronized from list lengths after
+cleanup_destroyed_drones(), which compacts the lists to live drones only.
+"""
+
+import csv
+from array import array
+
+from simulation.physics import REFERENCE_DT
+
+SERIES = (
+    "frame",
+    "friendlies_alive",
+    "enemies_alive",
+    "isolated_threats",
+    "bids",
+    "coordination_work",
+    "assignment_churn",
+    "neutralized",
+    "breached",
+)
+
+# Per-sample wall time of each stage, in milliseconds
+STAGES = ("protocol", "auction", "resolve", "assign", "movement", "engagement")
+
+
+class RingBuffer:
+    """Fixed-capacity FIFO of scalars backed by one preallocated array.
+
+    typecode is an array module code: "d" for floats, "q" for int64.
+    """
+
+    def __init__(self, capacity, typecode="d"):
+        self.data = array(typecode, [0]) * capacity
+        self.capacity = capacity
+        self.head = 0  # next write position
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def values(self, last=None):
+        """Oldest-to-newest NumPy copy of the stored values (the newest `last` only)."""
+        import numpy as np
+
+        data = np.frombuffer(self.data, dtype=self.data.typecode)
+        count = self.count if last is None else min(last, self.count)
+        start = (self.head - count) % self.capacity
+        if start + count <= self.capacity:
+            return data[start:start + count].copy()
+        return np.concatenate((data[start:], data[:self.head]))
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+
+class MetricsStore:
+    """Running metric values plus their sampled history."""
+
+    def __init__(self, capacity=1024, sample_every=8, ttn_capacity=1024):
+        self.capacity = capacity
+        self.sample_every = sample_every
+        self.series = {name: RingBuffer(capacity, "q") for name in SERIES}
+        self.stage_ms = {name: RingBuffer(capacity) for name in STAGES}
+        self.time_to_neutralize = RingBuffer(ttn_capacity)  # seconds
+        self.reset()
+
+    def reset(self):
+        """Forget running values and history (simulation reset)."""
+        for ring in self.series.values():
+            ring.clear()
+        for ring in self.stage_ms.values():
+            ring.clear()
+        self.time_to_neutralize.clear()
+        self.friendlies_alive = 0
+        self.enemies_alive = 0
+        self.isolated_threats = 0
+        self.spawn_frames = {}  # enemy id -> frame it spawned
+        self.last_targets = {}  # friendly id -> assigned target at last assignment
+        self._bids = 0
+        self._work = 0
+        self._churn = 0
+        self._neutralized = 0
+        self._breached = 0
+        self._stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self._last_sample = None
+
+    # Events
+
+    def on_spawn(self, drone, frame):
+        if drone.drone_type == "enemy":
+            self.enemies_alive += 1
+            self.spawn_frames[drone.id] = frame
+        else:
+            self.friendlies_alive += 1
+
+    def on_neutralized(self, enemy, frame):
+        self.enemies_alive -= 1
+        self._neutralized += 1
+        spawned = self.spawn_frames.pop(enemy.id, None)
+        if spawned is not None:
+            self.time_to_neutralize.append((frame - spawned) * REFERENCE_DT)
+
+    def on_breach(self, enemy):
+        self.enemies_alive -= 1
+        self._breached += 1
+        self.spawn_frames.pop(enemy.id, None)
+
+    def on_friendly_lost(self, friendly):
+        self.friendlies_alive -= 1
+        self.last_targets.pop(friendly.id, None)
+
+    def on_bids(self, count):
+        self._bids += count
+
+    def on_coordination(self, work):
+        """Peer drones examined scoring, selecting and resolving (see Drone.peer_scans)."""
+        self._work += work
+
+    def on_assignment(self, friendly):
+        """Count a change of assigned target since the friendly's last assignment."""
+        target = friendly.assigned_target
+        if self.last_targets.get(friendly.id) != target:
+            self.last_targets[friendly.id] = target
+            self._churn += 1
+
+    def add_stage_time(self, stage, seconds):
+        self._stage_seconds[stage] += seconds
+
+    def resync(self, friendlies_alive, enemies_alive):
+        self.friendlies_alive = friendlies_alive
+        self.enemies_alive = enemies_alive
+
+    # Sampling and export
+
+    def sample(self, frame):
+        """Append one sample per `sample_every` frames of simulated time."""
+        bucket = frame // self.sample_every
+        if bucket == self._last_sample:
+            return
+        self._last_sample = bucket
+        values = (frame, self.friendlies_alive, self.enemies_alive, self.isolated_threats,
+                  self._bids, self._work, self._churn, self._neutralized, self._breached)
+        for name, value in zip(SERIES, values):
+            self.series[name].append(value)
+        for stage, seconds in self._stage_seconds.items():
+            self.stage_ms[stage].append(seconds * 1000)
+            self._stage_seconds[stage] = 0.0
+        self._bids = self._work = self._churn = self._neutralized = self._breached = 0
+
+    def columns(self):
+        """Sampled history as named arrays, oldest first."""
+        columns = {name: ring.values() for name, ring in self.series.items()}
+        columns.update({f"{stage}_ms": ring.values() for stage, ring in self.stage_ms.items()})
+        return columns
+
+    def export_npz(self, path):
+        import numpy as np
+
+        np.savez_compressed(path, time_to_neutralize=self.time_to_neutralize.values(), **self.columns())
+
+    def export_csv(self, path):
+        """Sampled series as CSV; time-to-neutralize goes to the NPZ export."""
+        columns = self.columns()
+        with open(path, "w", newline="") as out:
+            writer = csv.writer(out)
+            writer.writerow(columns)
+            writer.writerows(zip(*(array.tolist() for array in columns.values())))
@@ -1,49 +1,134 @@
-import pygame
 import random
 import math
-import uuid
+import itertools
+from array import array
+from collections import namedtuple
+from enum import IntEnum
+
+from simulation.physics import REFERENCE_DT, damping_factor
+
+class Role(IntEnum):
+    """Tactical role as a small int; label is only needed for display."""
+    PATROL = 0
+    GUARDIAN = 1
+    SWARM = 2
+    INTERCEPTOR = 3
+    LAST_DEFENSE = 4
+    DISABLED = 5
+
+    @property
+    def label(self):
+        return ROLE_LABELS[self]
+
+ROLE_LABELS = ("Patrol", "Guardian", "Swarm", "Interceptor", "LAST DEFENSE", "DISABLED")
+
+# Shared (color, highlight_color) palettes - one tuple per type, not per drone
+PALETTES = {
+    "friendly": ((0, 150, 255), (100, 200, 255)),    # Military blue
+    "enemy": ((255, 80, 80), (255, 150, 150)),       # Military red
+}
+DESTROYED_COLOR = (50, 50, 50)
+
+# Bid storage layout: one row of BID_STRIDE doubles per bid
+BID_ENEMY_ID, BID_VALUE, BID_POINT_X, BID_POINT_Y, BID_ISOLATION = range(5)
+BID_STRIDE = 5
+INITIAL_BID_CAPACITY = 8
+
+# calculate_bid() cost terms: distance weight, isolation/threat discounts
+# (fraction of cost removed at level 1.0), over-targeting penalty per
+# targeter, and multipliers in breach response / on the current target
+BidWeights = namedtuple("BidWeights", "distance isolation over_targeting threat breach_response commitment")
+DEFAULT_BID_WEIGHTS = BidWeights(0.3, 0.8, 0.8, 0.6, 0.6, 0.2)
+
+# World size in px; the protected zone runs along the bottom edge, and
+# spawn targets, drift, interception points and threat scales follow it
+WorldBounds = namedtuple("WorldBounds", "width height")
+DEFAULT_BOUNDS = WorldBounds(1200, 800)
+
+# Level of detail (see simulation/lod.py)
+LOD_FULL, LOD_KINEMATIC, LOD_ASLEEP = range(3)
+
+_anonymous_ids = itertools.count(1_000_000)
 
 class Drone:
-    def __init__(self, x, y, drone_type, drone_id=None):
+    """
+    Compact drone: declared slots, integer id, small-int role and bids
+    held in a preallocated flat array instead of a dict of dicts.
+    """
+    __slots__ = (
+        "x", "y", "prev_x", "prev_y", "drone_type", "id", "palette", "rng",
+        "acceleration", "velocity_x", "velocity_y",
+        "assigned_target", "target_enemy", "interception_point",
+        "ammo", "health", "is_destroyed", "role",
+        "target_x", "target_y", "patrol_point",
+        "last_target_status", "breach_response_mode", "breach_response_timer",
+        "evaluated_frame", "lod", "hidden", "heading", "aggressiveness", "evasion_chance", "determination",
+        "neutralized_count", "bids_won", "bids_lost", "interceptions_made",
+        "bid_count", "bid_data", "bid_enemies", "bounds", "bid_weights",
+    )
+
+    # Physical and sensor properties shared by every drone
+    radius = 8
+    max_speed = 12.0
+    pixels_per_meter = 1.0
+    max_speed_pixels = (max_speed * pixels_per_meter) / 60
+    sensor_range = 250
+    engagement_range = 20
+    communication_range = 300
+    # Peer drones examined by bid scoring, target selection and resolution,
+    # summed over all drones; coordinators charge the difference as work
+    peer_scans = 0
+
+    def __init__(self, x, y, drone_type, drone_id=None, rng=None, bounds=None, bid_weights=None):
         """
         Enhanced drone with better threat detection and tactical reset.
+        drone_id is an integer; rng is the owning simulation's random stream
+        (module random by default), bounds its WorldBounds (DEFAULT_BOUNDS
+        by default) and bid_weights its BidWeights (DEFAULT_BID_WEIGHTS).
         """
+        self.bid_data = None
+        self.bid_enemies = None
+        self.reset(x, y, drone_type, drone_id, rng, bounds, bid_weights)
+
+    def reset(self, x, y, drone_type, drone_id=None, rng=None, bounds=None, bid_weights=None):
+        """Reinitialize every field so a pooled drone comes back as a new one."""
+        self.rng = rng or random
+        self.bounds = bounds or DEFAULT_BOUNDS
+        self.bid_weights = bid_weights or DEFAULT_BID_WEIGHTS
         self.x = x
         self.y = y
+        self.prev_x = x  # position at the start of the last move, for swept checks
+        self.prev_y = y
         self.drone_type = drone_type
-        self.id = drone_id or str(uuid.uuid4())[:8]
+        self.id = next(_anonymous_ids) if drone_id is None else drone_id
+        self.palette = PALETTES[drone_type]
         
-        # Physical properties
-        self.radius = 8
-        self.max_speed = 12.0
         self.acceleration = 1.0
-        self.pixels_per_meter = 1.0
-        self.max_speed_pixels = (self.max_speed * self.pixels_per_meter) / 60
         
         # Current velocity
         self.velocity_x = 0
         self.velocity_y = 0
         
-        # MILITARY COLOR SCHEME
-        if drone_type == "friendly":
-            self.color = (0, 150, 255)    # Military blue
-            self.highlight_color = (100, 200, 255)
-        else:
-            self.color = (255, 80, 80)    # Military red
-            self.highlight_color = (255, 150, 150)
-        
         # AEGIS PROTOCOL PROPERTIES
         self.assigned_target = None
-        self.sensor_range = 250
-        self.engagement_range = 20
+        self.target_enemy = None
+        self.interception_point = None
         self.ammo = 15
         self.health = 100
         self.is_destroyed = False
         
-        # Auction system properties
-        self.current_bids = {}
-        self.communication_range = 300
-        self.role = "Patrol"
+        # Auction system properties (only friendlies ever bid)
+        if drone_type == "friendly":
+            if self.bid_data is None:
+                self.bid_data = array("d", bytes(8 * BID_STRIDE * INITIAL_BID_CAPACITY))
+                self.bid_enemies = [None] * INITIAL_BID_CAPACITY
+            else:
+                self.clear_bids()
+        else:
+            self.bid_data = None
+            self.bid_enemies = None
+        self.bid_count = 0
+        self.role = Role.PATROL
         
         # Target positions
         self.target_x = x
@@ -54,12 +139,19 @@ class Drone:
         self.last_target_status = "active"
         self.breach_response_mode = False
         self.breach_response_timer = 0
+        self.evaluated_frame = None  # last protocol evaluation (scheduled mode)
+        self.lod = LOD_FULL
+        self.hidden = None  # ids of enemies in range but occluded (World.update_sight)
+        self.heading = None  # flow-field direction to steer along (navigation.py)
         
         # Enhanced enemy behavior
+        self.aggressiveness = 1.0
+        self.evasion_chance = 0.0
+        self.determination = 0.9
         if drone_type == "enemy":
-            self.target_x = random.randint(100, 1100)
-            self.target_y = 750
-            self.aggressiveness = random.uniform(0.8, 1.2)
+            self.target_x = self.rng.randint(100, self.bounds.width - 100)
+            self.target_y = self.bounds.height - 50
+            self.aggressiveness = self.rng.uniform(0.8, 1.2)
             self.evasion_chance = 0.1
             self.determination = 0.98
         
@@ -69,50 +161,165 @@ class Drone:
         self.bids_lost = 0
         self.interceptions_made = 0
 
-    def apply_physics(self):
-        """Apply realistic physics."""
+    @property
+    def name(self):
+        """Display name, built only when something is shown to a human."""
+        return f"{'F' if self.drone_type == 'friendly' else 'E'}{self.id}"
+
+    @property
+    def color(self):
+        return DESTROYED_COLOR if self.is_destroyed else self.palette[0]
+
+    @property
+    def highlight_color(self):
+        return self.palette[1]
+
+    def clear_bids(self):
+        """Drop all current bids without releasing the bid storage."""
+        if self.bid_count:
+            self.bid_enemies[:self.bid_count] = [None] * self.bid_count
+        self.bid_count = 0
+
+    def add_bid(self, enemy, bid_value, interception_point, isolation_level):
+        capacity = len(self.bid_enemies)
+        if self.bid_count == capacity:
+            self.bid_data.extend(bytes(8 * BID_STRIDE * capacity))
+            self.bid_enemies.extend([None] * capacity)
+        row = self.bid_count * BID_STRIDE
+        data = self.bid_data
+        data[row + BID_ENEMY_ID] = enemy.id
+        data[row + BID_VALUE] = bid_value
+        if interception_point:
+            data[row + BID_POINT_X], data[row + BID_POINT_Y] = interception_point
+        else:
+            data[row + BID_POINT_X] = data[row + BID_POINT_Y] = math.nan
+        data[row + BID_ISOLATION] = isolation_level
+        self.bid_enemies[self.bid_count] = enemy
+        self.bid_count += 1
+
+    def drop_bids(self, enemies):
+        """Forget bids on any of `enemies` (a set), keeping the other rows in order."""
+        data, refs = self.bid_data, self.bid_enemies
+        kept = 0
+        for index in range(self.bid_count):
+            enemy = refs[index]
+            if enemy in enemies:
+                continue
+            if kept != index:
+                data[kept * BID_STRIDE:(kept + 1) * BID_STRIDE] = data[index * BID_STRIDE:(index + 1) * BID_STRIDE]
+                refs[kept] = enemy
+            kept += 1
+        refs[kept:self.bid_count] = [None] * (self.bid_count - kept)
+        self.bid_count = kept
+
+    def reserve_bids(self, count):
+        """Grow bid storage to hold `count` bids before an auction needs them."""
+        capacity = len(self.bid_enemies)
+        if count > capacity:
+            self.bid_data.extend(bytes(8 * BID_STRIDE * (count - capacity)))
+            self.bid_enemies.extend([None] * (count - capacity))
+
+    def bid_for(self, enemy_id):
+        """This drone's current bid on enemy_id, or None."""
+        data = self.bid_data
+        for row in range(0, self.bid_count * BID_STRIDE, BID_STRIDE):
+            if data[row + BID_ENEMY_ID] == enemy_id:
+                return data[row + BID_VALUE]
+        return None
+
+    def bid_interception_point(self, index):
+        row = index * BID_STRIDE
+        x = self.bid_data[row + BID_POINT_X]
+        if x != x:  # NaN marks "no interception point"
+            return None
+        return (x, self.bid_data[row + BID_POINT_Y])
+
+    def iter_bids(self):
+        """Yield (enemy, bid_value) for every current bid."""
+        data = self.bid_data
+        for i in range(self.bid_count):
+            yield self.bid_enemies[i], data[i * BID_STRIDE + BID_VALUE]
+
+    def tracked_target(self):
+        """target_enemy while it is still the assigned enemy, else None.
+
+        Pools recycle Drone objects under new ids, so a reference kept past
+        its enemy's removal can point at a different, live drone.
+        """
+        target = self.target_enemy
+        if target is not None and target.id == self.assigned_target:
+            return target
+        return None
+
+    def steering_acceleration(self):
+        """Acceleration toward the current target, in px per reference frame squared.
+
+        None when the drone is already on its target point. With a heading
+        set by the navigation layer, steers along it instead of straight.
+        """
         dx = self.target_x - self.x
         dy = self.target_y - self.y
         distance = math.sqrt(dx*dx + dy*dy)
         
-        if distance > 0:
+        if distance == 0:
+            return None
+        
+        if self.heading is not None:
+            dx, dy = self.heading
+        else:
             dx /= distance
             dy /= distance
-            
-            acceleration_factor = self.acceleration
-            if self.role == "Interceptor":
-                acceleration_factor *= 1.5
-            elif self.role == "Guardian":
-                acceleration_factor *= 0.8
-            elif self.role == "LAST DEFENSE":
-                acceleration_factor *= 2.0
-            
-            # CRITICAL FIX: Increase acceleration if target is behind friendly lines
-            if self.drone_type == "friendly" and self.assigned_target:
-                # Calculate average friendly position
-                avg_friendly_y = self.y  # Start with own position
-                friendly_count = 1
-                
-                # This would need access to other drones, but we'll handle in movement logic
-                # For now, use simple heuristic: if target is above us (behind), accelerate faster
-                if hasattr(self, 'target_enemy') and self.target_enemy:
-                    if self.target_enemy.y < self.y:  # Enemy is behind our lines
-                        acceleration_factor *= 1.8  # 80% faster acceleration
-            
-            self.velocity_x += dx * acceleration_factor / 60
-            self.velocity_y += dy * acceleration_factor / 60
-            
-            current_speed = math.sqrt(self.velocity_x**2 + self.velocity_y**2)
-            if current_speed > self.max_speed_pixels:
-                scale = self.max_speed_pixels / current_speed
-                self.velocity_x *= scale
-                self.velocity_y *= scale
         
-        self.velocity_x *= 0.97
-        self.velocity_y *= 0.97
+        acceleration_factor = self.acceleration
+        if self.role == Role.INTERCEPTOR:
+            acceleration_factor *= 1.5
+        elif self.role == Role.GUARDIAN:
+            acceleration_factor *= 0.8
+        elif self.role == Role.LAST_DEFENSE:
+            acceleration_factor *= 2.0
+        
+        # CRITICAL FIX: Increase acceleration if target is behind friendly lines
+        if self.drone_type == "friendly" and self.assigned_target is not None:
+            # For now, use simple heuristic: if target is above us (behind), accelerate faster
+            target = self.tracked_target()
+            if target:
+                if target.y < self.y:  # Enemy is behind our lines
+                    acceleration_factor *= 1.8  # 80% faster acceleration
+        
+        return dx * acceleration_factor / 60, dy * acceleration_factor / 60
 
-    def move(self, width, height, friendly_drones=None):
-        """Enhanced movement with breach response behavior."""
+    def limit_speed(self, frames=1.0):
+        """Clamp the speed ahead of damping over `frames` reference frames.
+
+        The cap is raised by the damping still to come, so a saturated drone
+        leaves every step at max_speed_pixels * DAMPING_PER_FRAME whatever
+        the step length (at frames == 1 the cap is max_speed_pixels exactly).
+        """
+        cap = self.max_speed_pixels * damping_factor(1.0 - frames)
+        current_speed = math.sqrt(self.velocity_x**2 + self.velocity_y**2)
+        if current_speed > cap:
+            scale = cap / current_speed
+            self.velocity_x *= scale
+            self.velocity_y *= scale
+
+    def apply_physics(self, frames=1.0):
+        """Apply realistic physics over `frames` reference frames (1/60 s each)."""
+        accel = self.steering_acceleration()
+        if accel is not None:
+            self.velocity_x += accel[0] * frames
+            self.velocity_y += accel[1] * frames
+            self.limit_speed(frames)
+        
+        damping = damping_factor(frames)
+        self.velocity_x *= damping
+        self.velocity_y *= damping
+
+    def move(self, width, height, friendly_drones=None, dt=REFERENCE_DT, integrator=None):
+        """Enhanced movement with breach response behavior.
+
+        dt is the step length in seconds; integrator (a physics.Integrator)
+        substeps fast or closing drones, otherwise one semi-implicit step.
+        """
         if self.is_destroyed:
             return
             
@@ -123,7 +330,7 @@ class Drone:
             self.acceleration = 1.0
             
         # CRITICAL FIX: Accelerate faster if target is behind friendly lines
-        if (self.drone_type == "friendly" and self.assigned_target and 
+        if (self.drone_type == "friendly" and self.assigned_target is not None and 
             friendly_drones and len(friendly_drones) > 0):
             
             # Calculate average friendly Y position (front line)
@@ -131,8 +338,9 @@ class Drone:
             
             # Find our target enemy
             target_behind_lines = False
-            if hasattr(self, 'target_enemy') and self.target_enemy:
-                if self.target_enemy.y < avg_friendly_y:  # Enemy is behind our front line
+            target = self.tracked_target()
+            if target:
+                if target.y < avg_friendly_y:  # Enemy is behind our front line
                     target_behind_lines = True
             elif self.y < avg_friendly_y:  # We are behind front line
                 target_behind_lines = True
@@ -140,26 +348,54 @@ class Drone:
             if target_behind_lines:
                 self.acceleration = 2.0  # Double acceleration for threats behind lines
             
-        self.apply_physics()
-        
-        self.x += self.velocity_x
-        self.y += self.velocity_y
+        frames = dt / REFERENCE_DT
+        self.prev_x = self.x
+        self.prev_y = self.y
+        if self.lod == LOD_KINEMATIC:
+            self.coast(frames)
+        elif integrator is None:
+            self.apply_physics(frames)
+            self.x += self.velocity_x * frames
+            self.y += self.velocity_y * frames
+        else:
+            integrator.advance(self, frames)
         
         buffer = self.radius + 5
         self.x = max(buffer, min(width - buffer, self.x))
         self.y = max(buffer, min(height - buffer, self.y))
         
         if self.drone_type == "enemy":
-            if random.random() < 0.002:
-                self.target_x += random.uniform(-30, 30)
-                self.target_x = max(100, min(1100, self.target_x))
+            if self.rng.random() < 0.002 * frames:
+                self.target_x += self.rng.uniform(-30, 30)
+                self.target_x = max(100, min(width - 100, self.target_x))
+
+    def coast(self, frames):
+        """Cheap LOD motion: straight at the target at cruise speed."""
+        dx = self.target_x - self.x
+        dy = self.target_y - self.y
+        distance = math.sqrt(dx*dx + dy*dy)
+        if distance == 0:
+            self.velocity_x = self.velocity_y = 0.0
+            return
+        # Cruise speed is what the full model settles at: clamped, then damped
+        speed = self.max_speed_pixels * damping_factor(1.0)
+        if self.heading is not None:
+            ux, uy = self.heading
+        else:
+            ux, uy = dx / distance, dy / distance
+        self.velocity_x = ux * speed
+        self.velocity_y = uy * speed
+        step = min(speed * frames, distance)
+        self.x += ux * step
+        self.y += uy * step
 
     def activate_breach_response(self, duration=180):
         """Activate breach response mode for faster reaction."""
         self.breach_response_mode = True
         self.breach_response_timer = duration
         self.assigned_target = None
-        self.current_bids = {}
+        self.target_enemy = None
+        self.clear_bids()
 
     def update_breach_response(self):
         """Update breach response timer."""
@@ -170,7 +406,8 @@ class Drone:
 
     def validate_assigned_target(self, enemy_drones):
         """Enhanced target validation with breach detection."""
-        if not self.assigned_target:
+        if self.assigned_target is None:
+            self.target_enemy = None
             return False
             
         for enemy in enemy_drones:
@@ -179,6 +416,7 @@ class Drone:
                 return True
         
         self.assigned_target = None
+        self.target_enemy = None
         self.last_target_status = "destroyed"
         return False
 
@@ -193,12 +431,13 @@ class Drone:
         distance = self.distance_to(enemy)
         time_to_intercept = distance / (self.max_speed_pixels * 60)
         
-        determination_factor = getattr(enemy, 'determination', 0.9)
+        determination_factor = enemy.determination
         future_x = enemy.x + enemy.velocity_x * time_to_intercept * 60 * determination_factor
         future_y = enemy.y + enemy.velocity_y * time_to_intercept * 60 * determination_factor
         
-        future_x = max(50, min(1150, future_x))
-        future_y = max(50, min(750, future_y))
+        bounds = self.bounds
+        future_x = max(50, min(bounds.width - 50, future_x))
+        future_y = max(50, min(bounds.height - 50, future_y))
         
         return (future_x, future_y)
 
@@ -211,6 +450,8 @@ class Drone:
         
         if distance > self.sensor_range or enemy_drone.health <= 0:
             return float('inf')
+        if self.hidden and enemy_drone.id in self.hidden:
+            return float('inf')  # in range but behind an obstacle
         
         # CRITICAL FIX: Calculate how isolated this enemy is
         isolation_level = self.calculate_isolation_level(enemy_drone, friendly_drones)
@@ -221,21 +462,23 @@ class Drone:
         # CRITICAL FIX: Calculate threat priority (enemies behind lines get highest priority)
         threat_priority = self.calculate_threat_priority(enemy_drone, friendly_drones)
         
+        weights = self.bid_weights
+        
         # BASE COST: Distance (but much less important now)
-        cost = distance * 0.3  # Reduce distance weighting
+        cost = distance * weights.distance  # Reduce distance weighting
         
         # ISOLATION BONUS: Isolated enemies get massive priority
         # If enemy is isolated (few friendlies nearby), drastically reduce cost
-        isolation_bonus = 1.0 - (isolation_level * 0.8)  # Up to 80% cost reduction
+        isolation_bonus = 1.0 - (isolation_level * weights.isolation)  # Up to 80% cost reduction
         cost *= isolation_bonus
         
         # OVER-TARGETING PENALTY: If too many drones are on this target, increase cost
         if current_targeters >= 1:  # Even 1 other targeter reduces priority
-            over_targeting_penalty = 1.0 + (current_targeters * 0.8)  # 80% penalty per extra targeter
+            over_targeting_penalty = 1.0 + (current_targeters * weights.over_targeting)  # 80% penalty per extra targeter
             cost *= over_targeting_penalty
         
         # THREAT PRIORITY BONUS: Enemies behind lines or close to zone get priority
-        threat_bonus = 1.0 - (threat_priority * 0.6)  # Up to 60% cost reduction
+        threat_bonus = 1.0 - (threat_priority * weights.threat)  # Up to 60% cost reduction
         cost *= threat_bonus
         
         # Ammo and health considerations (secondary)
@@ -244,11 +487,11 @@ class Drone:
         
         # Breach response bonus
         if self.breach_response_mode:
-            cost *= 0.6  # 40% cost reduction during breach response
+            cost *= weights.breach_response  # 40% cost reduction during breach response
         
         # Commitment bonus - if we're already on this target
         if self.assigned_target == enemy_drone.id:
-            cost *= 0.2  # Strong preference to continue
+            cost *= weights.commitment  # Strong preference to continue
         
         return max(0.1, cost)  # Ensure cost is never zero
 
@@ -259,11 +502,12 @@ class Drone:
         """
         covering_friendlies = 0
         total_friendlies = 0
+        Drone.peer_scans += len(friendly_drones)
         
         for friendly in friendly_drones:
             if friendly.health > 0 and not friendly.is_destroyed:
                 total_friendlies += 1
-                if friendly.distance_to(enemy_drone) <= friendly.sensor_range:
+                if friendly.can_see(enemy_drone):
                     covering_friendlies += 1
         
         if total_friendlies == 0:
@@ -291,7 +535,7 @@ class Drone:
             behind_lines_bonus = 0.6  # 60% bonus for enemies behind lines
         
         # Factor 2: Proximity to protected zone
-        zone_proximity = 1.0 - (enemy_drone.y / 800)  # Closer to zone = higher threat
+        zone_proximity = 1.0 - (enemy_drone.y / self.bounds.height)  # Closer to zone = higher threat
         zone_proximity = max(0.1, zone_proximity) * 0.3  # 30% weight
         
         # Factor 3: Speed threat
@@ -302,18 +546,23 @@ class Drone:
 
     def calculate_average_friendly_y(self, friendly_drones):
         """Calculate average Y position of friendly drones (front line)."""
-        if not friendly_drones:
-            return self.y
-        
-        active_friendlies = [f for f in friendly_drones if f.health > 0 and not f.is_destroyed]
-        if not active_friendlies:
+        # Summed in place: this runs for every bid, so no filtered list
+        total = 0
+        count = 0
+        Drone.peer_scans += len(friendly_drones)
+        for f in friendly_drones:
+            if f.health > 0 and not f.is_destroyed:
+                total += f.y
+                count += 1
+        if not count:
             return self.y
         
-        return sum(f.y for f in active_friendlies) / len(active_friendlies)
+        return total / count
 
     def count_targeters(self, enemy_drone, friendly_drones):
         """Count how many friendly drones are targeting this enemy."""
         targeters = 0
+        Drone.peer_scans += len(friendly_drones)
         for friendly in friendly_drones:
             if (friendly.health > 0 and not friendly.is_destroyed and 
                 friendly.assigned_target == enemy_drone.id):
@@ -324,27 +573,28 @@ class Drone:
         visible_enemies = self.get_visible_enemies(enemy_drones)
         
         if not visible_enemies:
-            self.role = "Patrol"
+            self.role = Role.PATROL
             return
             
-        high_priority_threats = [e for e in visible_enemies if e.y > 500]
+        guard_y = self.bounds.height - 300  # within 300 px of the bottom edge
+        high_priority_threats = [e for e in visible_enemies if e.y > guard_y]
         
         if high_priority_threats:
-            self.role = "Guardian"
+            self.role = Role.GUARDIAN
         elif len(visible_enemies) >= 3:
-            self.role = "Swarm"
+            self.role = Role.SWARM
         else:
-            self.role = "Interceptor"
+            self.role = Role.INTERCEPTOR
         
         if self.ammo <= 3:
-            self.role = "Guardian"
+            self.role = Role.GUARDIAN
 
     def participate_in_auction(self, enemy_drones, friendly_drones):
         if self.drone_type != "friendly" or self.health <= 0 or self.is_destroyed:
             return
             
         self.update_breach_response()
-        self.current_bids = {}
+        self.clear_bids()
         
         self.determine_role(enemy_drones)
         visible_enemies = self.get_visible_enemies(enemy_drones)
@@ -365,19 +615,18 @@ class Drone:
             for enemy, isolation in enemy_isolation_pairs:
                 bid = self.calculate_bid(enemy, friendly_drones)
                 if bid < float('inf'):
-                    self.current_bids[enemy.id] = {
-                        'bid_value': bid,
-                        'enemy': enemy,
-                        'interception_point': self.calculate_interception_point(enemy),
-                        'isolation_level': isolation
-                    }
+                    self.add_bid(enemy, bid, self.calculate_interception_point(enemy), isolation)
 
     def resolve_auctions(self, friendly_drones):
-        if self.drone_type != "friendly" or not self.current_bids or self.health <= 0:
+        if self.drone_type != "friendly" or not self.bid_count or self.health <= 0:
             return
             
-        for enemy_id, bid_info in self.current_bids.items():
-            my_bid = bid_info['bid_value']
+        data = self.bid_data
+        Drone.peer_scans += self.bid_count * len(friendly_drones)
+        for index in range(self.bid_count):
+            row = index * BID_STRIDE
+            enemy_id = int(data[row + BID_ENEMY_ID])
+            my_bid = data[row + BID_VALUE]
             best_bid = my_bid
             best_drone = self
             
@@ -388,29 +637,39 @@ class Drone:
                 if self.distance_to(other) > self.communication_range:
                     continue
                     
-                other_bid_info = other.current_bids.get(enemy_id)
-                if other_bid_info and other_bid_info['bid_value'] < best_bid:
-                    best_bid = other_bid_info['bid_value']
+                other_bid = other.bid_for(enemy_id)
+                if other_bid is not None and other_bid < best_bid:
+                    best_bid = other_bid
                     best_drone = other
             
             if best_drone.id == self.id:
-                self.assigned_target = enemy_id
-                self.target_enemy = bid_info['enemy']  # Store for movement logic
-                self.bids_won += 1
-                self.interception_point = bid_info['interception_point']
-                
-                if self.interception_point:
-                    self.target_x, self.target_y = self.interception_point
+                self.win_bid(index)
+
+    def win_bid(self, index):
+        """Take the enemy of bid `index` after winning its auction."""
+        self.assigned_target = int(self.bid_data[index * BID_STRIDE + BID_ENEMY_ID])
+        self.target_enemy = self.bid_enemies[index]  # Store for movement logic
+        if self.target_enemy is not None and self.target_enemy.id != self.assigned_target:
+            self.target_enemy = None  # a bid held across a recycle, e.g. by a sleeping drone
+        self.bids_won += 1
+        self.interception_point = self.bid_interception_point(index)
+        
+        if self.interception_point:
+            self.target_x, self.target_y = self.interception_point
+
+    def execute_assignment(self, enemy_drones, friendly_drones, choose_target=None):
+        """REVOLUTIONARY assignment logic - prevents flanking at all costs.
 
-    def execute_assignment(self, enemy_drones, friendly_drones):
-        """REVOLUTIONARY assignment logic - prevents flanking at all costs."""
+        choose_target(drone) replaces the scalar target scoring
+        (select_target), e.g. BidKernel.select_target reading a score row.
+        """
         if self.drone_type != "friendly" or self.health <= 0 or self.is_destroyed:
             return "Destroyed"
         
         if not self.validate_assigned_target(enemy_drones):
             self.assigned_target = None
             
-        if self.assigned_target:
+        if self.assigned_target is not None:
             target_enemy = None
             for enemy in enemy_drones:
                 if enemy.id == self.assigned_target and enemy.health > 0:
@@ -430,6 +689,28 @@ class Drone:
                     return "Pursuing"
         
         # ULTIMATE FIX: Smart target selection that prevents flanking
+        if choose_target is None:
+            best_target = self.select_target(enemy_drones, friendly_drones)
+        else:
+            best_target = choose_target(self)
+        
+        if best_target:
+            self.interception_point = self.calculate_interception_point(best_target)
+            if self.interception_point:
+                self.target_x, self.target_y = self.interception_point
+            self.assigned_target = best_target.id
+            self.target_enemy = best_target
+            return "Swarming"
+        
+        # Return to defensive position
+        guard_y = self.bounds.height - 250
+        guard_x = self.patrol_point[0]
+        self.target_x = guard_x
+        self.target_y = guard_y
+        return "Patrolling"
+
+    def select_target(self, enemy_drones, friendly_drones):
+        """Best visible enemy to swarm: isolated, high threat, few targeters."""
         visible_enemies = self.get_visible_enemies(enemy_drones)
         
         if visible_enemies:
@@ -459,23 +740,18 @@ class Drone:
             if not best_target and enemy_scores:  # Fallback to highest score
                 best_target = enemy_scores[0][0]
             
-            if best_target:
-                self.interception_point = self.calculate_interception_point(best_target)
-                if self.interception_point:
-                    self.target_x, self.target_y = self.interception_point
-                self.assigned_target = best_target.id
-                self.target_enemy = best_target
-                return "Swarming"
+            return best_target
         
-        # Return to defensive position
-        guard_y = 550
-        guard_x = self.patrol_point[0]
-        self.target_x = guard_x
-        self.target_y = guard_y
-        return "Patrolling"
+        return None
 
     def get_visible_enemies(self, enemy_drones):
-        return [e for e in enemy_drones if self.distance_to(e) <= self.sensor_range and e.health > 0]
+        return [e for e in enemy_drones if self.can_see(e) and e.health > 0]
+
+    def can_see(self, other):
+        """Within sensor range and, with a World set, not occluded by an obstacle."""
+        if self.distance_to(other) > self.sensor_range:
+            return False
+        return not (self.hidden and other.id in self.hidden)
 
     def distance_to(self, other_drone):
         return math.sqrt((self.x - other_drone.x)**2 + (self.y - other_drone.y)**2)
@@ -485,93 +761,4 @@ class Drone:
         self.health = max(0, self.health - damage)
         if self.health <= 0:
             self.is_destroyed = True
-            self.color = (50, 50, 50)
         return self.is_destroyed
-
-    def draw(self, screen, aegis_active=True):
-        """Draw drone with AEGIS status awareness."""
-        if self.is_destroyed:
-            wreckage_size = 6
-            pygame.draw.circle(screen, (50, 50, 50), (int(self.x), int(self.y)), wreckage_size)
-            pygame.draw.circle(screen, (30, 30, 30), (int(self.x), int(self.y)), wreckage_size, 1)
-            return
-        
-        if self.health <= 0:
-            self.is_destroyed = True
-            return
-        
-        if aegis_active and self.drone_type == "friendly":
-            pygame.draw.circle(screen, (80, 80, 120, 50), 
-                             (int(self.x), int(self.y)), self.sensor_range, 1)
-        
-        points = []
-        icon_size = 10
-        
-        if self.drone_type == "friendly":
-            angle = math.atan2(self.velocity_y, self.velocity_x) if abs(self.velocity_x) + abs(self.velocity_y) > 0.1 else 0
-            points = [
-                (self.x + icon_size * math.cos(angle), 
-                 self.y + icon_size * math.sin(angle)),
-                (self.x + icon_size * math.cos(angle + 2.5), 
-                 self.y + icon_size * math.sin(angle + 2.5)),
-                (self.x + icon_size * math.cos(angle - 2.5), 
-                 self.y + icon_size * math.sin(angle - 2.5))
-            ]
-            
-            if self.breach_response_mode:
-                pulse = math.sin(self.breach_response_timer * 0.2) * 3 + 8
-                pygame.draw.circle(screen, (255, 255, 0), (int(self.x), int(self.y)), int(pulse), 2)
-        else:
-            points = [
-                (self.x, self.y - icon_size),
-                (self.x + icon_size, self.y),
-                (self.x, self.y + icon_size),
-                (self.x - icon_size, self.y)
-            ]
-        
-        if len(points) >= 3:
-            pygame.draw.polygon(screen, self.color, points)
-            pygame.draw.polygon(screen, self.highlight_color, points, 2)
-        
-        speed = math.sqrt(self.velocity_x**2 + self.velocity_y**2)
-        if speed > 0.5:
-            indicator_length = min(12, speed * 8)
-            end_x = self.x + (self.velocity_x / speed) * indicator_length
-            end_y = self.y + (self.velocity_y / speed) * indicator_length
-            pygame.draw.line(screen, (200, 200, 200), 
-                           (int(self.x), int(self.y)), 
-                           (int(end_x), int(end_y)), 1)
-        
-        indicator_color = (255, 255, 0) if self.assigned_target else (150, 150, 150)
-        pygame.draw.circle(screen, indicator_color, (int(self.x), int(self.y)), 2)
-        
-        bar_width = 20
-        bar_height = 2
-        bar_x = self.x - bar_width / 2
-        bar_y = self.y - icon_size - 8
-        health_ratio = self.health / 100.0
-        pygame.draw.rect(screen, (80, 80, 80), (bar_x, bar_y, bar_width, bar_height))
-        health_color = (0, 255, 0) if health_ratio > 0.7 else (255, 255, 0) if health_ratio > 0.3 else (255, 0, 0)
-        pygame.draw.rect(screen, health_color, (bar_x, bar_y, bar_width * health_ratio, bar_height))
-        
-        ammo_width = 16
-        ammo_height = 1
-        ammo_x = self.x - ammo_width / 2
-        ammo_y = self.y - icon_size - 5
-        ammo_ratio = self.ammo / 15.0
-        pygame.draw.rect(screen, (80, 80, 80), (ammo_x, ammo_y, ammo_width, ammo_height))
-        ammo_color = (0, 150, 255) if ammo_ratio > 0.3 else (255, 150, 0)
-        pygame.draw.rect(screen, ammo_color, (ammo_x, ammo_y, ammo_width * ammo_ratio, ammo_height))
-
-    def draw_role_text(self, screen, font):
-        if self.health <= 0 or self.is_destroyed:
-            return
-            
-        role_text = font.render(self.role, True, (220, 220, 220))
-        text_rect = role_text.get_rect(center=(int(self.x), int(self.y + 15)))
-        
-        bg_rect = text_rect.inflate(6, 2)
-        pygame.draw.rect(screen, (0, 0, 0, 200), bg_rect)
-        pygame.draw.rect(screen, self.color, bg_rect, 1)
-        
-        screen.blit(role_text, text_rect)
\ No newline at end of file
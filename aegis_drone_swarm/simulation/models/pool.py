@@ -0,0 +1,66 @@
+from simulation.models.drone import Drone
+
+class DronePool:
+    """
+    Free list of released drones, reinitialized on acquire.
+
+    Long saturation runs spawn and destroy drones constantly; recycling
+    them keeps the allocation rate and GC pressure flat.
+    """
+
+    def __init__(self, rng=None, enabled=True, bounds=None, bid_weights=None):
+        self.rng = rng
+        self.bounds = bounds
+        self.bid_weights = bid_weights
+        self.enabled = enabled
+        self.free = {"friendly": [], "enemy": []}
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, x, y, drone_type, drone_id):
+        free = self.free[drone_type]
+        if free:
+            drone = free.pop()
+            drone.reset(x, y, drone_type, drone_id, self.rng, self.bounds, self.bid_weights)
+            self.reused += 1
+        else:
+            drone = Drone(x, y, drone_type, drone_id, rng=self.rng, bounds=self.bounds,
+                          bid_weights=self.bid_weights)
+            self.created += 1
+        return drone
+
+    def release(self, drone):
+        if not self.enabled:
+            return
+        drone.target_enemy = None
+        drone.clear_bids()
+        self.free[drone.drone_type].append(drone)
+
+    def release_all(self, drones):
+        for drone in drones:
+            self.release(drone)
+        drones.clear()
+
+
+def compact_alive(drones, pool=None, removed=None):
+    """
+    Remove destroyed drones in place, keeping the survivors in order.
+
+    Returns how many were removed. Survivors are shifted down over the
+    gaps and the tail is cut, so no new list is allocated; removed drones
+    go back to the pool when one is given, and are appended to `removed`
+    when a list is given.
+    """
+    kept = 0
+    for drone in drones:
+        if drone.health > 0 and not drone.is_destroyed:
+            drones[kept] = drone
+            kept += 1
+            continue
+        if removed is not None:
+            removed.append(drone)
+        if pool is not None:
+            pool.release(drone)
+    count = len(drones) - kept
+    del drones[kept:]
+    return count
@@ -0,0 +1,251 @@
+"""
+Shared flow-field navigation around World obstacles.
+
+Steering straight at a target flies through buildings; pathfinding per
+drone is far too expensive at wave scale. Instead navigation runs on a
+grid over the world (cells `cell_size` px wide): a cell is blocked when
+its centre lies within `clearance` of an obstacle, and for each goal
+region one integration field - the cost of the cheapest 8-connected path
+from every free cell to the region - is computed once by Dijkstra and
+reduced to a flow field, a unit direction per cell towards its cheapest
+neighbour.
+
+Goal regions are targets quantized to `goal_size` px squares, so every
+enemy aiming at the same stretch of the protected zone strip (or one of
+the flanking targets at x=200/1000) shares a field, and friendlies
+returning to their patrol point or the guard line share theirs. Fields
+are cached (least recently used dropped past `max_fields`) and all of
+them are invalidated when the world's obstacles change.
+
+Each frame, a navigated drone samples its cell's direction - a dict
+lookup and a list index - and steers along it instead of at its target
+(Drone.heading). Inside its goal region, on a blocked or unreachable
+cell, or chasing an enemy, it steers at the target directly as before.
+"""
+
+import heapq
+import math
+import time
+from collections import OrderedDict
+
+from simulation.models.drone import LOD_ASLEEP, Role
+
+SQRT2 = math.sqrt(2)
+NEIGHBOURS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+              (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2))
+
+
+class FlowField:
+    """Directions towards one goal region for every reachable free cell."""
+
+    __slots__ = ("goal", "direction_x", "direction_y", "cost")
+
+    def __init__(self, goal, direction_x, direction_y, cost):
+        self.goal = goal  # (min_x, min_y, max_x, max_y) in px
+        self.direction_x = direction_x  # per cell; 0.0 where unreachable
+        self.direction_y = direction_y
+        self.cost = cost  # integration field, in cells; inf where unreachable
+
+
+class FlowFieldCache:
+    """Flow fields per goal region over a World's obstacles, built on demand."""
+
+    def __init__(self, world, cell_size=20, goal_size=100, clearance=12, max_fields=64):
+        self.world = world
+        self.cell_size = cell_size
+        self.goal_size = goal_size
+        self.clearance = clearance  # px kept between a path and an obstacle
+        self.max_fields = max_fields
+        self.columns = math.ceil(world.width / cell_size)
+        self.rows = math.ceil(world.height / cell_size)
+        self.fields = OrderedDict()  # goal key -> FlowField
+        self.blocked = None
+        self.version = None
+        self.builds = 0
+        self.hits = 0
+        self.invalidations = 0
+        self.build_s = 0.0
+        self.steered = 0
+
+    # Grid
+
+    def _refresh(self):
+        """Drop every field if the world's obstacles changed since they were built."""
+        if self.version == self.world.version:
+            return
+        if self.fields:
+            self.invalidations += 1
+        self.fields.clear()
+        self.blocked = self._blocked_cells()
+        self.version = self.world.version
+
+    def _blocked_cells(self):
+        size, columns, rows = self.cell_size, self.columns, self.rows
+        clearance = self.clearance
+        blocked = bytearray(columns * rows)
+        for obstacle in self.world.obstacles:
+            c0 = max(0, int((obstacle.min_x - clearance) // size))
+            c1 = min(columns - 1, int((obstacle.max_x + clearance) // size))
+            r0 = max(0, int((obstacle.min_y - clearance) // size))
+            r1 = min(rows - 1, int((obstacle.max_y + clearance) // size))
+            edges = None if obstacle.rect else obstacle.edges()
+            for r in range(r0, r1 + 1):
+                y = (r + 0.5) * size
+                for c in range(c0, c1 + 1):
+                    x = (c + 0.5) * size
+                    if edges is None:
+                        inside = (obstacle.min_x - clearance <= x <= obstacle.max_x + clearance
+                                  and obstacle.min_y - clearance <= y <= obstacle.max_y + clearance)
+                    else:
+                        inside = _in_polygon(x, y, obstacle.points) or _near_edges(x, y, edges, clearance)
+                    if inside:
+                        blocked[r * columns + c] = 1
+        return blocked
+
+    def cell_index(self, x, y):
+        column = min(self.columns - 1, max(0, int(x // self.cell_size)))
+        row = min(self.rows - 1, max(0, int(y // self.cell_size)))
+        return row * self.columns + column
+
+    # Fields
+
+    def goal_key(self, x, y):
+        size = self.goal_size
+        return int(x // size), int(y // size)
+
+    def field(self, key):
+        """The flow field for a goal key, building it on a cache miss."""
+        self._refresh()
+        field = self.fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(key)
+            return field
+        started = time.perf_counter()
+        field = self._build(key)
+        self.build_s += time.perf_counter() - started
+        self.builds += 1
+        self.fields[key] = field
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
+
+    def _build(self, key):
+        """Dijkstra from the goal region's free cells, then steepest-descent directions."""
+        size, columns, rows = self.cell_size, self.columns, self.rows
+        blocked = self.blocked
+        gx, gy = key
+        goal = (gx * self.goal_size, gy * self.goal_size,
+                (gx + 1) * self.goal_size, (gy + 1) * self.goal_size)
+        cost = [math.inf] * (columns * rows)
+        heap = []
+        for r in range(max(0, int(goal[1] // size)), min(rows, math.ceil(goal[3] / size))):
+            for c in range(max(0, int(goal[0] // size)), min(columns, math.ceil(goal[2] / size))):
+                index = r * columns + c
+                if not blocked[index]:
+                    cost[index] = 0.0
+                    heap.append((0.0, c, r))
+        heapq.heapify(heap)
+        while heap:
+            d, c, r = heapq.heappop(heap)
+            if d > cost[r * columns + c]:
+                continue
+            for dc, dr, step in NEIGHBOURS:
+                nc, nr = c + dc, r + dr
+                if not (0 <= nc < columns and 0 <= nr < rows):
+                    continue
+                index = nr * columns + nc
+                # No corner cutting: a diagonal needs both orthogonal cells free
+                if blocked[index] or (dc and dr and (blocked[r * columns + nc] or blocked[nr * columns + c])):
+                    continue
+                if d + step < cost[index]:
+                    cost[index] = d + step
+                    heapq.heappush(heap, (d + step, nc, nr))
+
+        direction_x = [0.0] * (columns * rows)
+        direction_y = [0.0] * (columns * rows)
+        for r in range(rows):
+            for c in range(columns):
+                here = cost[r * columns + c]
+                if here == 0.0 or here == math.inf:
+                    continue
+                best, best_dc, best_dr = here, 0, 0
+                for dc, dr, step in NEIGHBOURS:
+                    nc, nr = c + dc, r + dr
+                    if not (0 <= nc < columns and 0 <= nr < rows):
+                        continue
+                    if dc and dr and (blocked[r * columns + nc] or blocked[nr * columns + c]):
+                        continue
+                    if cost[nr * columns + nc] < best:
+                        best, best_dc, best_dr = cost[nr * columns + nc], dc, dr
+                norm = math.hypot(best_dc, best_dr) or 1.0
+                direction_x[r * columns + c] = best_dc / norm
+                direction_y[r * columns + c] = best_dr / norm
+        return FlowField(goal, direction_x, direction_y, cost)
+
+    # Steering
+
+    def heading(self, x, y, target_x, target_y):
+        """Unit direction to follow from (x, y) towards a target, or None to steer direct."""
+        field = self.field(self.goal_key(target_x, target_y))
+        min_x, min_y, max_x, max_y = field.goal
+        if min_x <= x < max_x and min_y <= y < max_y:
+            return None
+        index = self.cell_index(x, y)
+        dx = field.direction_x[index]
+        dy = field.direction_y[index]
+        if dx == 0.0 and dy == 0.0:
+            return None
+        return dx, dy
+
+    def update(self, sim):
+        """Set this frame's heading on every drone travelling to a fixed point."""
+        steered = 0
+        for drone in sim.all_drones():
+            if drone.health <= 0 or drone.lod == LOD_ASLEEP:
+                continue
+            # Friendlies chasing an enemy steer at it; the rest go to a point
+            if drone.drone_type == "friendly" and (drone.assigned_target is not None
+                                                   or drone.role not in (Role.PATROL, Role.GUARDIAN)):
+                drone.heading = None
+                continue
+            drone.heading = self.heading(drone.x, drone.y, drone.target_x, drone.target_y)
+            steered += drone.heading is not None
+        self.steered = steered
+
+    def clear(self, sim):
+        """Drop every drone's heading (navigation switched off)."""
+        for drone in sim.all_drones():
+            drone.heading = None
+
+    def metrics(self):
+        return {
+            "fields": len(self.fields),
+            "builds": self.builds,
+            "hits": self.hits,
+            "invalidations": self.invalidations,
+            "build_ms": self.build_s * 1000,
+            "steered": self.steered,
+        }
+
+
+def _in_polygon(x, y, points):
+    inside = False
+    j = len(points) - 1
+    for i in range(len(points)):
+        xi, yi = points[i]
+        xj, yj = points[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _near_edges(x, y, edges, distance):
+    for (ax, ay), (bx, by) in edges:
+        ex, ey = bx - ax, by - ay
+        length = ex * ex + ey * ey
+        t = 0.0 if length == 0 else max(0.0, min(1.0, ((x - ax) * ex + (y - ay) * ey) / length))
+        if math.hypot(ax + t * ex - x, ay + t * ey - y) <= distance:
+            return True
+    return False
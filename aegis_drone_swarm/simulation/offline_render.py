@@ -0,0 +1,174 @@
+"""
+Offline rendering of recorded state streams.
+
+Renders every record of a stream file (see simulation.streaming) with the
+regular render() path onto an offscreen surface, using SDL's dummy video
+driver, and writes a numbered PNG sequence or one raw RGB24 file.
+
+The stream is indexed once, then cut into jobs that each begin on a
+keyframe, so every worker process decodes its range independently. A job
+forgets what the worker's viewer kept from earlier jobs (HUD history, the
+bid count) and replays its keyframe-to-start records without drawing, so
+a frame's HUD depends on the stream and the job plan, not on which worker
+drew it. The world size comes from the stream; --width/--height size the
+output frames, and the camera fits the world into them. Raw output has a
+fixed frame size, so workers write straight to their frame's offset in
+one preallocated file.
+
+    python -m simulation.offline_render run.aegis frames/ --workers 8
+    python -m simulation.offline_render run.aegis run.rgb --format raw
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from simulation.streaming import LENGTH, RECORD_KEYFRAME, STREAM_MAGIC, StateDecoder
+
+
+def index_stream(path):
+    """(offset, is_keyframe) of every record in a stream file."""
+    index = []
+    with open(path, "rb") as stream:
+        if stream.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+            raise ValueError(f"{path} is not an AEGIS state stream")
+        offset = len(STREAM_MAGIC)
+        while True:
+            header = stream.read(LENGTH.size + 1)
+            if len(header) < LENGTH.size + 1:
+                return index
+            (length,) = LENGTH.unpack(header[:LENGTH.size])
+            index.append((offset, header[LENGTH.size] == RECORD_KEYFRAME))
+            offset += LENGTH.size + length
+            stream.seek(offset)
+
+
+def stream_world(path, index):
+    """(width, height) of the recorded world, read from the first keyframe."""
+    offset = next(offset for offset, key in index if key)
+    with open(path, "rb") as stream:
+        stream.seek(offset)
+        (length,) = LENGTH.unpack(stream.read(LENGTH.size))
+        g = StateDecoder().decode(stream.read(length)).globals
+    return int(g["world_width"]), int(g["world_height"])
+
+
+def plan_jobs(index, start, stop, frames_per_job):
+    """Split records [start, stop) into (seek_offset, first_record, start, stop) jobs.
+
+    Every job starts decoding at the keyframe at or before its first frame.
+    """
+    keyframes = [i for i, (_, key) in enumerate(index) if key]
+    if not keyframes or keyframes[0] > start:
+        start = keyframes[0] if keyframes else stop
+    jobs = []
+    for job_start in range(start, stop, frames_per_job):
+        job_stop = min(stop, job_start + frames_per_job)
+        key = max(k for k in keyframes if k <= job_start)
+        jobs.append((index[key][0], key, job_start, job_stop))
+    return jobs
+
+
+_viewer = None
+
+
+def _init_worker(world, view_size):
+    """Per-process pygame setup on the dummy driver."""
+    global _viewer
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import pygame
+    from simulation.simulation import AegisSimulation
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # render() flips the display
+    _viewer = AegisSimulation(*world, headless=True, verbose=False, view_size=view_size)
+    _viewer.screen = pygame.Surface(view_size)
+
+
+def _reset_viewer(keyframe):
+    """Drop the HUD history and bid count an earlier job left in the viewer."""
+    _viewer.metrics.reset()
+    _viewer.total_bids = int(keyframe.globals["total_bids"])
+
+
+def _render_range(path, output, fmt, seek, first_record, start, stop):
+    import pygame
+
+    decoder = StateDecoder()
+    cache = {}
+    width, height = _viewer.view_size
+    frame_bytes = width * height * 3
+    raw = open(output, "r+b") if fmt == "raw" else None
+    rendered = 0
+    try:
+        with open(path, "rb") as stream:
+            stream.seek(seek)
+            for record_index in range(first_record, stop):
+                (length,) = LENGTH.unpack(stream.read(LENGTH.size))
+                snapshot = decoder.decode(stream.read(length))
+                if snapshot is None:
+                    continue
+                if record_index == first_record:
+                    _reset_viewer(snapshot)
+                snapshot.apply_to(_viewer, cache)
+                if record_index < start:
+                    continue  # replayed for the HUD only
+                _viewer.render()
+                if raw is not None:
+                    os.pwrite(raw.fileno(), pygame.image.tobytes(_viewer.screen, "RGB"),
+                              record_index * frame_bytes)
+                else:
+                    pygame.image.save(_viewer.screen, os.path.join(output, f"frame_{record_index:06d}.png"))
+                rendered += 1
+    finally:
+        if raw is not None:
+            raw.close()
+    return rendered
+
+
+def render_stream(path, output, fmt="png", width=1200, height=800, workers=None,
+                  start=0, stop=None, frames_per_job=120):
+    """Render a stream file in parallel to width x height frames; returns the number written."""
+    if fmt not in ("png", "raw"):
+        raise ValueError(f"unknown output format: {fmt!r}")
+    index = index_stream(path)
+    stop = len(index) if stop is None else min(stop, len(index))
+    jobs = plan_jobs(index, start, stop, frames_per_job)
+    world = stream_world(path, index) if jobs else (width, height)
+
+    if fmt == "png":
+        os.makedirs(output, exist_ok=True)
+    else:
+        with open(output, "wb") as raw:
+            raw.truncate(len(index) * width * height * 3)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(world, (width, height))) as pool:
+        futures = [pool.submit(_render_range, path, output, fmt, *job) for job in jobs]
+        return sum(future.result() for future in futures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a recorded AEGIS stream to frames")
+    parser.add_argument("stream")
+    parser.add_argument("output", help="directory for PNG frames, or file for raw RGB24")
+    parser.add_argument("--format", choices=("png", "raw"), default="png")
+    parser.add_argument("--width", type=int, default=1200, help="frame width (the world size is in the stream)")
+    parser.add_argument("--height", type=int, default=800, help="frame height")
+    parser.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--stop", type=int)
+    parser.add_argument("--frames-per-job", type=int, default=120)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    frames = render_stream(args.stream, args.output, args.format, args.width, args.height,
+                           args.workers, args.start, args.stop, args.frames_per_job)
+    elapsed = time.perf_counter() - started
+    print(f"Rendered {frames} frames in {elapsed:.1f}s ({frames / elapsed:.0f} frames/s, "
+          f"{frames / elapsed / 60:.1f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,543 @@
+"""
+Pygame rendering and input for AegisSimulation.
+
+The model and simulation core never import pygame; this module is loaded
+the first time a simulation opens a window, renders or handles events, so
+headless runs and worker processes skip pygame's import and SDL startup.
+Everything here reads simulation state and draws it; the only state it
+keeps is a cache of fonts and of the translucent fills behind panels.
+
+The world is drawn through sim.camera (simulation.camera), made on the
+first render to fit the world in the window: arrow keys and right or
+middle drag pan, the mouse wheel and +/- zoom, Home fits the whole
+world. Drones, sensor rings and bid lines are culled against the
+viewport with the camera's grid, and below DETAIL_ZOOM drones are drawn
+as dots. The HUD stays in window coordinates.
+"""
+
+import math
+import sys
+
+import pygame
+
+from simulation.camera import Camera
+from simulation.models.drone import Drone
+
+# HUD color scheme
+DARK_BLUE = (5, 15, 30)
+PANEL_BG = (25, 35, 60, 220)
+TEXT_COLOR = (220, 230, 255)
+WARNING_COLOR = (255, 80, 80)
+SUCCESS_COLOR = (80, 255, 120)
+HUD_COLOR = (0, 180, 255)
+ZONE_COLOR = (0, 80, 0)
+OBSTACLE_COLOR = (60, 60, 72)
+SENSOR_COLOR = (80, 80, 120, 50)
+
+DETAIL_ZOOM = 0.5  # below this drones are dots: no bars, rings or labels
+ICON_MARGIN = 40  # screen px around a drone its icon, bars and label reach
+PAN_STEP = 12  # screen px per frame while an arrow key is held
+ZOOM_STEP = 1.25
+
+_fonts = {}
+
+
+def get_font(size):
+    """Default font at size, loaded once instead of every frame."""
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+
+_fills = {}
+
+
+def get_fill(width, height, color):
+    """Translucent surface of one color, built once per size and color."""
+    key = (width, height, color)
+    surface = _fills.get(key)
+    if surface is None:
+        surface = _fills[key] = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill(color)
+    return surface
+
+
+def get_camera(sim):
+    """sim.camera, made the first time it is needed to fit the world in the screen."""
+    camera = sim.camera
+    if camera is None:
+        view_width, view_height = sim.screen.get_size()
+        camera = sim.camera = Camera(view_width, view_height, sim.width, sim.height)
+    return camera
+
+
+def open_display(width, height):
+    """Initialize pygame and open the simulation window; returns (screen, clock)."""
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("AEGIS Drone Swarm Protocol - Enhanced Tactics")
+    return screen, pygame.time.Clock()
+
+
+def draw_drone(screen, drone, camera, detail=True):
+    """Draw drone with AEGIS status awareness; a dot when not in detail."""
+    x, y = camera.to_screen(drone.x, drone.y)
+    if drone.is_destroyed:
+        wreckage_size = 6 if detail else 1
+        pygame.draw.circle(screen, (50, 50, 50), (int(x), int(y)), wreckage_size)
+        if detail:
+            pygame.draw.circle(screen, (30, 30, 30), (int(x), int(y)), wreckage_size, 1)
+        return
+
+    if drone.health <= 0:
+        drone.is_destroyed = True
+        return
+
+    if not detail:
+        pygame.draw.circle(screen, drone.color, (int(x), int(y)), 2)
+        return
+
+    points = []
+    icon_size = 10
+
+    if drone.drone_type == "friendly":
+        angle = math.atan2(drone.velocity_y, drone.velocity_x) if abs(drone.velocity_x) + abs(drone.velocity_y) > 0.1 else 0
+        points = [
+            (x + icon_size * math.cos(angle), 
+             y + icon_size * math.sin(angle)),
+            (x + icon_size * math.cos(angle + 2.5), 
+             y + icon_size * math.sin(angle + 2.5)),
+            (x + icon_size * math.cos(angle - 2.5), 
+             y + icon_size * math.sin(angle - 2.5))
+        ]
+
+        if drone.breach_response_mode:
+            pulse = math.sin(drone.breach_response_timer * 0.2) * 3 + 8
+            pygame.draw.circle(screen, (255, 255, 0), (int(x), int(y)), int(pulse), 2)
+    else:
+        points = [
+            (x, y - icon_size),
+            (x + icon_size, y),
+            (x, y + icon_size),
+            (x - icon_size, y)
+        ]
+
+    if len(points) >= 3:
+        pygame.draw.polygon(screen, drone.color, points)
+        pygame.draw.polygon(screen, drone.highlight_color, points, 2)
+
+    speed = math.sqrt(drone.velocity_x**2 + drone.velocity_y**2)
+    if speed > 0.5:
+        indicator_length = min(12, speed * 8)
+        end_x = x + (drone.velocity_x / speed) * indicator_length
+        end_y = y + (drone.velocity_y / speed) * indicator_length
+        pygame.draw.line(screen, (200, 200, 200), 
+                       (int(x), int(y)), 
+                       (int(end_x), int(end_y)), 1)
+
+    indicator_color = (255, 255, 0) if drone.assigned_target is not None else (150, 150, 150)
+    pygame.draw.circle(screen, indicator_color, (int(x), int(y)), 2)
+
+    bar_width = 20
+    bar_height = 2
+    bar_x = x - bar_width / 2
+    bar_y = y - icon_size - 8
+    health_ratio = drone.health / 100.0
+    pygame.draw.rect(screen, (80, 80, 80), (bar_x, bar_y, bar_width, bar_height))
+    health_color = (0, 255, 0) if health_ratio > 0.7 else (255, 255, 0) if health_ratio > 0.3 else (255, 0, 0)
+    pygame.draw.rect(screen, health_color, (bar_x, bar_y, bar_width * health_ratio, bar_height))
+
+    ammo_width = 16
+    ammo_height = 1
+    ammo_x = x - ammo_width / 2
+    ammo_y = y - icon_size - 5
+    ammo_ratio = drone.ammo / 15.0
+    pygame.draw.rect(screen, (80, 80, 80), (ammo_x, ammo_y, ammo_width, ammo_height))
+    ammo_color = (0, 150, 255) if ammo_ratio > 0.3 else (255, 150, 0)
+    pygame.draw.rect(screen, ammo_color, (ammo_x, ammo_y, ammo_width * ammo_ratio, ammo_height))
+
+
+def draw_role_text(screen, drone, font, camera):
+    if drone.health <= 0 or drone.is_destroyed:
+        return
+
+    x, y = camera.to_screen(drone.x, drone.y)
+    role_text = font.render(drone.role.label, True, (220, 220, 220))
+    text_rect = role_text.get_rect(center=(int(x), int(y + 15)))
+
+    bg_rect = text_rect.inflate(6, 2)
+    pygame.draw.rect(screen, (0, 0, 0, 200), bg_rect)
+    pygame.draw.rect(screen, drone.color, bg_rect, 1)
+
+    screen.blit(role_text, text_rect)
+
+
+def render(sim):
+    """Enhanced rendering with larger display area."""
+    sim.screen.fill(DARK_BLUE)
+    camera = get_camera(sim)
+    detail = camera.zoom >= DETAIL_ZOOM
+
+    # Grid lines removed for cleaner look
+    draw_protected_zone(sim, camera)
+    if sim.world is not None:
+        draw_obstacles(sim, camera)
+
+    if sim.aegis_active and detail:
+        draw_sensor_rings(sim, camera)
+
+    role_font = get_font(16)
+    drones = camera.visible(sim, ICON_MARGIN / camera.zoom)
+    for drone in drones:
+        draw_drone(sim.screen, drone, camera, detail)
+        if detail and sim.show_roles and drone.drone_type == "friendly" and drone.health > 0:
+            draw_role_text(sim.screen, drone, role_font, camera)
+    camera.drawn = len(drones)
+
+    if sim.show_debug and sim.aegis_active:  # Only show debug when AEGIS is active
+        draw_debug_info(sim, camera)
+
+    draw_clean_hud(sim)
+
+    # Last defense line visualization
+    pygame.draw.line(sim.screen, (255, 50, 50), 
+                    camera.to_screen(0, sim.last_line_defense_y), 
+                    camera.to_screen(sim.width, sim.last_line_defense_y), 2)
+
+    if sim.frame_count - sim.last_breach_frame < 180:
+        draw_breach_alert(sim)
+
+    if sim.mission_complete:
+        draw_mission_status(sim)
+
+    pygame.display.flip()
+
+
+def draw_protected_zone(sim, camera):
+    """Draw protected zone with military styling."""
+    x, y, width, height = sim.protected_zone
+    if not camera.in_view(x, y, x + width, y + height):
+        return
+    left, top = camera.to_screen(x, y)
+    zone = (left, top, width * camera.zoom, height * camera.zoom)
+    pygame.draw.rect(sim.screen, ZONE_COLOR, zone)
+    pygame.draw.rect(sim.screen, (0, 200, 0), zone, 3)
+
+    # Zone pattern, over the visible stretch and only while the lines stay apart
+    if 60 * camera.zoom < 4:
+        return
+    view_left, _, view_right, _ = camera.viewport()
+    _, top = camera.to_screen(0, sim.height - 150)
+    _, bottom = camera.to_screen(0, sim.height)
+    for i in range(max(0, int(view_left // 60) * 60), min(sim.width, int(view_right) + 1), 60):
+        sx, _ = camera.to_screen(i, 0)
+        pygame.draw.line(sim.screen, (0, 120, 0), 
+                       (sx, top), (sx, bottom), 1)
+
+
+def draw_obstacles(sim, camera):
+    """Buildings and terrain blocking line of sight."""
+    for obstacle in sim.world.obstacles:
+        if not camera.in_view(obstacle.min_x, obstacle.min_y, obstacle.max_x, obstacle.max_y):
+            continue
+        points = [camera.to_screen(x, y) for x, y in obstacle.points]
+        pygame.draw.polygon(sim.screen, OBSTACLE_COLOR, points)
+        pygame.draw.polygon(sim.screen, (110, 110, 125), points, 1)
+
+
+def draw_sensor_rings(sim, camera):
+    """Sensor range of every live friendly whose ring can reach the screen."""
+    radius = int(Drone.sensor_range * camera.zoom)
+    for drone in camera.visible(sim, Drone.sensor_range):
+        if drone.drone_type == "friendly" and drone.health > 0 and not drone.is_destroyed:
+            x, y = camera.to_screen(drone.x, drone.y)
+            pygame.draw.circle(sim.screen, SENSOR_COLOR, (int(x), int(y)), radius, 1)
+
+
+def draw_clean_hud(sim):
+    """HUD adjusted for larger screen."""
+    view_width, view_height = sim.screen.get_size()
+    systems_height = 200 if sim.protocol_scheduler is None else 222
+    draw_panel(sim, 20, 20, 350, 240, "TACTICAL OVERVIEW")
+    draw_panel(sim, view_width - 310, 20, 290, systems_height, "SYSTEMS STATUS")
+    draw_panel(sim, view_width - 310, 35 + systems_height, 290, 150, "TRENDS")
+    draw_panel(sim, 20, view_height - 180, 400, 160, "COMMAND CONTROLS")
+
+
+def draw_panel(sim, x, y, width, height, title):
+    sim.screen.blit(get_fill(width, height, PANEL_BG), (x, y))
+
+    pygame.draw.rect(sim.screen, HUD_COLOR, (x, y, width, height), 2)
+
+    sim.screen.blit(get_fill(width, 25, (0, 0, 0, 150)), (x, y))
+
+    title_font = get_font(22)
+    title_text = title_font.render(title, True, HUD_COLOR)
+    title_rect = title_text.get_rect(center=(x + width//2, y + 12))
+    sim.screen.blit(title_text, title_rect)
+
+    if title == "TACTICAL OVERVIEW":
+        draw_tactical_overview(sim, x + 15, y + 35)
+    elif title == "SYSTEMS STATUS":
+        draw_systems_status(sim, x + 15, y + 35)
+    elif title == "COMMAND CONTROLS":
+        draw_controls_status(sim, x + 15, y + 35)
+    elif title == "TRENDS":
+        draw_trends(sim, x + 15, y + 35, width - 30)
+
+
+def draw_tactical_overview(sim, x, y):
+    font = get_font(20)
+
+    active_friendlies = sim.metrics.friendlies_alive
+    active_enemies = sim.metrics.enemies_alive
+    success_rate = sim.get_success_rate()
+
+    status_lines = [
+        f"FRIENDLY FORCES: {active_friendlies}",
+        f"HOSTILE CONTACTS: {active_enemies}",
+        f"SPAWN QUEUE: {len(sim.spawn_queue)}",
+        f"TARGETS NEUTRALIZED: {sim.enemies_neutralized}",
+        f"SECURITY BREACHES: {sim.enemies_breached}",
+        f"MISSION SUCCESS: {success_rate:.1f}%",
+        f"FRIENDLY LOSSES: {sim.friendly_losses}",
+        f"LAST DEFENSE: ACTIVE",
+        f"AEGIS PROTOCOL: {'ACTIVE' if sim.aegis_active else 'STANDBY'}"
+    ]
+
+    for i, line in enumerate(status_lines):
+        color = TEXT_COLOR
+        if "BREACHES" in line and sim.enemies_breached > 0:
+            color = WARNING_COLOR
+        elif "SUCCESS" in line:
+            color = SUCCESS_COLOR if success_rate > 90 else TEXT_COLOR
+        elif "LOSSES" in line and sim.friendly_losses > 0:
+            color = WARNING_COLOR
+        elif "LAST DEFENSE" in line:
+            color = WARNING_COLOR
+
+        text = font.render(line, True, color)
+        sim.screen.blit(text, (x, y + i * 22))
+
+
+def draw_systems_status(sim, x, y):
+    font = get_font(20)
+
+    systems_lines = [
+        f"AEGIS PROTOCOL: {'ONLINE' if sim.aegis_active else 'OFFLINE'}",
+        f"BIDDING SYSTEM: {sim.total_bids}",
+        f"SENSOR NETWORK: {'ACTIVE' if sim.aegis_active else 'OFFLINE'}",
+        f"TACTICAL STATUS: {'NOMINAL' if not sim.breach_response_active else 'BREACH RESPONSE'}",
+        f"ISOLATED THREATS: {sim.metrics.isolated_threats}",
+        f"STAGGERED SPAWN: ACTIVE",
+        f"MISSION TIME: {sim.frame_count//60}s"
+    ]
+    scheduler = sim.protocol_scheduler
+    if scheduler is not None:
+        systems_lines.append(f"PROTOCOL: {scheduler.last_ms:.1f}/{scheduler.budget_ms:.1f}ms "
+                             f"OVERRUNS {scheduler.overruns}")
+
+    for i, line in enumerate(systems_lines):
+        color = SUCCESS_COLOR if "ONLINE" in line or "ACTIVE" in line else WARNING_COLOR if "OFFLINE" in line else TEXT_COLOR
+        text = font.render(line, True, color)
+        sim.screen.blit(text, (x, y + i * 22))
+
+
+def draw_trends(sim, x, y, width):
+    """Sparklines of the most recent metric samples."""
+    metrics = sim.metrics
+    trends = [
+        ("HOSTILES {:.0f}", metrics.series["enemies_alive"], WARNING_COLOR),
+        ("FRIENDLIES {:.0f}", metrics.series["friendlies_alive"], HUD_COLOR),
+        ("BIDS/TICK {:.0f}", metrics.series["bids"], TEXT_COLOR),
+        ("PROTOCOL {:.1f}ms", metrics.stage_ms["protocol"], SUCCESS_COLOR),
+    ]
+    for i, (label, ring, color) in enumerate(trends):
+        draw_sparkline(sim, x, y + i * 26, width, 18, label, ring.values(last=120), color)
+
+
+def draw_sparkline(sim, x, y, width, height, label, values, color):
+    font = get_font(16)
+    latest = values[-1] if len(values) else 0
+    text = font.render(label.format(latest), True, TEXT_COLOR)
+    sim.screen.blit(text, (x, y + 4))
+
+    left = x + 120
+    span = width - 120
+    pygame.draw.line(sim.screen, (60, 70, 100), (left, y + height), (left + span, y + height), 1)
+    if len(values) < 2:
+        return
+    peak = max(float(values.max()), 1.0)
+    step = span / (len(values) - 1)
+    points = [(left + i * step, y + height - value / peak * height) for i, value in enumerate(values)]
+    pygame.draw.lines(sim.screen, color, False, points, 1)
+
+
+def draw_controls_status(sim, x, y):
+    font = get_font(18)
+
+    controls = [
+        "T - TOGGLE ROLE DISPLAY",
+        "A - TOGGLE AEGIS PROTOCOL", 
+        "D - TOGGLE SENSOR VIEW",
+        "SPACE - DEPLOY HOSTILES",
+        "R - RESET MISSION",
+        "ESC - EXIT SIMULATION",
+        "ARROWS/WHEEL/HOME - PAN/ZOOM/FIT",
+        "AEGIS OFF: Drones disorganized",
+        "AEGIS ON: Auction system active"
+    ]
+
+    for i, line in enumerate(controls):
+        color = WARNING_COLOR if "AEGIS OFF" in line else SUCCESS_COLOR if "AEGIS ON" in line else TEXT_COLOR
+        text = font.render(line, True, color)
+        sim.screen.blit(text, (x, y + i * 20))
+
+
+def draw_breach_alert(sim):
+    alert_font = get_font(36)
+    status_font = get_font(24)
+
+    if sim.breach_response_active:
+        alert_text = alert_font.render("BREACH RESPONSE ACTIVE", True, WARNING_COLOR)
+        status_text = status_font.render("Last defense protocol engaged", True, TEXT_COLOR)
+    else:
+        alert_text = alert_font.render("SECURITY BREACH DETECTED", True, WARNING_COLOR)
+        status_text = status_font.render("Tactical response initiated", True, TEXT_COLOR)
+
+    view_width = sim.screen.get_width()
+    alert_rect = alert_text.get_rect(center=(view_width//2, 30))
+    status_rect = status_text.get_rect(center=(view_width//2, 60))
+
+    if (sim.frame_count // 10) % 2 == 0 or sim.breach_response_active:
+        sim.screen.blit(alert_text, alert_rect)
+        sim.screen.blit(status_text, status_rect)
+
+
+def draw_mission_status(sim):
+    mission_font = get_font(48)
+    subtitle_font = get_font(24)
+
+    active_enemies = sim.metrics.enemies_alive
+
+    if active_enemies == 0 and len(sim.spawn_queue) == 0:
+        text = mission_font.render("MISSION ACCOMPLISHED", True, SUCCESS_COLOR)
+        subtitle = subtitle_font.render("All hostile targets neutralized", True, TEXT_COLOR)
+    else:
+        text = mission_font.render("MISSION FAILED", True, WARNING_COLOR)
+        subtitle = subtitle_font.render("Friendly forces eliminated", True, TEXT_COLOR)
+
+    view_width, view_height = sim.screen.get_size()
+    text_rect = text.get_rect(center=(view_width//2, view_height//2 - 30))
+    subtitle_rect = subtitle.get_rect(center=(view_width//2, view_height//2 + 20))
+
+    bg_rect = text_rect.union(subtitle_rect).inflate(40, 40)
+    sim.screen.blit(get_fill(bg_rect.width, bg_rect.height, (0, 0, 0, 200)), bg_rect)
+    pygame.draw.rect(sim.screen, HUD_COLOR, bg_rect, 3)
+
+    sim.screen.blit(text, text_rect)
+    sim.screen.blit(subtitle, subtitle_rect)
+
+
+def draw_debug_info(sim, camera):
+    """Draw debug information only when AEGIS is active."""
+    debug_font = get_font(16)
+
+    # Bids go to enemies in sensor range, so a bid line that crosses the
+    # screen starts at a friendly within about that range of it
+    radius = int(Drone.sensor_range * camera.zoom)
+    for friendly in camera.visible(sim, Drone.sensor_range * 1.25):
+        if friendly.drone_type != "friendly" or friendly.health <= 0:
+            continue
+        fx, fy = camera.to_screen(friendly.x, friendly.y)
+
+        # Sensor range (visible only when AEGIS is active)
+        pygame.draw.circle(sim.screen, SENSOR_COLOR, 
+                         (int(fx), int(fy)), radius, 1)
+
+        # Bid connections
+        for enemy, bid_value in friendly.iter_bids():
+            if enemy.health > 0 and camera.in_view(min(friendly.x, enemy.x), min(friendly.y, enemy.y),
+                                                   max(friendly.x, enemy.x), max(friendly.y, enemy.y)):
+                if bid_value < 50:
+                    color = (0, 200, 0)  # Green
+                elif bid_value < 100:
+                    color = (200, 200, 0)  # Yellow
+                else:
+                    color = (200, 100, 0)  # Orange
+
+                pygame.draw.line(sim.screen, color,
+                               (fx, fy), camera.to_screen(enemy.x, enemy.y), 1)
+
+
+def handle_events(sim):
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            sim.running = False
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                sim.running = False
+            elif event.key == pygame.K_r:
+                sim.reset_simulation()
+            elif event.key == pygame.K_SPACE:
+                sim.add_enemy_drones(3)  # Staggered spawn
+            elif event.key == pygame.K_a:
+                sim.aegis_active = not sim.aegis_active
+                status = "ACTIVE" if sim.aegis_active else "STANDBY"
+                sim.on_aegis_toggle()
+                sim.log(f"Aegis Protocol: {status}")
+            elif event.key == pygame.K_d:
+                sim.show_debug = not sim.show_debug
+                sim.log(f"Debug View: {'ON' if sim.show_debug else 'OFF'}")
+            elif event.key == pygame.K_t:
+                sim.show_roles = not sim.show_roles
+                sim.log(f"Role Display: {'ON' if sim.show_roles else 'OFF'}")
+            else:
+                handle_camera_event(sim, event)
+        else:
+            handle_camera_event(sim, event)
+    pan_with_keys(sim)
+
+
+def handle_camera_event(sim, event):
+    """Wheel or +/- zooms, right or middle drag pans, Home fits the world."""
+    camera = get_camera(sim)
+    if event.type == pygame.MOUSEWHEEL:
+        camera.zoom_at(ZOOM_STEP ** event.y, *pygame.mouse.get_pos())
+    elif event.type == pygame.MOUSEMOTION and (event.buttons[1] or event.buttons[2]):
+        camera.pan(-event.rel[0], -event.rel[1])
+    elif event.type == pygame.KEYDOWN:
+        center = camera.view_width / 2, camera.view_height / 2
+        if event.key == pygame.K_HOME:
+            camera.fit()
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            camera.zoom_at(ZOOM_STEP, *center)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            camera.zoom_at(1 / ZOOM_STEP, *center)
+
+
+def pan_with_keys(sim):
+    """Pan while arrow keys are held."""
+    keys = pygame.key.get_pressed()
+    dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * PAN_STEP
+    dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * PAN_STEP
+    if dx or dy:
+        get_camera(sim).pan(dx, dy)
+
+
+def run_interactive(sim, threaded=False):
+    """Window loop for run(); threaded steps the simulation on a worker thread."""
+    if threaded:
+        from simulation.threaded import run_threaded
+        run_threaded(sim)
+        pygame.quit()
+        sys.exit()
+    while sim.running:
+        handle_events(sim)
+        sim.update()
+        render(sim)
+        sim.clock.tick(60)
+    
+    pygame.quit()
+    sys.exit()
@@ -0,0 +1,283 @@
+"""
+Persistent content-addressed cache of scenario results.
+
+Sweeps and CI re-run the same (scenario, seed, bid weights, code)
+combinations many times. A scenario is a plain config dict (see
+DEFAULT_SCENARIO); its key is the SHA-256 of the config's canonical JSON
+together with a fingerprint of every .py file under simulation/, so any
+code change misses instead of returning a stale result.
+
+1. Lookup: <directory>/<key[:2]>/<key>.json holds the episode metrics
+   (and the final snapshot's globals); <key>.npz the optional final
+   Snapshot arrays. A hit touches the .json mtime, which is the LRU
+   clock.
+2. Miss: the episode is simulated headless and stored. Files are written
+   to a temporary name in the same directory and os.replace()d in, the
+   .npz before the .json, so concurrent workers (threads or processes)
+   only ever see complete entries; two workers racing on one key write
+   the same result and the last rename wins.
+3. Eviction: past max_bytes the least recently used entries are deleted
+   (.json first, so a reader sees a miss rather than half an entry);
+   files another worker already removed are ignored.
+
+Lookups cost one stat and one small JSON read; eviction scans the
+directory, and runs only after a store.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from simulation.models.drone import DEFAULT_BID_WEIGHTS, BidWeights
+from simulation.physics import REFERENCE_DT
+
+SOURCE_ROOT = Path(__file__).resolve().parent
+
+DEFAULT_SCENARIO = {
+    "seed": 0,
+    "width": 1200,
+    "height": 800,
+    "initial_enemies": 8,
+    "min_friendly_ratio": 1.1,
+    "spawn_interval": 30,
+    "bid_weights": DEFAULT_BID_WEIGHTS._asdict(),
+    "engagement_mode": "swept",
+    "dt": REFERENCE_DT,
+    "max_frames": 4000,
+}
+
+
+def scenario_config(**overrides):
+    """DEFAULT_SCENARIO with overrides applied; bid_weights may be partial."""
+    config = copy.deepcopy(DEFAULT_SCENARIO)
+    for name, value in overrides.items():
+        if name not in config:
+            raise ValueError(f"unknown scenario setting: {name!r}")
+        if name == "bid_weights":
+            if isinstance(value, BidWeights):
+                value = value._asdict()
+            unknown = set(value) - set(BidWeights._fields)
+            if unknown:
+                raise ValueError(f"unknown bid weights: {sorted(unknown)}")
+            config[name].update(value)
+        else:
+            config[name] = value
+    return config
+
+
+@functools.lru_cache(maxsize=None)
+def source_fingerprint(root=SOURCE_ROOT):
+    """SHA-256 over the path and contents of every .py file under root."""
+    root = Path(root)
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*.py")):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def scenario_key(config, fingerprint=None):
+    """Content address of a full scenario config under the current code."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(canonical.encode())
+    digest.update(b"\0")
+    digest.update((fingerprint or source_fingerprint()).encode())
+    return digest.hexdigest()
+
+
+def run_scenario(config, snapshot=False):
+    """Simulate one episode; returns (metrics dict, final Snapshot or None)."""
+    from simulation.simulation import AegisSimulation
+
+    # Weights go to this simulation's drones only, so episodes on other
+    # threads keep their own
+    sim = AegisSimulation(config["width"], config["height"], headless=True, verbose=False,
+                          seed=config["seed"], dt=config["dt"],
+                          bid_weights=BidWeights(**config["bid_weights"]))
+    sim.initial_enemies = config["initial_enemies"]
+    sim.min_friendly_ratio = config["min_friendly_ratio"]
+    sim.spawn_interval = config["spawn_interval"]
+    sim.engagement_mode = config["engagement_mode"]
+    sim.reset_simulation()
+    while not sim.mission_complete and sim.frame_count < config["max_frames"]:
+        sim.update()
+
+    ttn = sim.metrics.time_to_neutralize.values()
+    metrics = {
+        "frames": sim.frame_count,
+        "mission_complete": sim.mission_complete,
+        "enemies_neutralized": sim.enemies_neutralized,
+        "enemies_breached": sim.enemies_breached,
+        "friendly_losses": sim.friendly_losses,
+        "total_bids": sim.total_bids,
+        "success_rate": sim.get_success_rate(),
+        "mean_time_to_neutralize": float(ttn.mean()) if len(ttn) else None,
+    }
+    if not snapshot:
+        return metrics, None
+    from simulation.snapshot import HandleTable, capture_snapshot
+    return metrics, capture_snapshot(sim, HandleTable())
+
+
+class ResultsCache:
+    """On-disk episode results keyed by scenario_key(), LRU-evicted by size."""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()  # guards the counters only
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _paths(self, key):
+        folder = self.directory / key[:2]
+        return folder / f"{key}.json", folder / f"{key}.npz"
+
+    def _count(self, name, amount=1):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    # Entries
+
+    def get(self, key, snapshot=False):
+        """(metrics, Snapshot or None) for a stored key, or None on a miss."""
+        meta_path, array_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                entry = json.load(f)
+            loaded = None
+            if snapshot:
+                if entry.get("snapshot") is None:
+                    raise FileNotFoundError(array_path)  # stored without one
+                loaded = self._load_snapshot(array_path, entry["snapshot"])
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError):
+            # Absent, evicted mid-read, or written by an incompatible version
+            self._count("misses")
+            return None
+        self._count("hits")
+        return entry["metrics"], loaded
+
+    def put(self, key, metrics, snapshot=None):
+        meta_path, array_path = self._paths(key)
+        meta_path.parent.mkdir(exist_ok=True)
+        entry = {"metrics": metrics, "snapshot": None}
+        if snapshot is not None:
+            import numpy as np
+            self._write(array_path, lambda f: np.savez(f, **snapshot.arrays))
+            entry["snapshot"] = {name: int(value) for name, value in snapshot.globals.items()}
+        payload = json.dumps(entry, sort_keys=True).encode()
+        self._write(meta_path, lambda f: f.write(payload))
+        self._count("stores")
+        self.evict()
+
+    @staticmethod
+    def _write(path, write):
+        """Write through a temporary file and rename it into place atomically."""
+        fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.unlink(temporary)
+            except FileNotFoundError:
+                pass
+            raise
+
+    @staticmethod
+    def _load_snapshot(path, globals_):
+        import numpy as np
+
+        from simulation.snapshot import Snapshot
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        return Snapshot(arrays, dict(globals_))
+
+    # Running scenarios
+
+    def run(self, config, snapshot=False):
+        """Episode results for a (possibly partial) config, simulated only on a miss."""
+        config = scenario_config(**config)
+        key = scenario_key(config)
+        cached = self.get(key, snapshot)
+        if cached is not None:
+            return cached
+        metrics, final = run_scenario(config, snapshot)
+        self.put(key, metrics, final)
+        return metrics, final
+
+    def run_batch(self, configs, snapshot=False):
+        """run() over many configs; duplicates within the batch run once."""
+        results = {}
+        out = []
+        for config in configs:
+            key = scenario_key(scenario_config(**config))
+            if key not in results:
+                results[key] = self.run(config, snapshot)
+            out.append(results[key])
+        return out
+
+    # Size bound
+
+    def _entries(self):
+        """(mtime, bytes, paths) per entry; files removed concurrently are skipped."""
+        entries = []
+        for meta_path in self.directory.glob("*/*.json"):
+            array_path = meta_path.with_suffix(".npz")
+            try:
+                stat = meta_path.stat()
+            except FileNotFoundError:
+                continue
+            size = stat.st_size
+            try:
+                size += array_path.stat().st_size
+            except FileNotFoundError:
+                pass
+            entries.append((stat.st_mtime, size, meta_path, array_path))
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = self._entries()
+        total = sum(entry[1] for entry in entries)
+        if total <= self.max_bytes:
+            return 0
+        entries.sort(key=lambda entry: entry[0])
+        removed = 0
+        for _, size, meta_path, array_path in entries:
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, array_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+        self._count("evictions", removed)
+        return removed
+
+    def metrics(self):
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(entries),
+            "bytes": sum(entry[1] for entry in entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,34 @@
+"""
+Reproducible scenarios shared by the benchmarks and the tests.
+
+saturation_wave() places `friendlies` in a defensive band across the
+middle of a default-sized world and `enemies` in `groups` tight gaussian
+groups (std dev `spread` px) near the top, each group heading straight
+for the protected zone. There is no staggered spawning: every drone is
+present from frame 0, and the run is fully determined by `seed`.
+"""
+
+from simulation.models.drone import Drone
+from simulation.simulation import AegisSimulation
+
+
+def saturation_wave(friendlies, enemies, groups, spread, seed):
+    """Headless simulation holding a saturation wave of tight enemy groups."""
+    sim = AegisSimulation(headless=True, verbose=False, seed=seed)
+    sim.spawn_queue = []
+    sim.friendly_drones = []
+    sim.enemy_drones = []
+    sim.population += 1
+    rng = sim.rng
+    for _ in range(friendlies):
+        friendly = Drone(rng.uniform(100, 1100), rng.uniform(400, 600), "friendly", sim.allocate_friendly_id(), rng=rng)
+        friendly.patrol_point = (friendly.x, friendly.y)
+        sim.friendly_drones.append(friendly)
+    centres = [(rng.uniform(150, 1050), rng.uniform(50, 250)) for _ in range(groups)]
+    for i in range(enemies):
+        cx, cy = centres[i % groups]
+        enemy = Drone(rng.gauss(cx, spread), rng.gauss(cy, spread), "enemy", sim.allocate_enemy_id(), rng=rng)
+        enemy.target_x, enemy.target_y = cx, sim.height - 100
+        sim.enemy_drones.append(enemy)
+    sim.metrics.resync(friendlies, enemies)
+    return sim
@@ -0,0 +1,223 @@
+"""
+Amortized AEGIS protocol scheduling.
+
+The classic protocol evaluates every friendly on every 8th frame and does
+nothing in between, so frame times spike. ProtocolScheduler keeps the
+cheap global checks (cleanup, mission state, last line of defense,
+isolated threats) on that cadence but spreads the per-friendly work -
+target validation, bidding, auction resolution and assignment - over
+every frame:
+
+- a friendly is due once `interval` frames have passed since it was last
+  evaluated; due friendlies are taken oldest first, which walks the squad
+  round-robin, in slices of `slice_size`;
+- urgent friendlies (last defense, breach response, or whose assigned
+  target id is no longer a live enemy) are due on the frame they become
+  urgent, then on the normal cadence while they stay urgent;
+- urgent friendlies go first, then those that have waited `max_interval`
+  frames, then the rest;
+- work stops at the frame's `budget_ms`: a slice only takes the drones
+  whose estimated cost (the larger of the drone's own last evaluation,
+  which follows how many enemies it sees, and the running average) still
+  fits in what the frame has left;
+- a single drone can cost more than a whole budget (dense waves, small
+  budgets). To keep the queue moving, a frame that starts with no debt
+  and evaluates nobody else runs its first drone anyway (counted in
+  `forced`); the time it went over is debt that the following frames
+  pay back by doing less, so the protocol keeps to `budget_ms` per frame
+  on average and overruns are isolated frames rather than a run of them.
+
+The scheduler runs the flat scalar auction only; combining it with a
+BidKernel, SquadCoordinator or ThreatClusterer raises ValueError.
+
+Within a slice every drone bids before any resolves, so slice members see
+each other's fresh bids; bids of drones outside the slice are at most one
+interval old.
+"""
+
+import time
+
+from simulation.models.drone import LOD_ASLEEP, Drone, Role
+
+
+class ProtocolScheduler:
+    """Runs the per-friendly protocol in budgeted round-robin slices."""
+
+    def __init__(self, budget_ms=2.0, interval=8, max_interval=16, slice_size=2, clock=time.perf_counter):
+        if not 0 < interval <= max_interval:
+            raise ValueError("need 0 < interval <= max_interval")
+        if slice_size < 1:
+            raise ValueError("slice_size must be at least 1")
+        self.budget_ms = budget_ms
+        self.interval = interval
+        self.max_interval = max_interval
+        self.slice_size = slice_size
+        self.clock = clock
+        self.drone_cost = 0.0  # running estimate of seconds per evaluated friendly
+        self.costs = {}  # friendly id -> seconds its last evaluation took
+        self.debt = 0.0  # seconds spent over budget, not yet paid back
+        self.urgent = set()  # ids of friendlies that were urgent when last evaluated
+
+        # Metrics
+        self.frames = 0
+        self.overruns = 0
+        self.overrun_ms = 0.0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+        self.worst_ms = 0.0
+        self.evaluated = 0  # friendlies evaluated in the last frame
+        self.forced = 0  # of those, evaluated although the estimate did not fit
+        self.deferred = 0  # due friendlies left for a later frame in the last frame
+        self.max_age = 0  # oldest evaluation age seen, in frames
+
+    def reset(self):
+        """Forget per-episode state (urgent drones, cost estimates, debt)."""
+        self.urgent.clear()
+        self.costs.clear()
+        self.debt = 0.0
+
+    def is_urgent(self, drone, live_enemies):
+        """live_enemies: ids of enemies still alive (Drone references go stale when pools recycle)."""
+        if drone.role == Role.LAST_DEFENSE or drone.breach_response_mode:
+            return True
+        return drone.assigned_target is not None and drone.assigned_target not in live_enemies
+
+    def run(self, sim, protocol_tick):
+        """Do one frame's protocol work; protocol_tick marks the 8-frame cadence."""
+        if sim.bid_kernel is not None or sim.squad_coordinator is not None or sim.threat_clusters is not None:
+            raise ValueError("ProtocolScheduler runs the flat scalar auction; it cannot be combined "
+                             "with bid_kernel, squad_coordinator or threat_clusters")
+        started = self.clock()
+        self.evaluated = self.forced = self.deferred = 0
+        if protocol_tick:
+            sim.cleanup_destroyed_drones()
+            if sim.check_mission_complete():
+                self._finish(started)
+                return
+            sim.check_last_line_defense()
+            sim.identify_priority_threats()
+            alive = {friendly.id for friendly in sim.friendly_drones}
+            self.urgent.intersection_update(alive)
+            for drone_id in self.costs.keys() - alive:
+                del self.costs[drone_id]
+
+        frame = sim.frame_count
+        live_enemies = {enemy.id for enemy in sim.enemy_drones if enemy.health > 0}
+        due = []
+        for friendly in sim.friendly_drones:
+            if friendly.health <= 0 or friendly.lod == LOD_ASLEEP:
+                continue
+            last = friendly.evaluated_frame
+            age = self.interval if last is None else frame - last
+            self.max_age = max(self.max_age, age)
+            # Urgency is checked first so a newly urgent drone does not wait out the interval
+            if self.is_urgent(friendly, live_enemies):
+                if age >= self.interval or friendly.id not in self.urgent:
+                    due.append((0, -age, friendly))
+            elif age >= self.max_interval:
+                due.append((1, -age, friendly))
+            elif age >= self.interval:
+                due.append((2, -age, friendly))
+
+        due.sort(key=lambda entry: entry[:2])
+        budget = self.budget_ms / 1000 - self.debt
+        start = 0
+        while start < len(due):
+            # Only start drones that are expected to finish inside the budget
+            left = budget - (self.clock() - started)
+            batch = []
+            for _, _, drone in due[start:start + self.slice_size]:
+                left -= max(self.costs.get(drone.id, 0.0), self.drone_cost)
+                if left < 0:
+                    break
+                batch.append(drone)
+            if not batch:
+                if self.evaluated or self.debt > 0:
+                    break
+                batch = [due[start][2]]
+                self.forced += 1
+            self.evaluate(sim, batch, frame, live_enemies)
+            start += len(batch)
+        self.deferred = len(due) - start
+
+        if protocol_tick:
+            for hook in sim.protocol_hooks:
+                hook(sim)
+        self._finish(started)
+
+    def evaluate(self, sim, drones, frame, live_enemies):
+        """Full protocol pass for one slice of friendlies."""
+        clock = self.clock
+        started = clock()
+        enemies, friendlies = sim.enemy_drones, sim.friendly_drones
+        for friendly in drones:
+            friendly.validate_assigned_target(enemies)
+            friendly.update_breach_response()
+
+        # Each drone's own share of the slice, timed stage by stage
+        spent = dict.fromkeys((friendly.id for friendly in drones), (clock() - started) / len(drones))
+        metrics = sim.metrics
+        scans = Drone.peer_scans
+        bidders = [f for f in drones if f.role != Role.LAST_DEFENSE]
+        mark = clock()
+        for friendly in bidders:
+            friendly.participate_in_auction(enemies, friendlies)
+            sim.total_bids += friendly.bid_count
+            metrics.on_bids(friendly.bid_count)
+            now = clock()
+            spent[friendly.id] += now - mark
+            mark = now
+        auctioned = mark
+        for friendly in bidders:
+            friendly.resolve_auctions(friendlies)
+            now = clock()
+            spent[friendly.id] += now - mark
+            mark = now
+        resolved = mark
+
+        for friendly in drones:
+            friendly.execute_assignment(enemies, friendlies)
+            metrics.on_assignment(friendly)
+            now = clock()
+            spent[friendly.id] += now - mark
+            mark = now
+            friendly.evaluated_frame = frame
+            if self.is_urgent(friendly, live_enemies):
+                self.urgent.add(friendly.id)
+            else:
+                self.urgent.discard(friendly.id)
+        metrics.on_coordination(Drone.peer_scans - scans)
+        metrics.add_stage_time("auction", auctioned - started)
+        metrics.add_stage_time("resolve", resolved - auctioned)
+        metrics.add_stage_time("assign", mark - resolved)
+        self.evaluated += len(drones)
+        cost = (clock() - started) / len(drones)
+        self.drone_cost += (cost - self.drone_cost) * 0.2
+        self.costs.update(spent)
+
+    def _finish(self, started):
+        elapsed_ms = (self.clock() - started) * 1000
+        self.debt = max(0.0, self.debt + (elapsed_ms - self.budget_ms) / 1000)
+        self.frames += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        self.worst_ms = max(self.worst_ms, elapsed_ms)
+        if elapsed_ms > self.budget_ms:
+            self.overruns += 1
+            self.overrun_ms += elapsed_ms - self.budget_ms
+
+    def metrics(self):
+        return {
+            "budget_ms": self.budget_ms,
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "overrun_ms": round(self.overrun_ms, 3),
+            "mean_ms": round(self.total_ms / max(1, self.frames), 3),
+            "last_ms": round(self.last_ms, 3),
+            "worst_ms": round(self.worst_ms, 3),
+            "evaluated": self.evaluated,
+            "forced": self.forced,
+            "deferred": self.deferred,
+            "debt_ms": round(self.debt * 1000, 3),
+            "max_age": self.max_age,
+        }
@@ -0,0 +1,495 @@
+"""
+Asyncio control server for the AEGIS simulation core.
+
+Clients talk to one shared, headless AegisSimulation over TCP or a Unix
+socket. Every message is a frame made of a 4-byte big-endian length
+followed by a UTF-8 JSON payload. A payload is either one request or a
+JSON list of requests (a batch):
+
+    {"id": 7, "cmd": "step", "args": {"frames": 8}}
+
+Responses echo the request id, so clients may pipeline as many requests
+as they like without waiting:
+
+    {"id": 7, "ok": true, "result": {"frame": 128}}
+
+Subscriptions push unsolicited state frames:
+
+    {"event": "state", "sub": 1, "state": {...}}
+
+Every session writes through its own bounded outbox and writer task, so
+a slow reader never holds up the simulation or other clients. State
+pushes that do not fit in the outbox are skipped (the subscriber sees a
+later state instead); a response that does not fit disconnects the
+session, since it could never catch up.
+
+Run with ``python -m simulation.server --port 8765`` or ``--unix PATH``.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import struct
+from collections import deque
+
+from simulation.simulation import AegisSimulation
+
+HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+MAX_PENDING_BYTES = 4 * 1024 * 1024  # per-session outbox not yet handed to the socket
+CLOSE_TIMEOUT = 5.0  # seconds a closing session may take to flush
+
+
+def encode_frame(payload):
+    """Serialize a JSON-compatible payload into a length-prefixed frame."""
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader):
+    """Read one frame; returns None when the peer closed the connection."""
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"frame of {length} bytes exceeds limit")
+    body = await reader.readexactly(length)
+    return json.loads(body)
+
+
+def serialize_drone(drone):
+    return {
+        "id": drone.id,
+        "name": drone.name,
+        "x": round(drone.x, 2),
+        "y": round(drone.y, 2),
+        "vx": round(drone.velocity_x, 3),
+        "vy": round(drone.velocity_y, 3),
+        "health": drone.health,
+        "ammo": drone.ammo,
+        "role": drone.role.label,
+        "target": drone.assigned_target,
+    }
+
+
+def serialize_state(sim):
+    """Plain-dict view of the simulation suitable for JSON clients."""
+    return {
+        "frame": sim.frame_count,
+        "aegis_active": sim.aegis_active,
+        "mission_complete": sim.mission_complete,
+        "breach_response_active": sim.breach_response_active,
+        "spawn_queue": len(sim.spawn_queue),
+        "enemies_neutralized": sim.enemies_neutralized,
+        "enemies_breached": sim.enemies_breached,
+        "friendly_losses": sim.friendly_losses,
+        "total_bids": sim.total_bids,
+        "friendlies": [serialize_drone(d) for d in sim.friendly_drones if d.health > 0],
+        "enemies": [serialize_drone(d) for d in sim.enemy_drones if d.health > 0],
+    }
+
+
+class Session:
+    """One connected client: its writer, outbox and state subscriptions.
+
+    send() and push() only append to the outbox; the session's writer task
+    hands it to the socket and waits for the drain, so the executor never
+    blocks on a client.
+    """
+
+    def __init__(self, session_id, writer, max_pending=MAX_PENDING_BYTES):
+        self.id = session_id
+        self.writer = writer
+        self.subscriptions = {}  # sub id -> push every N frames
+        self.closed = False
+        self.max_pending = max_pending
+        self.outbox = deque()
+        self.pending = 0  # bytes in the outbox
+        self.states_dropped = 0
+        self.fell_behind = False
+        self._ready = asyncio.Event()
+        self._flusher = asyncio.ensure_future(self._flush_forever())
+
+    def send(self, payload):
+        """Queue a response; a session too far behind to take it is disconnected."""
+        if self.closed:
+            return
+        frame = encode_frame(payload)
+        if self.pending + len(frame) > self.max_pending:
+            self.fell_behind = True
+            self.abort()
+            return
+        self._enqueue(frame)
+
+    def push(self, payload):
+        """Queue a state push, or skip it while the client is behind."""
+        if self.closed:
+            return
+        frame = encode_frame(payload)
+        if self.pending + len(frame) > self.max_pending:
+            self.states_dropped += 1
+            return
+        self._enqueue(frame)
+
+    def _enqueue(self, frame):
+        self.outbox.append(frame)
+        self.pending += len(frame)
+        self._ready.set()
+
+    async def _flush_forever(self):
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                while self.outbox:
+                    chunk = b"".join(self.outbox)
+                    self.outbox.clear()
+                    self.pending = 0
+                    self.writer.write(chunk)
+                    await self.writer.drain()
+        except ConnectionError:
+            self.closed = True
+
+    def abort(self):
+        """Drop the connection now, discarding anything unsent."""
+        self.closed = True
+        self._flusher.cancel()
+        self.outbox.clear()
+        self.pending = 0
+        self.writer.transport.abort()
+
+    async def close(self):
+        """Stop the writer task, flush what is queued and close the socket."""
+        self.closed = True
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+        if self.outbox and not self.writer.is_closing():
+            self.writer.write(b"".join(self.outbox))
+        self.outbox.clear()
+        self.pending = 0
+        self.writer.close()
+        try:
+            await asyncio.wait_for(self.writer.wait_closed(), CLOSE_TIMEOUT)
+        except (ConnectionError, asyncio.TimeoutError):
+            self.writer.transport.abort()
+
+
+class SimulationServer:
+    """Multiplexes many client sessions onto one simulation.
+
+    Readers only parse frames and enqueue requests. A single executor task
+    drains the queue in batches and applies them to the simulation in
+    arrival order; responses and state pushes go to each session's outbox
+    (see Session), bounded by max_pending bytes.
+    """
+
+    def __init__(self, sim=None, max_batch=256, max_step_frames=10000, max_pending=MAX_PENDING_BYTES):
+        self.sim = sim or AegisSimulation(headless=True, verbose=False)
+        self.max_batch = max_batch
+        self.max_step_frames = max_step_frames
+        self.max_pending = max_pending
+        self.sessions = {}
+        self.queue = asyncio.Queue()
+        self.commands_processed = 0
+        self.batches_processed = 0
+        self.slow_disconnects = 0
+        self.states_dropped = 0  # by sessions that have since closed
+        self._session_ids = itertools.count(1)
+        self._subscription_ids = itertools.count(1)
+        self._executor = None
+        self._servers = []
+        self._last_published_frame = self.sim.frame_count
+
+        self.handlers = {
+            "ping": self.cmd_ping,
+            "step": self.cmd_step,
+            "observe": self.cmd_observe,
+            "add_enemy_drones": self.cmd_add_enemy_drones,
+            "reset_simulation": self.cmd_reset_simulation,
+            "aegis_toggle": self.cmd_aegis_toggle,
+            "subscribe": self.cmd_subscribe,
+            "unsubscribe": self.cmd_unsubscribe,
+            "stats": self.cmd_stats,
+            "export_metrics": self.cmd_export_metrics,
+        }
+
+    async def start_tcp(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        self._servers.append(server)
+        self._ensure_executor()
+        return server
+
+    async def start_unix(self, path):
+        server = await asyncio.start_unix_server(self.handle_client, path)
+        self._servers.append(server)
+        self._ensure_executor()
+        return server
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        for session in list(self.sessions.values()):
+            await session.close()
+        if self._executor:
+            self._executor.cancel()
+            try:
+                await self._executor
+            except asyncio.CancelledError:
+                pass
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            self._executor = asyncio.ensure_future(self.execute_forever())
+
+    async def handle_client(self, reader, writer):
+        session = Session(next(self._session_ids), writer, self.max_pending)
+        self.sessions[session.id] = session
+        try:
+            while True:
+                try:
+                    message = await read_frame(reader)
+                except (ValueError, json.JSONDecodeError) as exc:
+                    session.send({"id": None, "ok": False, "error": f"bad frame: {exc}"})
+                    break
+                if message is None:
+                    break
+                requests = message if isinstance(message, list) else [message]
+                for request in requests:
+                    self.queue.put_nowait((session, request))
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.pop(session.id, None)
+            self.slow_disconnects += session.fell_behind
+            self.states_dropped += session.states_dropped
+            await session.close()
+
+    async def execute_forever(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            self.execute_batch(batch)
+            # Let the session writers and readers run between batches
+            await asyncio.sleep(0)
+
+    def execute_batch(self, batch):
+        """Run a batch of (session, request) pairs against the simulation."""
+        for session, request in batch:
+            request_id = request.get("id") if isinstance(request, dict) else None
+            try:
+                handler = self.handlers[request["cmd"]]
+                args = request.get("args") or {}
+                if not isinstance(args, dict):
+                    raise TypeError(f"args must be an object, not {type(args).__name__}")
+                result = handler(session, args)
+                response = {"id": request_id, "ok": True, "result": result}
+            except KeyError as exc:
+                response = {"id": request_id, "ok": False, "error": f"unknown command or missing field {exc}"}
+            except (TypeError, ValueError) as exc:
+                response = {"id": request_id, "ok": False, "error": str(exc)}
+            except Exception as exc:
+                # Any other handler failure answers this request only; the
+                # executor task serves every client and must keep running
+                response = {"id": request_id, "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            session.send(response)
+            self.commands_processed += 1
+        self.batches_processed += 1
+
+    def publish_state(self):
+        """Push state to subscribers whose interval elapsed since the last publish."""
+        frame = self.sim.frame_count
+        previous = self._last_published_frame
+        self._last_published_frame = frame
+        state = None
+        for session in list(self.sessions.values()):
+            for sub_id, every in session.subscriptions.items():
+                if frame // every == previous // every:
+                    continue
+                if state is None:
+                    state = serialize_state(self.sim)
+                session.push({"event": "state", "sub": sub_id, "state": state})
+
+    # --- Commands -------------------------------------------------------
+
+    def cmd_ping(self, session, args):
+        return {"frame": self.sim.frame_count}
+
+    def cmd_step(self, session, args):
+        frames = int(args.get("frames", 1))
+        if not 0 < frames <= self.max_step_frames:
+            raise ValueError(f"frames must be in 1..{self.max_step_frames}")
+        for _ in range(frames):
+            self.sim.update()
+        self.publish_state()
+        return {"frame": self.sim.frame_count, "mission_complete": self.sim.mission_complete}
+
+    def cmd_observe(self, session, args):
+        return serialize_state(self.sim)
+
+    def cmd_add_enemy_drones(self, session, args):
+        count = int(args.get("count", 3))
+        if count <= 0:
+            raise ValueError("count must be positive")
+        self.sim.add_enemy_drones(count)
+        return {"spawn_queue": len(self.sim.spawn_queue)}
+
+    def cmd_reset_simulation(self, session, args):
+        self.sim.reset_simulation()
+        self._last_published_frame = self.sim.frame_count
+        return {"frame": self.sim.frame_count}
+
+    def cmd_aegis_toggle(self, session, args):
+        active = args.get("active")
+        desired = (not self.sim.aegis_active) if active is None else bool(active)
+        if desired != self.sim.aegis_active:
+            self.sim.aegis_active = desired
+            self.sim.on_aegis_toggle()
+        return {"aegis_active": self.sim.aegis_active}
+
+    def cmd_subscribe(self, session, args):
+        every = int(args.get("every", 1))
+        if every <= 0:
+            raise ValueError("every must be positive")
+        sub_id = next(self._subscription_ids)
+        session.subscriptions[sub_id] = every
+        return {"sub": sub_id}
+
+    def cmd_unsubscribe(self, session, args):
+        return {"removed": session.subscriptions.pop(int(args["sub"]), None) is not None}
+
+    def cmd_stats(self, session, args):
+        return {
+            "sessions": len(self.sessions),
+            "commands_processed": self.commands_processed,
+            "batches_processed": self.batches_processed,
+            "queue_depth": self.queue.qsize(),
+            "slow_disconnects": self.slow_disconnects,
+            "states_dropped": self.states_dropped + sum(s.states_dropped for s in self.sessions.values()),
+            "protocol": None if self.sim.protocol_scheduler is None else self.sim.protocol_scheduler.metrics(),
+            "squads": None if self.sim.squad_coordinator is None else self.sim.squad_coordinator.metrics(),
+            "threat_clusters": None if self.sim.threat_clusters is None else self.sim.threat_clusters.metrics(),
+            "world": None if self.sim.world is None else self.sim.world.metrics(),
+            "navigation": None if self.sim.navigation is None else self.sim.navigation.metrics(),
+            "bid_kernel": None if self.sim.bid_kernel is None else self.sim.bid_kernel.metrics(),
+        }
+
+    def cmd_export_metrics(self, session, args):
+        path = args["path"]
+        fmt = args.get("format", "npz")
+        exporters = {"npz": self.sim.metrics.export_npz, "csv": self.sim.metrics.export_csv}
+        if fmt not in exporters:
+            raise ValueError(f"unknown metrics format: {fmt!r}")
+        try:
+            exporters[fmt](path)
+        except OSError as exc:
+            raise ValueError(f"cannot write {path}: {exc}") from exc
+        return {"path": path, "samples": len(self.sim.metrics.series["frame"])}
+
+
+class AegisClient:
+    """Minimal pipelining client for the control server."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+        self.events = asyncio.Queue()
+        self._ids = itertools.count(1)
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765, unix_path=None):
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _read_loop(self):
+        try:
+            while True:
+                message = await read_frame(self.reader)
+                if message is None:
+                    break
+                if "event" in message:
+                    self.events.put_nowait(message)
+                    continue
+                future = self.pending.pop(message.get("id"), None)
+                if future and not future.done():
+                    future.set_result(message)
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("server closed connection"))
+            self.pending.clear()
+
+    def send(self, cmd, **args):
+        """Queue a request without waiting; returns a future for its response."""
+        return self.send_batch([(cmd, args)])[0]
+
+    def send_batch(self, commands):
+        """Send several (cmd, args) requests in one frame."""
+        loop = asyncio.get_running_loop()
+        requests, futures = [], []
+        for cmd, args in commands:
+            request_id = next(self._ids)
+            future = loop.create_future()
+            self.pending[request_id] = future
+            requests.append({"id": request_id, "cmd": cmd, "args": args})
+            futures.append(future)
+        self.writer.write(encode_frame(requests if len(requests) > 1 else requests[0]))
+        return futures
+
+    async def call(self, cmd, **args):
+        response = await self.send(cmd, **args)
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    async def close(self):
+        self.writer.close()
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except asyncio.CancelledError:
+            pass
+
+
+async def serve(host, port, unix_path, max_batch):
+    server = SimulationServer(max_batch=max_batch)
+    if unix_path:
+        await server.start_unix(unix_path)
+        print(f"AEGIS control server listening on unix:{unix_path}", flush=True)
+    else:
+        tcp = await server.start_tcp(host, port)
+        bound_port = tcp.sockets[0].getsockname()[1]
+        print(f"AEGIS control server listening on {host}:{bound_port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AEGIS simulation control server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-batch", type=int, default=256, help="requests executed per batch")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_path, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
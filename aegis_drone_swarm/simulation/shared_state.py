@@ -0,0 +1,253 @@
+"""
+Shared-memory state publication for local viewers.
+
+A SharedStatePublisher writes every frame's Snapshot into a ring of slots
+in one multiprocessing.shared_memory segment. Any number of processes on
+the same machine - tactical display, metrics dashboard, recorder - attach
+a SharedStateReader and read the latest complete frame through NumPy
+views on the segment, without copying and without the simulation ever
+waiting for them.
+
+Segment layout (little-endian):
+
+    header  magic, slot count, drone capacity, slot size, latest sequence
+    slot i  sequence, drone count, globals, then one column per
+            DRONE_FIELDS entry of `capacity` values each
+
+Each slot is a seqlock. The writer makes the slot's sequence odd, fills
+it, makes it even and then advances the header's latest sequence; frame
+n lives in slot n % slots with sequence 2n + 2. A reader picks the slot
+named by the latest sequence, reads it, and keeps the frame only if the
+slot's sequence was the expected even value both before and after - a
+writer lapping the whole ring mid-read shows up as a changed sequence
+and the read is retried.
+
+    python -m simulation.shared_state serve --name aegis
+    python -m simulation.shared_state view --name aegis
+"""
+
+import argparse
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from simulation.snapshot import DRONE_FIELDS, GLOBAL_FIELDS, HandleTable, Snapshot, capture_snapshot
+
+SHM_MAGIC = b"AEGISSHM"
+HEADER = struct.Struct("<8sIIQQ")  # magic, slots, capacity, slot bytes, latest sequence
+LATEST_OFFSET = HEADER.size - 8
+SLOT_HEADER = struct.Struct("<QI4x")  # sequence, drone count, padding
+GLOBALS_DTYPE = np.int64
+
+
+def _slot_layout(capacity):
+    """Byte offset of every column inside a slot, and the slot size."""
+    offset = SLOT_HEADER.size + len(GLOBAL_FIELDS) * np.dtype(GLOBALS_DTYPE).itemsize
+    columns = {}
+    for name, dtype in DRONE_FIELDS:
+        itemsize = np.dtype(dtype).itemsize
+        offset = (offset + itemsize - 1) // itemsize * itemsize  # align the column
+        columns[name] = offset
+        offset += itemsize * capacity
+    return columns, (offset + 63) // 64 * 64
+
+
+class _SlotViews:
+    """NumPy views of one slot's sequence, count, globals and columns."""
+
+    def __init__(self, buf, base, capacity, columns):
+        self.sequence = np.ndarray((1,), np.uint64, buf, base)
+        self.count = np.ndarray((1,), np.uint32, buf, base + 8)
+        self.globals = np.ndarray((len(GLOBAL_FIELDS),), GLOBALS_DTYPE, buf, base + SLOT_HEADER.size)
+        self.columns = {name: np.ndarray((capacity,), dtype, buf, base + columns[name])
+                        for name, dtype in DRONE_FIELDS}
+
+
+class SharedStatePublisher:
+    """Publishes a simulation's frames into a shared-memory seqlock ring."""
+
+    def __init__(self, sim, name=None, slots=4, capacity=4096):
+        self.sim = sim
+        self.slots = slots
+        self.capacity = capacity
+        self.handles = HandleTable()
+        columns, self.slot_bytes = _slot_layout(capacity)
+        self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                              size=HEADER.size + slots * self.slot_bytes)
+        self.name = self.shm.name
+        buf = self.shm.buf
+        HEADER.pack_into(buf, 0, SHM_MAGIC, slots, capacity, self.slot_bytes, 0)
+        self._latest = np.ndarray((1,), np.uint64, buf, LATEST_OFFSET)
+        self._slots = [_SlotViews(buf, HEADER.size + i * self.slot_bytes, capacity, columns)
+                       for i in range(slots)]
+        self.frames = 0
+
+    def publish(self, snapshot=None):
+        """Write the current frame (or a captured snapshot) to the next slot."""
+        if snapshot is None:
+            snapshot = capture_snapshot(self.sim, self.handles)
+        count = len(snapshot)
+        if count > self.capacity:
+            raise ValueError(f"{count} drones exceed the shared ring capacity of {self.capacity}")
+        slot = self._slots[self.frames % self.slots]
+        sequence = 2 * self.frames + 2
+        slot.sequence[0] = sequence - 1  # odd: being written
+        slot.count[0] = count
+        slot.globals[:] = [snapshot.globals[name] for name in GLOBAL_FIELDS]
+        for name, column in slot.columns.items():
+            column[:count] = snapshot.arrays[name]
+        slot.sequence[0] = sequence
+        self._latest[0] = sequence
+        self.frames += 1
+
+    def close(self):
+        """Release and remove the segment; attached readers keep their mapping."""
+        self._latest = self._slots = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _attach(name):
+    """Map an existing segment without registering it for cleanup.
+
+    Only the publisher owns the segment. Before Python 3.13 (no track=)
+    attaching registers it with the resource tracker, which would unlink
+    it when this process exits, so registration is skipped for the call.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedStateReader:
+    """Attaches to a publisher's segment and reads its latest frame."""
+
+    def __init__(self, name):
+        self.shm = _attach(name)
+        buf = self.shm.buf
+        magic, self.slots, self.capacity, slot_bytes, _ = HEADER.unpack_from(buf, 0)
+        if magic != SHM_MAGIC:
+            raise ValueError(f"{name} is not an AEGIS shared state segment")
+        columns, _ = _slot_layout(self.capacity)
+        self._latest = np.ndarray((1,), np.uint64, buf, LATEST_OFFSET)
+        self._slots = [_SlotViews(buf, HEADER.size + i * slot_bytes, self.capacity, columns)
+                       for i in range(self.slots)]
+        self.retries = 0
+
+    @property
+    def latest_sequence(self):
+        return int(self._latest[0])
+
+    def read(self, copy=True, since=0):
+        """Latest consistent frame as a Snapshot, or None if none is newer than `since`.
+
+        copy=False returns a Snapshot whose arrays are views on the slot; it
+        stays valid until the writer laps the ring, which valid() checks.
+        Returns (sequence, snapshot).
+        """
+        while True:
+            sequence = int(self._latest[0])
+            if sequence <= since:
+                return since, None
+            slot = self._slots[(sequence // 2 - 1) % self.slots]
+            if int(slot.sequence[0]) != sequence:
+                self.retries += 1  # lapped between the two loads
+                continue
+            count = int(slot.count[0])
+            arrays = {name: column[:count] for name, column in slot.columns.items()}
+            if copy:
+                arrays = {name: array.copy() for name, array in arrays.items()}
+            globals_ = dict(zip(GLOBAL_FIELDS, slot.globals.tolist()))
+            if int(slot.sequence[0]) == sequence:
+                return sequence, Snapshot(arrays, globals_)
+            self.retries += 1
+
+    def valid(self, sequence):
+        """Whether the slot holding `sequence` still holds it (for copy=False reads)."""
+        return int(self._slots[(sequence // 2 - 1) % self.slots].sequence[0]) == sequence
+
+    def close(self):
+        self._latest = self._slots = None
+        self.shm.close()
+
+
+def view(name, fps=60):
+    """Reference viewer: draw the latest shared frame with the regular render() path."""
+    import pygame
+    from simulation.simulation import AegisSimulation
+
+    reader = SharedStateReader(name)
+    viewer = AegisSimulation(verbose=False)
+    cache = {}
+    shown = 0
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    return
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+                    viewer.show_roles = not viewer.show_roles
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_d:
+                    viewer.show_debug = not viewer.show_debug
+            sequence, snapshot = reader.read(copy=False, since=shown)
+            if snapshot is not None:
+                # Zero-copy: materialize straight from the slot, redo it if lapped
+                snapshot.apply_to(viewer, cache)
+                if not reader.valid(sequence):
+                    continue
+                shown = sequence
+                viewer.render()
+            viewer.clock.tick(fps)
+    finally:
+        reader.close()
+        pygame.quit()
+
+
+def main():
+    from simulation.simulation import AegisSimulation
+
+    parser = argparse.ArgumentParser(description="AEGIS shared-memory state")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run headless and publish every frame")
+    serve.add_argument("--name", default="aegis")
+    serve.add_argument("--seed", type=int)
+    serve.add_argument("--rate", type=int, default=60, help="frames per second (0 = flat out)")
+    serve.add_argument("--slots", type=int, default=4)
+    show = commands.add_parser("view", help="render the latest published frame")
+    show.add_argument("--name", default="aegis")
+    show.add_argument("--fps", type=int, default=60)
+    args = parser.parse_args()
+
+    if args.command == "view":
+        view(args.name, args.fps)
+        return
+
+    sim = AegisSimulation(headless=True, verbose=False, seed=args.seed)
+    publisher = SharedStatePublisher(sim, args.name, slots=args.slots)
+    print(f"Publishing to shared memory {publisher.name!r}; Ctrl+C to stop")
+    period = 1 / args.rate if args.rate else 0.0
+    try:
+        next_frame = time.perf_counter()
+        while True:
+            sim.update()
+            publisher.publish()
+            if period:
+                next_frame += period
+                time.sleep(max(0.0, next_frame - time.perf_counter()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,74 @@
-import pygame
-import sys
 import random
 import math
-from simulation.models.drone import Drone
+import time
+from itertools import chain
+from simulation.models.drone import DEFAULT_BID_WEIGHTS, DEFAULT_BOUNDS, LOD_ASLEEP, Drone, Role, WorldBounds
+from simulation.models.pool import DronePool, compact_alive
+from simulation.engagement import ContactSchedule, EngagementDetector
+from simulation.metrics import MetricsStore
+from simulation.physics import REFERENCE_DT, Integrator
+
+def count_alive(drones):
+    count = 0
+    for drone in drones:
+        if drone.health > 0:
+            count += 1
+    return count
 
 class AegisSimulation:
-    def __init__(self, width=1200, height=800):  # Increased window size
-        """Simulation with enhanced tactical protocols and larger display."""
-        pygame.init()
-        
+    def __init__(self, width=1200, height=800, headless=False, verbose=True, seed=None,
+                 dt=REFERENCE_DT, view_size=None, bid_weights=None):  # Increased window size
+        """Simulation with enhanced tactical protocols and larger display.
+
+        headless skips opening a window so the core can be driven by
+        external controllers without loading pygame (see
+        simulation.rendering); verbose=False silences the event log.
+        seed fixes the simulation's own random stream for reproducible runs.
+        dt is the default step length in seconds; frame_count stays in
+        1/60 s reference frames whatever the step.
+        width x height is the world; view_size is the window as
+        (width, height), the world size by default, and sim.camera pans
+        and zooms it over larger worlds. bid_weights (a BidWeights) sets
+        every drone's cost function, DEFAULT_BID_WEIGHTS by default.
+        """
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("AEGIS Drone Swarm Protocol - Enhanced Tactics")
-        
-        # CLEANER COLOR SCHEME
-        self.DARK_BLUE = (5, 15, 30)
-        self.PANEL_BG = (25, 35, 60, 220)
-        self.TEXT_COLOR = (220, 230, 255)
-        self.WARNING_COLOR = (255, 80, 80)
-        self.SUCCESS_COLOR = (80, 255, 120)
-        self.HUD_COLOR = (0, 180, 255)
-        self.ZONE_COLOR = (0, 80, 0)
-        
-        self.clock = pygame.time.Clock()
+        self.bounds = WorldBounds(width, height)
+        self.view_size = view_size or (width, height)
+        self.bid_weights = bid_weights or DEFAULT_BID_WEIGHTS
+        self.headless = headless
+        self.verbose = verbose
+        self.screen = None
+        self.clock = None
+        self.rng = random.Random(seed)
+        
+        if not headless:
+            from simulation.rendering import open_display
+            self.screen, self.clock = open_display(*self.view_size)
+        
         self.running = True
         self.frame_count = 0
+        self.frame_remainder = 0.0  # fraction of a reference frame carried between steps
+        self.dt = dt
+        self.integrator = Integrator()
         
         # Protected zone (adjusted for new height)
-        self.protected_zone = pygame.Rect(0, self.height - 150, self.width, 150)
+        self.protected_zone = (0, self.height - 150, self.width, 150)  # x, y, w, h
         self.last_line_defense_y = self.height - 200  # Y threshold for last defense
         
         # Drone management
         self.friendly_drones = []
         self.enemy_drones = []
+        self.pool = DronePool(self.rng, bounds=self.bounds, bid_weights=self.bid_weights)
         
         # Enemy spawn management
         self.enemy_spawn_timer = 0
         self.spawn_queue = []
         
         # Balance parameters
+        self.initial_enemies = 8
         self.min_friendly_ratio = 1.1
+        self.spawn_interval = 30  # frames between staggered initial enemy spawns
         self.auto_spawn = False
         
         # Performance metrics
@@ -50,12 +78,77 @@ class AegisSimulation:
         self.successful_engagements = 0
         self.friendly_losses = 0
         self.mission_complete = False
+        self.metrics = MetricsStore()
         
         # Enhanced breach tracking
         self.last_breach_frame = 0
         self.breach_response_active = False
         self.consecutive_breaches = 0
         
+        # Engagement detection: "swept" (default), legacy "discrete", or
+        # "event" (swept tests only when a time-to-contact bound comes due)
+        self.engagement_mode = "swept"
+        self.engagement_detector = EngagementDetector(Drone.engagement_range)
+        self.contact_schedule = ContactSchedule(Drone.engagement_range, Drone.max_speed_pixels)
+        self.due_breaches = None
+        
+        # Callbacks run after each AEGIS protocol tick (external controllers)
+        self.protocol_hooks = []
+        
+        # Decision points taken during the current frame, as (kind, detail),
+        # and callbacks run with them once the frame is complete
+        self.decisions = []
+        self.decision_hooks = []
+        
+        # Optional ProtocolScheduler spreading protocol work over frames
+        # (flat scalar auction only: not with bid_kernel, squad_coordinator
+        # or threat_clusters); None runs the whole protocol every 8th frame
+        self.protocol_scheduler = None
+        
+        # Optional LevelOfDetail sleeping idle patrols and coasting distant
+        # enemies; None simulates every drone at full fidelity
+        self.lod = None
+        
+        # Optional SquadCoordinator running the auction hierarchically;
+        # None runs the flat swarm-wide auction
+        self.squad_coordinator = None
+        
+        # Optional ThreatClusterer grouping enemies each tick for
+        # cluster-first bidding and threat checks; None treats each alone
+        self.threat_clusters = None
+        
+        # Optional World whose obstacles block line of sight; refreshed
+        # every protocol tick into each friendly's occluded set
+        self.world = None
+        
+        # Optional FlowFieldCache steering drones around the world's
+        # obstacles; None steers straight at targets
+        self.navigation = None
+        
+        # Optional AllocationProfiler charging allocations to update()'s
+        # stages; None skips the marks
+        self.alloc_profiler = None
+        
+        # Steady-state mode: the step refills preallocated scratch lists
+        # instead of building new ones every frame; lists handed out
+        # (detector contacts, due breaches) are only valid for that frame
+        self.steady_state = False
+        self._pursuers = []
+        self._targets = []
+        self._breaches = []
+        
+        # Optional BidKernel computing the flat auction's bids and target
+        # scores as friendly x enemy matrices; None scores pair by pair
+        self.bid_kernel = None
+        
+        # Camera render() draws through; made on first render to fit the
+        # world in the window (see simulation.camera)
+        self.camera = None
+        # Bumped whenever drones are spawned or removed, so the camera's
+        # cull grid knows to rebuild; code editing the drone lists directly
+        # bumps it too
+        self.population = 0
+        
         # Simulation mode
         self.aegis_active = True
         self.show_debug = True
@@ -63,17 +156,26 @@ class AegisSimulation:
         
         self.initialize_balanced_forces()
         
-        print("ENHANCED TACTICAL AEGIS PROTOCOL INITIALIZED")
-        print("✓ Staggered Enemy Spawning")
-        print("✓ Last Line of Defense Protocol")
-        print("✓ Flanking Wolf-Pack Tactics")
+        self.log("ENHANCED TACTICAL AEGIS PROTOCOL INITIALIZED")
+        self.log("✓ Staggered Enemy Spawning")
+        self.log("✓ Last Line of Defense Protocol")
+        self.log("✓ Flanking Wolf-Pack Tactics")
+
+    def log(self, message):
+        """Print a simulation event unless running quietly."""
+        if self.verbose:
+            print(message)
 
     def initialize_balanced_forces(self):
         """Initialize drones with 10% friendly superiority."""
-        self.friendly_drones = []
-        self.enemy_drones = []
-        
-        initial_enemies = 8
+        self.pool.release_all(self.friendly_drones)
+        self.pool.release_all(self.enemy_drones)
+        self.population += 1
+        self.next_friendly_id = 0
+        self.next_enemy_id = 0
+        self.metrics.reset()
+        
+        initial_enemies = self.initial_enemies
         initial_friendlies = max(6, int(initial_enemies * self.min_friendly_ratio))
         
         # Defense positions spread across wider area
@@ -84,15 +186,35 @@ class AegisSimulation:
         ][:initial_friendlies]
         
         for i, (x, y) in enumerate(defense_positions):
-            friendly = Drone(x, y, "friendly", f"F{i}")
+            x, y = self.layout_x(x), self.layout_y(y)
+            friendly = self.pool.acquire(x, y, "friendly", self.allocate_friendly_id())
             friendly.patrol_point = (x, y)
             self.friendly_drones.append(friendly)
+            self.population += 1
+            self.metrics.on_spawn(friendly, self.frame_count)
         
         # Stagger initial enemy spawns
         for i in range(initial_enemies):
-            self.schedule_enemy_spawn(i * 30, i)  # Stagger by 30 frames
+            self.schedule_enemy_spawn(i * self.spawn_interval, i)  # Stagger by spawn_interval frames
         
-        print(f"Initial forces: {len(self.friendly_drones)} friendlies vs {initial_enemies} enemies (staggered spawn)")
+        self.log(f"Initial forces: {len(self.friendly_drones)} friendlies vs {initial_enemies} enemies (staggered spawn)")
+
+    def layout_x(self, x):
+        """x of the reference 1200 x 800 scenario layout, scaled to this world."""
+        return x * self.width // DEFAULT_BOUNDS.width
+
+    def layout_y(self, y):
+        return y * self.height // DEFAULT_BOUNDS.height
+
+    def allocate_friendly_id(self):
+        drone_id = self.next_friendly_id
+        self.next_friendly_id += 1
+        return drone_id
+
+    def allocate_enemy_id(self):
+        drone_id = self.next_enemy_id
+        self.next_enemy_id += 1
+        return drone_id
 
     def schedule_enemy_spawn(self, delay_frames, index):
         """Schedule an enemy drone to spawn after a delay."""
@@ -111,26 +233,29 @@ class AegisSimulation:
         
         if index < len(entry_points):
             x, y = entry_points[index]
+            x, y = self.layout_x(x), self.layout_y(y)
         else:
-            x = random.randint(100, self.width - 100)
-            y = random.randint(30, 200)
+            x = self.rng.randint(100, self.width - 100)
+            y = self.rng.randint(self.layout_y(30), self.layout_y(200))
             
-        enemy = Drone(x, y, "enemy", f"E{index}")
+        enemy = self.pool.acquire(x, y, "enemy", self.allocate_enemy_id())
         enemy.determination = 0.98
-        enemy.aggressiveness = random.uniform(0.9, 1.1)
+        enemy.aggressiveness = self.rng.uniform(0.9, 1.1)
         
         # Varied enemy behaviors
         if index % 4 == 0:  # Flanking enemies
-            enemy.target_x = random.choice([200, 1000])
+            enemy.target_x = self.rng.choice([self.layout_x(200), self.layout_x(1000)])
         elif index % 4 == 1:  # Direct assault
             enemy.target_x = self.width // 2
         else:  # Zig-zag pattern
-            enemy.target_x = random.randint(300, 900)
+            enemy.target_x = self.rng.randint(self.layout_x(300), self.layout_x(900))
             
         enemy.target_y = self.height - 100  # Aim for protected zone
         
         self.enemy_drones.append(enemy)
-        print(f"🚀 Enemy {enemy.id} spawned at ({x}, {y}) - Target: ({enemy.target_x}, {enemy.target_y})")
+        self.population += 1
+        self.metrics.on_spawn(enemy, self.frame_count)
+        self.log(f"🚀 Enemy {enemy.name} spawned at ({x}, {y}) - Target: ({enemy.target_x}, {enemy.target_y})")
 
     def process_spawn_queue(self):
         """Process scheduled enemy spawns."""
@@ -144,15 +269,16 @@ class AegisSimulation:
         """Activate breach response protocol across all friendly drones."""
         self.breach_response_active = True
         self.consecutive_breaches += 1
+        self.decisions.append(("breach_response", self.consecutive_breaches))
         
-        print(f"🚨 ACTIVATING BREACH RESPONSE PROTOCOL (Breach #{self.consecutive_breaches})")
+        self.log(f"🚨 ACTIVATING BREACH RESPONSE PROTOCOL (Breach #{self.consecutive_breaches})")
         
         # Tactical reset - clear all assignments and activate response
         for friendly in self.friendly_drones:
             if friendly.health > 0:
                 friendly.activate_breach_response(duration=180)
                 friendly.assigned_target = None
-                friendly.current_bids = {}
+                friendly.clear_bids()
 
     def check_last_line_defense(self):
         """Check if any enemies have crossed the last defense line."""
@@ -163,6 +289,7 @@ class AegisSimulation:
                 critical_enemies.append(enemy)
         
         if critical_enemies:
+            self.decisions.append(("last_line_defense", [e.id for e in critical_enemies]))
             # Find closest friendly for each critical enemy
             for critical_enemy in critical_enemies:
                 closest_friendly = None
@@ -180,79 +307,61 @@ class AegisSimulation:
                     closest_friendly.assigned_target = critical_enemy.id
                     closest_friendly.target_x = critical_enemy.x
                     closest_friendly.target_y = critical_enemy.y
-                    closest_friendly.role = "LAST DEFENSE"
+                    closest_friendly.role = Role.LAST_DEFENSE
                     closest_friendly.breach_response_mode = True
                     closest_friendly.breach_response_timer = 120
                     
-                    print(f"🛡️ LAST DEFENSE: {closest_friendly.id} engaging {critical_enemy.id} at Y={critical_enemy.y:.0f}")
+                    self.log(f"🛡️ LAST DEFENSE: {closest_friendly.name} engaging {critical_enemy.name} at Y={critical_enemy.y:.0f}")
 
     def maintain_force_balance(self):
         if self.auto_spawn:
             current_ratio = len(self.friendly_drones) / max(1, len(self.enemy_drones))
             
             if current_ratio < self.min_friendly_ratio and len(self.friendly_drones) < 20:
-                new_friendly = Drone(
-                    random.randint(200, self.width - 200),
-                    random.randint(400, 600),
+                new_friendly = self.pool.acquire(
+                    self.rng.randint(200, self.width - 200),
+                    self.rng.randint(self.layout_y(400), self.layout_y(600)),
                     "friendly", 
-                    f"F{len(self.friendly_drones)}"
+                    self.allocate_friendly_id()
                 )
                 self.friendly_drones.append(new_friendly)
-
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.running = False
-                elif event.key == pygame.K_r:
-                    self.reset_simulation()
-                elif event.key == pygame.K_SPACE:
-                    self.add_enemy_drones(3)  # Staggered spawn
-                elif event.key == pygame.K_a:
-                    self.aegis_active = not self.aegis_active
-                    status = "ACTIVE" if self.aegis_active else "STANDBY"
-                    self.on_aegis_toggle()
-                    print(f"Aegis Protocol: {status}")
-                elif event.key == pygame.K_d:
-                    self.show_debug = not self.show_debug
-                    print(f"Debug View: {'ON' if self.show_debug else 'OFF'}")
-                elif event.key == pygame.K_t:
-                    self.show_roles = not self.show_roles
-                    print(f"Role Display: {'ON' if self.show_roles else 'OFF'}")
+                self.population += 1
+                self.metrics.on_spawn(new_friendly, self.frame_count)
 
     def on_aegis_toggle(self):
         """Handle AEGIS system toggle with visual and behavioral changes."""
+        if self.lod is not None:
+            self.lod.wake_all(self)
+        
         if self.aegis_active:
             # Reactivate AEGIS - clear assignments and reset behavior
             for friendly in self.friendly_drones:
                 if friendly.health > 0:
                     friendly.assigned_target = None
-                    friendly.current_bids = {}
-                    friendly.role = "Patrol"
+                    friendly.clear_bids()
+                    friendly.role = Role.PATROL
         else:
             # Deactivate AEGIS - stop all coordinated behavior
             for friendly in self.friendly_drones:
                 if friendly.health > 0:
                     friendly.assigned_target = None
-                    friendly.current_bids = {}
-                    friendly.role = "DISABLED"
+                    friendly.clear_bids()
+                    friendly.role = Role.DISABLED
                     # Set random patrol points to simulate disorganization
                     friendly.patrol_point = (
-                        random.randint(200, self.width - 200),
-                        random.randint(300, 600)
+                        self.rng.randint(200, self.width - 200),
+                        self.rng.randint(self.layout_y(300), self.layout_y(600))
                     )
 
     def add_enemy_drones(self, count):
         """Enhanced enemy deployment with staggered spawning."""
-        print(f"🚀 DEPLOYING {count} HOSTILES WITH STAGGERED SPAWNING")
+        self.log(f"🚀 DEPLOYING {count} HOSTILES WITH STAGGERED SPAWNING")
         
         # Clear all assignments to ensure proper response to new threats
         for friendly in self.friendly_drones:
             if friendly.health > 0 and self.aegis_active:
                 friendly.assigned_target = None
-                friendly.current_bids = {}
+                friendly.clear_bids()
         
         # Schedule staggered spawns
         base_index = len(self.enemy_drones)
@@ -271,12 +380,36 @@ class AegisSimulation:
         self.consecutive_breaches = 0
         self.spawn_queue = []
         self.initialize_balanced_forces()
-        print("Simulation reset with enhanced tactical protocols")
+        self.log("Simulation reset with enhanced tactical protocols")
+
+    def reset(self, seed=None):
+        """Start a new episode from frame 0, as if freshly constructed.
+
+        reset_simulation() restarts the engagement but keeps the clock
+        running; this also zeroes every per-episode clock (frame count and
+        remainder, breach and spawn timers), drops pending decisions and
+        contact predictions, and resets the optional components that carry
+        state between frames. seed reseeds the simulation's random stream.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.frame_count = 0
+        self.frame_remainder = 0.0
+        self.last_breach_frame = 0
+        self.enemy_spawn_timer = 0
+        self.decisions = []
+        self.due_breaches = None
+        self.contact_schedule.reset()
+        for component in (self.protocol_scheduler, self.lod, self.squad_coordinator):
+            if component is not None:
+                component.reset()
+        self.reset_simulation()
 
     def run_aegis_protocol(self):
         if not self.aegis_active:
             # Disorganized behavior when AEGIS is off
             self.run_disorganized_behavior()
+            self.metrics.isolated_threats = self.count_isolated_threats()
             return
             
         self.cleanup_destroyed_drones()
@@ -284,6 +417,13 @@ class AegisSimulation:
         if self.check_mission_complete():
             return
         
+        if self.steady_state:
+            # Room for a bid on every enemy (next power of two), so auctions
+            # stop growing bid storage once the wave is in
+            capacity = 1 << max(0, len(self.enemy_drones) - 1).bit_length()
+            for friendly in self.friendly_drones:
+                friendly.reserve_bids(capacity)
+        
         # Check last line of defense before regular protocol
         self.check_last_line_defense()
         
@@ -293,31 +433,60 @@ class AegisSimulation:
                 friendly.validate_assigned_target(self.enemy_drones)
                 friendly.update_breach_response()
         
+        if self.threat_clusters is not None:
+            self.threat_clusters.update(self.enemy_drones)
+        
         # Detect isolated high-priority threats before auction
         self.identify_priority_threats()
         
-        # Run auction protocol
+        if self.squad_coordinator is not None:
+            self.squad_coordinator.run(self)
+        elif self.threat_clusters is not None:
+            self.threat_clusters.run_auction(self)
+        else:
+            self.run_flat_auction()
+        
+        for hook in self.protocol_hooks:
+            hook(self)
+
+    def run_flat_auction(self):
+        """Auction, resolve and assign across the whole swarm."""
+        if self.bid_kernel is not None:
+            self.bid_kernel.run_auction(self)
+            return
+        metrics = self.metrics
+        started = time.perf_counter()
+        scans = Drone.peer_scans
+        # Sleeping LOD drones have nothing in range
         for friendly in self.friendly_drones:
-            if friendly.health > 0 and friendly.role != "LAST DEFENSE":
+            if friendly.health > 0 and friendly.role != Role.LAST_DEFENSE and friendly.lod != LOD_ASLEEP:
                 friendly.participate_in_auction(self.enemy_drones, self.friendly_drones)
-                self.total_bids += len(friendly.current_bids)
+                self.total_bids += friendly.bid_count
+                metrics.on_bids(friendly.bid_count)
+        auctioned = time.perf_counter()
         
         for friendly in self.friendly_drones:
-            if friendly.health > 0 and friendly.role != "LAST DEFENSE":
+            if friendly.health > 0 and friendly.role != Role.LAST_DEFENSE:
                 friendly.resolve_auctions(self.friendly_drones)
+        resolved = time.perf_counter()
         
         for friendly in self.friendly_drones:
-            if friendly.health > 0:
+            if friendly.health > 0 and friendly.lod != LOD_ASLEEP:
                 friendly.execute_assignment(self.enemy_drones, self.friendly_drones)
+                metrics.on_assignment(friendly)
+        metrics.on_coordination(Drone.peer_scans - scans)
+        metrics.add_stage_time("auction", auctioned - started)
+        metrics.add_stage_time("resolve", resolved - auctioned)
+        metrics.add_stage_time("assign", time.perf_counter() - resolved)
 
     def run_disorganized_behavior(self):
         """Simple disorganized behavior when AEGIS is disabled."""
         for friendly in self.friendly_drones:
             if friendly.health > 0 and not friendly.is_destroyed:
                 # Basic random patrol behavior
-                if random.random() < 0.02:  # Occasionally change direction
-                    friendly.target_x = friendly.patrol_point[0] + random.uniform(-100, 100)
-                    friendly.target_y = friendly.patrol_point[1] + random.uniform(-50, 50)
+                if self.rng.random() < 0.02:  # Occasionally change direction
+                    friendly.target_x = friendly.patrol_point[0] + self.rng.uniform(-100, 100)
+                    friendly.target_y = friendly.patrol_point[1] + self.rng.uniform(-50, 50)
                 
                 # Constrain to reasonable area
                 friendly.target_x = max(100, min(self.width - 100, friendly.target_x))
@@ -328,58 +497,83 @@ class AegisSimulation:
     def identify_priority_threats(self):
         """Identify isolated threats that need immediate attention."""
         high_priority_threats = []
+        candidates = self.enemy_drones
+        if self.threat_clusters is not None:
+            candidates = self.threat_clusters.isolation_candidates(self.friendly_drones)
         
-        for enemy in self.enemy_drones:
-            if enemy.health > 0 and enemy.y > 400:  # Threats getting close to zone
+        for enemy in candidates:
+            if enemy.health > 0 and enemy.y > self.height - 400:  # Threats getting close to zone
                 covering_friendlies = 0
                 for friendly in self.friendly_drones:
-                    if (friendly.health > 0 and 
-                        friendly.distance_to(enemy) <= friendly.sensor_range):
+                    if friendly.health > 0 and friendly.can_see(enemy):
                         covering_friendlies += 1
                 
-                if covering_friendlies <= 1 and enemy.y > 450:
+                if covering_friendlies <= 1 and enemy.y > self.height - 350:
                     high_priority_threats.append(enemy)
         
+        self.metrics.isolated_threats = len(high_priority_threats)
+        
         if high_priority_threats and not self.breach_response_active:
-            print(f"⚠️  DETECTED {len(high_priority_threats)} ISOLATED HIGH-PRIORITY THREATS")
+            self.log(f"⚠️  DETECTED {len(high_priority_threats)} ISOLATED HIGH-PRIORITY THREATS")
             for friendly in self.friendly_drones[:min(3, len(self.friendly_drones))]:
                 if friendly.health > 0:
                     friendly.activate_breach_response(duration=90)
 
     def cleanup_destroyed_drones(self):
-        alive_enemies = [e for e in self.enemy_drones if e.health > 0 and not e.is_destroyed]
-        destroyed_enemies = len(self.enemy_drones) - len(alive_enemies)
-        if destroyed_enemies > 0:
-            self.enemy_drones = alive_enemies
-        
-        alive_friendlies = [f for f in self.friendly_drones if f.health > 0 and not f.is_destroyed]
-        destroyed_friendlies = len(self.friendly_drones) - len(alive_friendlies)
+        """Remove destroyed drones in place and recycle them."""
+        removed = []
+        compact_alive(self.enemy_drones, self.pool, removed)
+        
+        destroyed_friendlies = compact_alive(self.friendly_drones, self.pool)
+        if removed or destroyed_friendlies:
+            self.population += 1
+        if removed:
+            # Recycled enemies come back under new ids: drop references to them
+            removed = set(removed)
+            for friendly in self.friendly_drones:
+                if friendly.bid_count:
+                    friendly.drop_bids(removed)
+                if friendly.target_enemy in removed:
+                    friendly.target_enemy = None
+        # Lists now hold live drones only: resync the running alive counts
+        self.metrics.resync(len(self.friendly_drones), len(self.enemy_drones))
         if destroyed_friendlies > 0:
-            self.friendly_drones = alive_friendlies
             self.friendly_losses += destroyed_friendlies
-            if destroyed_friendlies > 0:
-                print(f"💥 CASUALTY REPORT: {destroyed_friendlies} friendly drones lost")
+            self.log(f"💥 CASUALTY REPORT: {destroyed_friendlies} friendly drones lost")
+
+    def all_drones(self):
+        """Iterate friendlies then enemies without building a combined list."""
+        return chain(self.friendly_drones, self.enemy_drones)
 
     def check_mission_complete(self):
-        active_enemies = len([e for e in self.enemy_drones if e.health > 0])
-        active_friendlies = len([f for f in self.friendly_drones if f.health > 0])
+        active_enemies = count_alive(self.enemy_drones)
+        active_friendlies = count_alive(self.friendly_drones)
         
         if active_enemies == 0 and len(self.spawn_queue) == 0 and not self.mission_complete:
             self.mission_complete = True
             self.breach_response_active = False
-            print("🎉 MISSION ACCOMPLISHED! All enemies neutralized!")
+            self.log("🎉 MISSION ACCOMPLISHED! All enemies neutralized!")
             return True
             
         if active_friendlies == 0 and not self.mission_complete:
             self.mission_complete = True
             self.breach_response_active = False
-            print("💀 MISSION FAILED! All friendly drones lost!")
+            self.log("💀 MISSION FAILED! All friendly drones lost!")
             return True
             
         return False
 
-    def update(self):
-        self.frame_count += 1
+    def update(self, dt=None):
+        """Advance the simulation by dt seconds (default self.dt)."""
+        dt = self.dt if dt is None else dt
+        profiler = self.alloc_profiler
+        if profiler is not None:
+            profiler.begin_tick()
+        elapsed = self.frame_remainder + dt / REFERENCE_DT
+        whole = int(elapsed)
+        self.frame_remainder = elapsed - whole
+        previous_frame = self.frame_count
+        self.frame_count += whole
         
         self.process_spawn_queue()  # Handle staggered spawning
         self.maintain_force_balance()
@@ -389,298 +583,164 @@ class AegisSimulation:
             self.breach_response_active = False
             self.consecutive_breaches = 0
         
-        if self.frame_count % 8 == 0 and not self.mission_complete:
-            self.run_aegis_protocol()
+        # Protocol cadence is every 8 reference frames of simulated time
+        if self.lod is not None and self.aegis_active and not self.mission_complete:
+            self.lod.update(self)
         
-        for drone in self.friendly_drones + self.enemy_drones:
-            if drone.health > 0 and not drone.is_destroyed:
-                drone.move(self.width, self.height)
+        protocol_tick = self.frame_count // 8 != previous_frame // 8
+        if profiler is not None:
+            profiler.mark("spawn")
+        started = time.perf_counter()
+        if self.world is not None and protocol_tick:
+            self.world.update_sight(self.friendly_drones, self.enemy_drones)
+        if not self.mission_complete:
+            if self.protocol_scheduler is not None and self.aegis_active:
+                self.protocol_scheduler.run(self, protocol_tick)
+            elif protocol_tick:
+                self.run_aegis_protocol()
+        protocol_done = time.perf_counter()
+        if profiler is not None:
+            profiler.mark("protocol")
+        
+        if self.navigation is not None:
+            self.navigation.update(self)
+        self.integrator.begin_step()
+        for drone in self.all_drones():
+            if drone.health > 0 and not drone.is_destroyed and drone.lod != LOD_ASLEEP:
+                drone.move(self.width, self.height, dt=dt, integrator=self.integrator)
+        moved = time.perf_counter()
+        if profiler is not None:
+            profiler.mark("movement")
         
         if not self.mission_complete:
             self.check_engagements()
             self.check_breaches()
+        if profiler is not None:
+            profiler.mark("engagement")
+        
+        metrics = self.metrics
+        metrics.add_stage_time("protocol", protocol_done - started)
+        metrics.add_stage_time("movement", moved - protocol_done)
+        metrics.add_stage_time("engagement", time.perf_counter() - moved)
+        metrics.sample(self.frame_count)
+        
+        if self.decisions:
+            for hook in self.decision_hooks:
+                hook(self, self.decisions)
+            self.decisions = []
+        if profiler is not None:
+            profiler.mark("bookkeeping")
+            profiler.end_tick(self.frame_count)
 
     def check_engagements(self):
+        """Resolve pursuer/target contacts over this frame's motion."""
         engagements = []
         
-        for friendly in self.friendly_drones:
-            if friendly.health > 0 and friendly.assigned_target and friendly.ammo > 0:
+        if self.engagement_mode == "discrete":
+            for friendly in self.friendly_drones:
+                if friendly.health > 0 and friendly.assigned_target is not None and friendly.ammo > 0:
+                    for enemy in self.enemy_drones:
+                        if enemy.health > 0 and enemy.id == friendly.assigned_target:
+                            if friendly.distance_to(enemy) <= friendly.engagement_range:
+                                engagements.append((1.0, friendly, enemy))
+                            break
+        elif self.engagement_mode == "event":
+            self.contact_schedule.reuse = self.steady_state
+            engagements, self.due_breaches = self.contact_schedule.due(self, self.height - 170)
+        else:
+            # Swept test: catches contacts a coarse timestep would step over
+            if self.steady_state:
+                pursuers, targets = self._pursuers, self._targets
+                pursuers.clear()
+                targets.clear()
+            else:
+                pursuers, targets = [], []
+            for friendly in self.friendly_drones:
+                if friendly.health > 0 and friendly.assigned_target is not None and friendly.ammo > 0:
+                    pursuers.append(friendly)
+            if pursuers:
                 for enemy in self.enemy_drones:
-                    if enemy.health > 0 and enemy.id == friendly.assigned_target:
-                        engagement_distance = friendly.distance_to(enemy)
-                        
-                        if engagement_distance <= friendly.engagement_range:
-                            engagements.append((friendly, enemy))
-                            if random.random() < 0.1:
-                                friendly.take_damage(20)
-                                if friendly.health <= 0:
-                                    print(f"💥 FRIENDLY LOST: {friendly.id} destroyed in combat")
-                        break
-        
-        for friendly, enemy in engagements:
-            if enemy in self.enemy_drones and enemy.health > 0:
+                    if enemy.health > 0:
+                        targets.append(enemy)
+                self.engagement_detector.reuse = self.steady_state
+                engagements = self.engagement_detector.detect(pursuers, targets)
+        
+        for contact_time, friendly, enemy in engagements:
+            if self.rng.random() < 0.1:
+                friendly.take_damage(20)
+                if friendly.health <= 0:
+                    self.metrics.on_friendly_lost(friendly)
+                    self.log(f"💥 FRIENDLY LOST: {friendly.name} destroyed in combat")
+        
+        for contact_time, friendly, enemy in engagements:
+            if enemy.health > 0:
                 enemy.health = 0
                 friendly.ammo -= 1
                 friendly.neutralized_count += 1
                 friendly.assigned_target = None
                 self.enemies_neutralized += 1
                 self.successful_engagements += 1
+                self.metrics.on_neutralized(enemy, self.frame_count)
                 
-                print(f"✅ {friendly.role}: {friendly.id} eliminated {enemy.id}")
+                self.log(f"✅ {friendly.role.label}: {friendly.name} eliminated {enemy.name} (t={contact_time:.2f})")
 
     def check_breaches(self):
-        breaches = []
+        if self.steady_state:
+            breaches = self._breaches
+            breaches.clear()
+        else:
+            breaches = []
         
-        for enemy in self.enemy_drones:
+        # Event mode only looks at enemies whose time-to-breach came due
+        candidates = self.enemy_drones
+        if self.engagement_mode == "event" and self.due_breaches is not None:
+            candidates, self.due_breaches = self.due_breaches, None
+        for enemy in candidates:
             if enemy.health > 0 and enemy.y >= self.height - 170:  # Adjusted for new zone size
                 breaches.append(enemy)
                 self.enemies_breached += 1
+                self.metrics.on_breach(enemy)
                 self.last_breach_frame = self.frame_count
                 
                 if not self.breach_response_active:
                     self.activate_breach_response()
                 
-                print(f"🚨 CRITICAL BREACH: {enemy.id} reached protected zone!")
+                self.log(f"🚨 CRITICAL BREACH: {enemy.name} reached protected zone!")
         
         for enemy in breaches:
             enemy.health = 0
 
-    def render(self):
-        """Enhanced rendering with larger display area."""
-        self.screen.fill(self.DARK_BLUE)
-        
-        # Grid lines removed for cleaner look
-        self.draw_protected_zone()
-        
-        role_font = pygame.font.Font(None, 16)
-        for drone in self.friendly_drones + self.enemy_drones:
-            drone.draw(self.screen, self.aegis_active)
-            if self.show_roles and drone.drone_type == "friendly" and drone.health > 0:
-                drone.draw_role_text(self.screen, role_font)
-        
-        if self.show_debug and self.aegis_active:  # Only show debug when AEGIS is active
-            self.draw_debug_info()
-        
-        self.draw_clean_hud()
-        
-        # Last defense line visualization
-        pygame.draw.line(self.screen, (255, 50, 50), 
-                        (0, self.last_line_defense_y), 
-                        (self.width, self.last_line_defense_y), 2)
-        
-        if self.frame_count - self.last_breach_frame < 180:
-            self.draw_breach_alert()
-        
-        if self.mission_complete:
-            self.draw_mission_status()
-        
-        pygame.display.flip()
-
-    def draw_protected_zone(self):
-        """Draw protected zone with military styling."""
-        pygame.draw.rect(self.screen, self.ZONE_COLOR, self.protected_zone)
-        pygame.draw.rect(self.screen, (0, 200, 0), self.protected_zone, 3)
-        
-        # Zone pattern
-        for i in range(0, self.width, 60):
-            pygame.draw.line(self.screen, (0, 120, 0), 
-                           (i, self.height - 150), (i, self.height), 1)
-
-    def draw_clean_hud(self):
-        """HUD adjusted for larger screen."""
-        self.draw_panel(20, 20, 350, 240, "TACTICAL OVERVIEW")
-        self.draw_panel(self.width - 310, 20, 290, 200, "SYSTEMS STATUS")
-        self.draw_panel(20, self.height - 180, 400, 160, "COMMAND CONTROLS")
-
-    def draw_panel(self, x, y, width, height, title):
-        panel_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-        panel_surface.fill(self.PANEL_BG)
-        self.screen.blit(panel_surface, (x, y))
-        
-        pygame.draw.rect(self.screen, self.HUD_COLOR, (x, y, width, height), 2)
-        
-        title_bg = pygame.Surface((width, 25), pygame.SRCALPHA)
-        title_bg.fill((0, 0, 0, 150))
-        self.screen.blit(title_bg, (x, y))
-        
-        title_font = pygame.font.Font(None, 22)
-        title_text = title_font.render(title, True, self.HUD_COLOR)
-        title_rect = title_text.get_rect(center=(x + width//2, y + 12))
-        self.screen.blit(title_text, title_rect)
-        
-        if title == "TACTICAL OVERVIEW":
-            self.draw_tactical_overview(x + 15, y + 35)
-        elif title == "SYSTEMS STATUS":
-            self.draw_systems_status(x + 15, y + 35)
-        elif title == "COMMAND CONTROLS":
-            self.draw_controls_status(x + 15, y + 35)
-
-    def draw_tactical_overview(self, x, y):
-        font = pygame.font.Font(None, 20)
-        
-        active_friendlies = len([f for f in self.friendly_drones if f.health > 0])
-        active_enemies = len([e for e in self.enemy_drones if e.health > 0])
-        success_rate = self.get_success_rate()
-        
-        status_lines = [
-            f"FRIENDLY FORCES: {active_friendlies}",
-            f"HOSTILE CONTACTS: {active_enemies}",
-            f"SPAWN QUEUE: {len(self.spawn_queue)}",
-            f"TARGETS NEUTRALIZED: {self.enemies_neutralized}",
-            f"SECURITY BREACHES: {self.enemies_breached}",
-            f"MISSION SUCCESS: {success_rate:.1f}%",
-            f"FRIENDLY LOSSES: {self.friendly_losses}",
-            f"LAST DEFENSE: ACTIVE",
-            f"AEGIS PROTOCOL: {'ACTIVE' if self.aegis_active else 'STANDBY'}"
-        ]
-        
-        for i, line in enumerate(status_lines):
-            color = self.TEXT_COLOR
-            if "BREACHES" in line and self.enemies_breached > 0:
-                color = self.WARNING_COLOR
-            elif "SUCCESS" in line:
-                color = self.SUCCESS_COLOR if success_rate > 90 else self.TEXT_COLOR
-            elif "LOSSES" in line and self.friendly_losses > 0:
-                color = self.WARNING_COLOR
-            elif "LAST DEFENSE" in line:
-                color = self.WARNING_COLOR
-            
-            text = font.render(line, True, color)
-            self.screen.blit(text, (x, y + i * 22))
-
-    def draw_systems_status(self, x, y):
-        font = pygame.font.Font(None, 20)
-        
-        systems_lines = [
-            f"AEGIS PROTOCOL: {'ONLINE' if self.aegis_active else 'OFFLINE'}",
-            f"BIDDING SYSTEM: {self.total_bids}",
-            f"SENSOR NETWORK: {'ACTIVE' if self.aegis_active else 'OFFLINE'}",
-            f"TACTICAL STATUS: {'NOMINAL' if not self.breach_response_active else 'BREACH RESPONSE'}",
-            f"ISOLATED THREATS: {self.count_isolated_threats()}",
-            f"STAGGERED SPAWN: ACTIVE",
-            f"MISSION TIME: {self.frame_count//60}s"
-        ]
-        
-        for i, line in enumerate(systems_lines):
-            color = self.SUCCESS_COLOR if "ONLINE" in line or "ACTIVE" in line else self.WARNING_COLOR if "OFFLINE" in line else self.TEXT_COLOR
-            text = font.render(line, True, color)
-            self.screen.blit(text, (x, y + i * 22))
-
     def count_isolated_threats(self):
         count = 0
         for enemy in self.enemy_drones:
-            if enemy.health > 0 and enemy.y > 450:
+            if enemy.health > 0 and enemy.y > self.height - 350:
                 covering_friendlies = 0
                 for friendly in self.friendly_drones:
-                    if (friendly.health > 0 and 
-                        friendly.distance_to(enemy) <= friendly.sensor_range):
+                    if friendly.health > 0 and friendly.can_see(enemy):
                         covering_friendlies += 1
                 if covering_friendlies <= 1:
                     count += 1
         return count
 
-    def draw_controls_status(self, x, y):
-        font = pygame.font.Font(None, 18)
-        
-        controls = [
-            "T - TOGGLE ROLE DISPLAY",
-            "A - TOGGLE AEGIS PROTOCOL", 
-            "D - TOGGLE SENSOR VIEW",
-            "SPACE - DEPLOY HOSTILES",
-            "R - RESET MISSION",
-            "ESC - EXIT SIMULATION",
-            "",
-            "AEGIS OFF: Drones disorganized",
-            "AEGIS ON: Auction system active"
-        ]
-        
-        for i, line in enumerate(controls):
-            color = self.WARNING_COLOR if "AEGIS OFF" in line else self.SUCCESS_COLOR if "AEGIS ON" in line else self.TEXT_COLOR
-            text = font.render(line, True, color)
-            self.screen.blit(text, (x, y + i * 20))
-
-    def draw_breach_alert(self):
-        alert_font = pygame.font.Font(None, 36)
-        status_font = pygame.font.Font(None, 24)
-        
-        if self.breach_response_active:
-            alert_text = alert_font.render("BREACH RESPONSE ACTIVE", True, self.WARNING_COLOR)
-            status_text = status_font.render("Last defense protocol engaged", True, self.TEXT_COLOR)
-        else:
-            alert_text = alert_font.render("SECURITY BREACH DETECTED", True, self.WARNING_COLOR)
-            status_text = status_font.render("Tactical response initiated", True, self.TEXT_COLOR)
-        
-        alert_rect = alert_text.get_rect(center=(self.width//2, 30))
-        status_rect = status_text.get_rect(center=(self.width//2, 60))
-        
-        if (self.frame_count // 10) % 2 == 0 or self.breach_response_active:
-            self.screen.blit(alert_text, alert_rect)
-            self.screen.blit(status_text, status_rect)
-
-    def draw_mission_status(self):
-        mission_font = pygame.font.Font(None, 48)
-        subtitle_font = pygame.font.Font(None, 24)
-        
-        active_enemies = len([e for e in self.enemy_drones if e.health > 0])
-        
-        if active_enemies == 0 and len(self.spawn_queue) == 0:
-            text = mission_font.render("MISSION ACCOMPLISHED", True, self.SUCCESS_COLOR)
-            subtitle = subtitle_font.render("All hostile targets neutralized", True, self.TEXT_COLOR)
-        else:
-            text = mission_font.render("MISSION FAILED", True, self.WARNING_COLOR)
-            subtitle = subtitle_font.render("Friendly forces eliminated", True, self.TEXT_COLOR)
-        
-        text_rect = text.get_rect(center=(self.width//2, self.height//2 - 30))
-        subtitle_rect = subtitle.get_rect(center=(self.width//2, self.height//2 + 20))
-        
-        bg_rect = text_rect.union(subtitle_rect).inflate(40, 40)
-        bg_surface = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, 200))
-        self.screen.blit(bg_surface, bg_rect)
-        pygame.draw.rect(self.screen, self.HUD_COLOR, bg_rect, 3)
-        
-        self.screen.blit(text, text_rect)
-        self.screen.blit(subtitle, subtitle_rect)
-
-    def draw_debug_info(self):
-        """Draw debug information only when AEGIS is active."""
-        debug_font = pygame.font.Font(None, 16)
-        
-        for friendly in self.friendly_drones:
-            if friendly.health <= 0:
-                continue
-                
-            # Sensor range (visible only when AEGIS is active)
-            pygame.draw.circle(self.screen, (80, 80, 120, 50), 
-                             (int(friendly.x), int(friendly.y)), friendly.sensor_range, 1)
-            
-            # Bid connections
-            for enemy_id, bid_info in friendly.current_bids.items():
-                enemy = bid_info['enemy']
-                if enemy.health > 0:
-                    bid_value = bid_info['bid_value']
-                    if bid_value < 50:
-                        color = (0, 200, 0)  # Green
-                    elif bid_value < 100:
-                        color = (200, 200, 0)  # Yellow
-                    else:
-                        color = (200, 100, 0)  # Orange
-                    
-                    pygame.draw.line(self.screen, color,
-                                   (friendly.x, friendly.y), (enemy.x, enemy.y), 1)
-
     def get_success_rate(self):
         total_engagements = self.enemies_neutralized + self.enemies_breached
         if total_engagements == 0:
             return 100.0
         return (self.enemies_neutralized / total_engagements) * 100
 
-    def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(60)
-        
-        pygame.quit()
-        sys.exit()
\ No newline at end of file
+    # Display: delegated to simulation.rendering, imported on first use
+    
+    def render(self):
+        from simulation.rendering import render
+        render(self)
+
+    def handle_events(self):
+        from simulation.rendering import handle_events
+        handle_events(self)
+
+    def run(self, threaded=False):
+        """Interactive loop; threaded steps the simulation on a worker thread."""
+        if self.headless:
+            raise RuntimeError("run() needs a display; drive a headless simulation with update()")
+        from simulation.rendering import run_interactive
+        run_interactive(self, threaded)
@@ -0,0 +1,202 @@
+"""
+Array snapshots of simulation state.
+
+A Snapshot holds one frame of drone state as parallel NumPy arrays ordered
+by a stream-stable integer handle, plus the scalar counters the HUD shows.
+Snapshots are what the streaming encoder consumes and the decoder
+produces; apply_to() turns one back into Drone objects on a viewer
+simulation so the regular render() path can draw it.
+"""
+
+import numpy as np
+
+from simulation.models.drone import Drone, Role
+
+KIND_FRIENDLY = 0
+KIND_ENEMY = 1
+
+DRONE_FIELDS = (
+    ("handle", np.uint32),
+    ("kind", np.uint8),
+    ("x", np.float32),
+    ("y", np.float32),
+    ("vx", np.float32),
+    ("vy", np.float32),
+    ("health", np.uint8),
+    ("ammo", np.uint8),
+    ("role", np.uint8),
+    ("target", np.uint32),  # handle of the assigned enemy, 0 when unassigned
+    ("breach", np.uint8),
+    ("breach_timer", np.int16),
+    ("destroyed", np.uint8),
+)
+
+GLOBAL_FIELDS = (
+    "frame_count",
+    "enemies_neutralized",
+    "enemies_breached",
+    "friendly_losses",
+    "total_bids",
+    "spawn_queue",
+    "last_breach_frame",
+    "aegis_active",
+    "mission_complete",
+    "breach_response_active",
+    "world_width",
+    "world_height",
+)
+
+
+class Snapshot:
+    """One frame of state: drone arrays sorted by handle plus globals."""
+
+    def __init__(self, arrays, globals_):
+        self.arrays = arrays
+        self.globals = globals_
+
+    @classmethod
+    def empty(cls, count=0):
+        return cls({name: np.zeros(count, dtype=dtype) for name, dtype in DRONE_FIELDS},
+                   dict.fromkeys(GLOBAL_FIELDS, 0))
+
+    def __len__(self):
+        return len(self.arrays["handle"])
+
+    @property
+    def frame(self):
+        return self.globals["frame_count"]
+
+    def apply_to(self, sim, cache=None):
+        """Materialize this snapshot as the drone lists of a viewer simulation.
+
+        cache maps handle -> Drone and is reused between frames so drawing a
+        stream does not allocate a new Drone per drone per frame.
+        """
+        cache = {} if cache is None else cache
+        a = self.arrays
+        friendlies, enemies = [], []
+        live = set()
+        changed = False  # drones created or dropped: the viewer's population changed
+        for i in range(len(self)):
+            handle = int(a["handle"][i])
+            live.add(handle)
+            kind = "friendly" if a["kind"][i] == KIND_FRIENDLY else "enemy"
+            drone = cache.get(handle)
+            if drone is None or drone.drone_type != kind:
+                drone = Drone(0.0, 0.0, kind, handle)
+                cache[handle] = drone
+                changed = True
+            drone.x = float(a["x"][i])
+            drone.y = float(a["y"][i])
+            drone.velocity_x = float(a["vx"][i])
+            drone.velocity_y = float(a["vy"][i])
+            drone.health = int(a["health"][i])
+            drone.ammo = int(a["ammo"][i])
+            drone.role = Role(int(a["role"][i]))
+            drone.assigned_target = int(a["target"][i]) or None
+            drone.breach_response_mode = bool(a["breach"][i])
+            drone.breach_response_timer = int(a["breach_timer"][i])
+            drone.is_destroyed = False
+            if a["destroyed"][i]:
+                drone.take_damage(drone.health)
+                drone.is_destroyed = True
+            (friendlies if kind == "friendly" else enemies).append(drone)
+        for handle in [h for h in cache if h not in live]:
+            del cache[handle]
+            changed = True
+
+        sim.friendly_drones = friendlies
+        sim.enemy_drones = enemies
+        if changed:
+            sim.population += 1
+        g = self.globals
+        
+        # Feed the viewer's metrics from the stream so its HUD trends work
+        metrics = sim.metrics
+        metrics.resync(sum(1 for d in friendlies if d.health > 0), sum(1 for d in enemies if d.health > 0))
+        metrics.isolated_threats = sim.count_isolated_threats()
+        metrics.on_bids(max(0, int(g["total_bids"]) - sim.total_bids))
+        sim.frame_count = int(g["frame_count"])
+        sim.enemies_neutralized = int(g["enemies_neutralized"])
+        sim.enemies_breached = int(g["enemies_breached"])
+        sim.friendly_losses = int(g["friendly_losses"])
+        sim.total_bids = int(g["total_bids"])
+        sim.spawn_queue = [None] * int(g["spawn_queue"])
+        sim.last_breach_frame = int(g["last_breach_frame"])
+        sim.aegis_active = bool(g["aegis_active"])
+        sim.mission_complete = bool(g["mission_complete"])
+        sim.breach_response_active = bool(g["breach_response_active"])
+        metrics.sample(sim.frame_count)
+        return cache
+
+
+class HandleTable:
+    """Assigns stable non-zero integer handles to live drones.
+
+    Keyed by (type, id) rather than object identity because pooled Drone
+    objects are reused for new drones.
+    """
+
+    def __init__(self):
+        self.handles = {}
+        self.next_handle = 1
+
+    def handle_for(self, drone):
+        key = (drone.drone_type, drone.id)
+        handle = self.handles.get(key)
+        if handle is None:
+            handle = self.next_handle
+            self.next_handle += 1
+            self.handles[key] = handle
+        return handle
+
+    def prune(self, drones):
+        live = {(d.drone_type, d.id) for d in drones}
+        if len(self.handles) != len(live) or any(key not in live for key in self.handles):
+            self.handles = {key: h for key, h in self.handles.items() if key in live}
+
+
+def capture_snapshot(sim, handles):
+    """Copy the simulation's current drone state into a Snapshot."""
+    drones = list(sim.all_drones())
+    handles.prune(drones)
+    by_id = {}
+    for enemy in sim.enemy_drones:
+        by_id[enemy.id] = handles.handle_for(enemy)
+
+    rows = []
+    for drone in drones:
+        rows.append((
+            handles.handle_for(drone),
+            KIND_FRIENDLY if drone.drone_type == "friendly" else KIND_ENEMY,
+            drone.x, drone.y, drone.velocity_x, drone.velocity_y,
+            max(0, min(255, int(drone.health))),
+            max(0, min(255, int(drone.ammo))),
+            int(drone.role),
+            by_id.get(drone.assigned_target, 0),
+            1 if drone.breach_response_mode else 0,
+            max(-32768, min(32767, int(drone.breach_response_timer))),
+            1 if drone.is_destroyed else 0,
+        ))
+
+    snapshot = Snapshot.empty(len(rows))
+    if rows:
+        table = np.array(rows, dtype=np.float64)
+        order = np.argsort(table[:, 0], kind="stable")
+        for column, (name, dtype) in enumerate(DRONE_FIELDS):
+            snapshot.arrays[name] = table[order, column].astype(dtype)
+
+    g = snapshot.globals
+    g["frame_count"] = sim.frame_count
+    g["enemies_neutralized"] = sim.enemies_neutralized
+    g["enemies_breached"] = sim.enemies_breached
+    g["friendly_losses"] = sim.friendly_losses
+    g["total_bids"] = sim.total_bids
+    g["spawn_queue"] = len(sim.spawn_queue)
+    g["last_breach_frame"] = sim.last_breach_frame
+    g["aegis_active"] = int(sim.aegis_active)
+    g["mission_complete"] = int(sim.mission_complete)
+    g["breach_response_active"] = int(sim.breach_response_active)
+    g["world_width"] = sim.width
+    g["world_height"] = sim.height
+    return snapshot
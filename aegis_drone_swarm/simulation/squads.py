@@ -0,0 +1,246 @@
+"""
+Hierarchical squad coordination.
+
+The flat protocol has every friendly score each visible enemy against the
+whole swarm and then resolve each bid against every friendly in
+communication range, so coordination work grows with the square of the
+swarm size. In hierarchical mode the friendlies are clustered into squads
+of bounded size (k-means on position, seeded from patrol points, redone
+every few ticks), and coordination happens at two levels:
+
+- Squad leaders run a top-level auction over enemy groups (the live
+  enemies clustered the same way, or the simulation's threat clusters
+  when it has a ThreatClusterer), each squad taking groups in reach
+  until it has an enemy per armed member.
+- Members run the regular auction inside their squad only, over the
+  enemies of the groups their squad won plus their own current targets,
+  so scoring and resolution scan squad peers instead of the swarm.
+
+Last-line-of-defense assignments and priority-threat detection stay
+global. Both modes report coordination work on one basis: the peer
+drones examined by bid scoring, target selection and resolution
+(Drone.peer_scans), plus here the point-to-centroid comparisons of the
+clustering and the squad-by-group pairs of the top-level auction.
+"""
+
+import math
+import time
+
+from simulation.models.drone import LOD_ASLEEP, Drone, Role
+
+
+def bounded_kmeans(points, seeds, capacity, iterations=4):
+    """Cluster (x, y) points around seeds with at most `capacity` points each.
+
+    Each pass assigns points greedily by ascending distance to the nearest
+    centroid that still has room, then moves every centroid to its
+    members' mean. Returns (labels, centroids, comparisons).
+    """
+    centroids = list(seeds)
+    labels = [0] * len(points)
+    comparisons = 0
+    for _ in range(iterations):
+        pairs = []
+        for i, (x, y) in enumerate(points):
+            for c, (cx, cy) in enumerate(centroids):
+                pairs.append(((x - cx) ** 2 + (y - cy) ** 2, i, c))
+        comparisons += len(pairs)
+        pairs.sort()
+        load = [0] * len(centroids)
+        assigned = [False] * len(points)
+        for _, i, c in pairs:
+            if not assigned[i] and load[c] < capacity:
+                assigned[i] = True
+                labels[i] = c
+                load[c] += 1
+
+        sums = [[0.0, 0.0, 0] for _ in centroids]
+        for (x, y), c in zip(points, labels):
+            total = sums[c]
+            total[0] += x
+            total[1] += y
+            total[2] += 1
+        moved = [(sx / n, sy / n) if n else centroids[c] for c, (sx, sy, n) in enumerate(sums)]
+        if moved == centroids:
+            break
+        centroids = moved
+    return labels, centroids, comparisons
+
+
+def spread_seeds(positions, k):
+    """k seed positions spread evenly through positions sorted along x."""
+    ordered = sorted(positions)
+    step = len(ordered) / k
+    return [ordered[int(i * step + step / 2)] for i in range(k)]
+
+
+class Squad:
+    """A leader and its members, with the enemies they coordinate over."""
+
+    __slots__ = ("members", "leader", "centroid", "radius", "enemies")
+
+    def __init__(self, members, centroid):
+        self.members = members
+        self.centroid = centroid
+        cx, cy = centroid
+        self.leader = min(members, key=lambda d: (d.x - cx) ** 2 + (d.y - cy) ** 2)
+        self.radius = max(math.hypot(d.x - cx, d.y - cy) for d in members)
+        self.enemies = []
+
+    @property
+    def capacity(self):
+        """Enemies the squad can take on: one per armed member."""
+        return sum(1 for d in self.members if d.health > 0 and d.ammo > 0)
+
+
+class SquadCoordinator:
+    """Runs the auction phase of the AEGIS protocol squad by squad."""
+
+    def __init__(self, max_squad_size=8, enemy_group_size=4, recluster_every=8):
+        self.max_squad_size = max_squad_size
+        self.enemy_group_size = enemy_group_size
+        self.recluster_every = recluster_every  # protocol ticks between squad re-clustering
+        self.squads = []
+        self.groups = []  # (centroid, enemies) of the current tick
+        self.ticks = 0
+        self.reclusters = 0
+        self._group_centroids = []
+
+    def reset(self):
+        """Forget squads and enemy groups so the next tick re-clusters (new episode)."""
+        self.squads = []
+        self.groups = []
+        self.ticks = 0
+        self._group_centroids = []
+
+    def form_squads(self, friendlies):
+        """Cluster friendlies into squads of at most max_squad_size, seeded from patrol points."""
+        k = math.ceil(len(friendlies) / self.max_squad_size)
+        seeds = spread_seeds([d.patrol_point for d in friendlies], k)
+        labels, centroids, comparisons = bounded_kmeans(
+            [(d.x, d.y) for d in friendlies], seeds, self.max_squad_size)
+        members = [[] for _ in centroids]
+        for drone, label in zip(friendlies, labels):
+            members[label].append(drone)
+        self.squads = [Squad(m, c) for m, c in zip(members, centroids) if m]
+        self.reclusters += 1
+        return comparisons
+
+    def group_enemies(self, enemies):
+        """Cluster enemies into groups, warm-started from last tick's groups."""
+        k = math.ceil(len(enemies) / self.enemy_group_size)
+        if len(self._group_centroids) == k:
+            seeds = self._group_centroids
+        else:
+            seeds = spread_seeds([(e.x, e.y) for e in enemies], k)
+        labels, centroids, comparisons = bounded_kmeans(
+            [(e.x, e.y) for e in enemies], seeds, self.enemy_group_size, iterations=2)
+        members = [[] for _ in centroids]
+        for enemy, label in zip(enemies, labels):
+            members[label].append(enemy)
+        self._group_centroids = centroids
+        self.groups = [(c, m) for c, m in zip(centroids, members) if m]
+        return comparisons
+
+    def leader_bid(self, squad, centroid, enemies, height):
+        """Cost for a squad leader to take an enemy group (inf when out of reach)."""
+        distance = math.hypot(centroid[0] - squad.centroid[0], centroid[1] - squad.centroid[1])
+        if distance > Drone.sensor_range + squad.radius:
+            return float('inf')
+        threat = max(e.y for e in enemies) / height  # closest member to the zone
+        return distance * (1.0 - threat * 0.6) / max(1, len(enemies))
+
+    def top_level_auction(self, height):
+        """Give every reachable enemy group to one squad; returns comparisons made."""
+        pairs = []
+        for s, squad in enumerate(self.squads):
+            squad.enemies = []
+            for g, (centroid, enemies) in enumerate(self.groups):
+                bid = self.leader_bid(squad, centroid, enemies, height)
+                if bid < float('inf'):
+                    pairs.append((bid, s, g))
+        pairs.sort()
+
+        won = [None] * len(self.groups)
+        capacity = [squad.capacity for squad in self.squads]
+        for _, s, g in pairs:
+            if won[g] is None and len(self.squads[s].enemies) < capacity[s]:
+                won[g] = s
+                self.squads[s].enemies.extend(self.groups[g][1])
+        # Groups nobody had room for go to their cheapest squad in reach
+        for _, s, g in pairs:
+            if won[g] is None:
+                won[g] = s
+                self.squads[s].enemies.extend(self.groups[g][1])
+        return len(self.squads) * len(self.groups)
+
+    def run(self, sim):
+        """Auction, resolve and assign squad by squad; mirrors the flat protocol stages."""
+        metrics = sim.metrics
+        started = time.perf_counter()
+        scans = Drone.peer_scans
+        friendlies = [f for f in sim.friendly_drones if f.health > 0]
+        enemies = [e for e in sim.enemy_drones if e.health > 0]
+        work = 0
+        stale = (sum(len(s.members) for s in self.squads) != len(friendlies)
+                 or any(d.health <= 0 for s in self.squads for d in s.members))
+        if self.ticks % self.recluster_every == 0 or stale:
+            self.squads = []
+            if friendlies:
+                work += self.form_squads(friendlies)
+        self.ticks += 1
+
+        self.groups = []
+        if sim.threat_clusters is not None:
+            # Threat clusters are already this tick's enemy groups
+            self.groups = [((c.x, c.y), c.members) for c in sim.threat_clusters.clusters]
+        elif enemies:
+            work += self.group_enemies(enemies)
+        work += self.top_level_auction(sim.height)
+
+        by_id = {e.id: e for e in enemies}
+        for squad in self.squads:
+            # Members keep sight of what they are already chasing
+            seen = {e.id for e in squad.enemies}
+            for member in squad.members:
+                target = by_id.get(member.assigned_target)
+                if target is not None and target.id not in seen:
+                    seen.add(target.id)
+                    squad.enemies.append(target)
+
+        # Sleeping LOD drones have nothing in range, as in the flat protocol
+        for squad in self.squads:
+            peers = squad.members
+            for friendly in peers:
+                if friendly.role != Role.LAST_DEFENSE and friendly.lod != LOD_ASLEEP:
+                    friendly.participate_in_auction(squad.enemies, peers)
+                    sim.total_bids += friendly.bid_count
+                    metrics.on_bids(friendly.bid_count)
+        auctioned = time.perf_counter()
+
+        for squad in self.squads:
+            for friendly in squad.members:
+                if friendly.role != Role.LAST_DEFENSE:
+                    friendly.resolve_auctions(squad.members)
+        resolved = time.perf_counter()
+
+        for squad in self.squads:
+            for friendly in squad.members:
+                if friendly.lod == LOD_ASLEEP:
+                    continue
+                # Last-line defenders were assigned globally and keep that target
+                local = sim.enemy_drones if friendly.role == Role.LAST_DEFENSE else squad.enemies
+                friendly.execute_assignment(local, squad.members)
+                metrics.on_assignment(friendly)
+        metrics.on_coordination(work + Drone.peer_scans - scans)
+        metrics.add_stage_time("auction", auctioned - started)
+        metrics.add_stage_time("resolve", resolved - auctioned)
+        metrics.add_stage_time("assign", time.perf_counter() - resolved)
+
+    def metrics(self):
+        return {
+            "squads": len(self.squads),
+            "groups": len(self.groups),
+            "reclusters": self.reclusters,
+            "mean_squad_size": round(sum(len(s.members) for s in self.squads) / max(1, len(self.squads)), 2),
+        }
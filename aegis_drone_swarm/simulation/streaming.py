@@ -0,0 +1,590 @@
+"""
+Delta-compressed binary state stream for remote viewers.
+
+The encoder turns Snapshots into records. Keyframes carry every drone in
+full; delta records in between carry only what changed since the previous
+record:
+
+    removed handles, added drones (full rows),
+    then, for every persisting drone in handle order, five change bitfields
+    (moved, role, target, health, status) followed by the values of the
+    set bits only. Movement is an int16 offset in 1/32 px units.
+
+Keyframes also carry the world size, so a viewer can size its world
+without being told out of band.
+
+Velocities are not sent in deltas: a drone's position change over the
+record interval is its velocity, so the decoder derives it.
+
+Records are framed with a 4-byte little-endian length. Files start with
+STREAM_MAGIC. Use ``python -m simulation.streaming record|serve|view``.
+"""
+
+import argparse
+import os
+import select
+import socket
+import struct
+import time
+from collections import deque
+
+import numpy as np
+
+from simulation.snapshot import HandleTable, Snapshot, capture_snapshot
+
+STREAM_MAGIC = b"AEGISSTR\x02\x00"
+RECORD_KEYFRAME = 0x4B  # "K"
+RECORD_DELTA = 0x44  # "D"
+
+POS_SCALE = 32.0
+VEL_SCALE = 4096.0
+INT16_MIN, INT16_MAX = -32768, 32767
+
+LENGTH = struct.Struct("<I")
+COUNT = struct.Struct("<I")
+GLOBALS = struct.Struct("<BIIIIIHiB")  # record type + globals
+WORLD = struct.Struct("<II")  # keyframes only: world width, height
+
+# Full drone rows, in wire column order
+ROW_COLUMNS = (
+    ("handle", "<u4"),
+    ("kind", "u1"),
+    ("xq", "<i4"),
+    ("yq", "<i4"),
+    ("vxq", "<i2"),
+    ("vyq", "<i2"),
+    ("health", "u1"),
+    ("ammo", "u1"),
+    ("role", "u1"),
+    ("target", "<u4"),
+    ("flags", "u1"),
+    ("timer", "<i2"),
+)
+ROW_BYTES = sum(np.dtype(dtype).itemsize for _, dtype in ROW_COLUMNS)
+
+FLAG_BREACH = 1
+FLAG_DESTROYED = 2
+
+
+def _quantize(snapshot):
+    """Wire-level integer columns for a snapshot."""
+    a = snapshot.arrays
+    return {
+        "handle": a["handle"].astype("<u4"),
+        "kind": a["kind"].astype("u1"),
+        "xq": np.rint(a["x"].astype(np.float64) * POS_SCALE).astype("<i4"),
+        "yq": np.rint(a["y"].astype(np.float64) * POS_SCALE).astype("<i4"),
+        "vxq": np.clip(np.rint(a["vx"] * VEL_SCALE), INT16_MIN, INT16_MAX).astype("<i2"),
+        "vyq": np.clip(np.rint(a["vy"] * VEL_SCALE), INT16_MIN, INT16_MAX).astype("<i2"),
+        "health": a["health"].astype("u1"),
+        "ammo": a["ammo"].astype("u1"),
+        "role": a["role"].astype("u1"),
+        "target": a["target"].astype("<u4"),
+        "flags": (a["breach"].astype("u1") * FLAG_BREACH) | (a["destroyed"].astype("u1") * FLAG_DESTROYED),
+        "timer": a["breach_timer"].astype("<i2"),
+    }
+
+
+def _take(columns, index):
+    return {name: values[index] for name, values in columns.items()}
+
+
+def _pack_rows(parts, columns):
+    parts.append(COUNT.pack(len(columns["handle"])))
+    for name, dtype in ROW_COLUMNS:
+        parts.append(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+
+
+def _unpack_rows(buffer, offset):
+    (count,) = COUNT.unpack_from(buffer, offset)
+    offset += COUNT.size
+    columns = {}
+    for name, dtype in ROW_COLUMNS:
+        columns[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).copy()
+        offset += count * np.dtype(dtype).itemsize
+    return columns, offset
+
+
+def _pack_globals(record_type, g):
+    flags = (int(g["aegis_active"]) << 0) | (int(g["mission_complete"]) << 1) | (int(g["breach_response_active"]) << 2)
+    return GLOBALS.pack(
+        record_type,
+        int(g["frame_count"]) & 0xFFFFFFFF,
+        int(g["enemies_neutralized"]),
+        int(g["enemies_breached"]),
+        int(g["friendly_losses"]),
+        min(int(g["total_bids"]), 0xFFFFFFFF),
+        min(int(g["spawn_queue"]), 0xFFFF),
+        int(g["last_breach_frame"]),
+        flags,
+    )
+
+
+def _unpack_globals(buffer):
+    (record_type, frame, neutralized, breached, losses, bids,
+     spawn_queue, last_breach, flags) = GLOBALS.unpack_from(buffer, 0)
+    g = {
+        "frame_count": frame,
+        "enemies_neutralized": neutralized,
+        "enemies_breached": breached,
+        "friendly_losses": losses,
+        "total_bids": bids,
+        "spawn_queue": spawn_queue,
+        "last_breach_frame": last_breach,
+        "aegis_active": flags & 1,
+        "mission_complete": (flags >> 1) & 1,
+        "breach_response_active": (flags >> 2) & 1,
+    }
+    return record_type, g
+
+
+class StateEncoder:
+    """Encodes successive Snapshots into keyframe and delta records."""
+
+    def __init__(self, keyframe_interval=60):
+        self.keyframe_interval = keyframe_interval
+        self.previous = None
+        self.previous_frame = None
+        self.last_keyframe_frame = None
+        self.records = 0
+        self.keyframes = 0
+        self.bytes_written = 0
+
+    def encode(self, snapshot, force_keyframe=False):
+        columns = _quantize(snapshot)
+        frame = snapshot.frame
+        if (force_keyframe or self.previous is None
+                or frame - self.last_keyframe_frame >= self.keyframe_interval
+                or frame <= self.previous_frame):
+            record = self._encode_keyframe(snapshot, columns)
+            self.last_keyframe_frame = frame
+            self.keyframes += 1
+        else:
+            record = self._encode_delta(snapshot, columns)
+        self.previous = columns
+        self.previous_frame = frame
+        self.records += 1
+        self.bytes_written += len(record)
+        return record
+
+    def _encode_keyframe(self, snapshot, columns):
+        g = snapshot.globals
+        parts = [_pack_globals(RECORD_KEYFRAME, g), WORLD.pack(int(g["world_width"]), int(g["world_height"]))]
+        _pack_rows(parts, columns)
+        return b"".join(parts)
+
+    def _encode_delta(self, snapshot, columns):
+        prev = self.previous
+        prev_handles, cur_handles = prev["handle"], columns["handle"]
+        in_current = np.isin(prev_handles, cur_handles, assume_unique=True)
+        in_previous = np.isin(cur_handles, prev_handles, assume_unique=True)
+
+        # Persisting rows line up because both sides are sorted by handle
+        p_prev = _take(prev, in_current)
+        p_cur = _take(columns, in_previous)
+        dx = p_cur["xq"].astype(np.int64) - p_prev["xq"]
+        dy = p_cur["yq"].astype(np.int64) - p_prev["yq"]
+        overflow = ((dx < INT16_MIN) | (dx > INT16_MAX) | (dy < INT16_MIN) | (dy > INT16_MAX)
+                    | (p_cur["kind"] != p_prev["kind"]))
+
+        # Rows that cannot be expressed as a delta are re-sent in full
+        removed = np.concatenate([prev_handles[~in_current], p_prev["handle"][overflow]])
+        added_mask = ~in_previous
+        added_mask[np.flatnonzero(in_previous)[overflow]] = True
+        keep = ~overflow
+        p_prev, p_cur = _take(p_prev, keep), _take(p_cur, keep)
+        dx, dy = dx[keep], dy[keep]
+
+        parts = [_pack_globals(RECORD_DELTA, snapshot.globals)]
+        parts.append(COUNT.pack(len(removed)))
+        parts.append(np.sort(removed).astype("<u4").tobytes())
+        _pack_rows(parts, _take(columns, added_mask))
+
+        moved = (dx != 0) | (dy != 0)
+        role_changed = p_cur["role"] != p_prev["role"]
+        target_changed = p_cur["target"] != p_prev["target"]
+        health_changed = p_cur["health"] != p_prev["health"]
+        status_changed = ((p_cur["ammo"] != p_prev["ammo"]) | (p_cur["flags"] != p_prev["flags"])
+                          | (p_cur["timer"] != p_prev["timer"]))
+        for bits in (moved, role_changed, target_changed, health_changed, status_changed):
+            parts.append(np.packbits(bits).tobytes())
+        parts.append(dx[moved].astype("<i2").tobytes())
+        parts.append(dy[moved].astype("<i2").tobytes())
+        parts.append(p_cur["role"][role_changed].astype("u1").tobytes())
+        parts.append(p_cur["target"][target_changed].astype("<u4").tobytes())
+        parts.append(p_cur["health"][health_changed].astype("u1").tobytes())
+        parts.append(p_cur["ammo"][status_changed].astype("u1").tobytes())
+        parts.append(p_cur["flags"][status_changed].astype("u1").tobytes())
+        parts.append(p_cur["timer"][status_changed].astype("<i2").tobytes())
+        return b"".join(parts)
+
+
+class StateDecoder:
+    """Rebuilds Snapshots from records produced by StateEncoder."""
+
+    def __init__(self):
+        self.state = None
+        self.frame = None
+        self.world = (0, 0)
+
+    def decode(self, record):
+        """Decode one record; returns None for deltas seen before any keyframe."""
+        record = memoryview(record)
+        record_type, g = _unpack_globals(record)
+        offset = GLOBALS.size
+        if record_type == RECORD_KEYFRAME:
+            self.world = WORLD.unpack_from(record, offset)
+            columns, _ = _unpack_rows(record, offset + WORLD.size)
+        elif record_type == RECORD_DELTA:
+            if self.state is None:
+                return None
+            columns = self._apply_delta(record, offset, g["frame_count"])
+        else:
+            raise ValueError(f"unknown record type {record_type:#x}")
+        self.state = columns
+        self.frame = g["frame_count"]
+        g["world_width"], g["world_height"] = self.world
+        return self._snapshot(columns, g)
+
+    def _apply_delta(self, record, offset, frame):
+        (removed_count,) = COUNT.unpack_from(record, offset)
+        offset += COUNT.size
+        removed = np.frombuffer(record, dtype="<u4", count=removed_count, offset=offset)
+        offset += removed_count * 4
+        added, offset = _unpack_rows(record, offset)
+
+        prev = self.state
+        keep = ~np.isin(prev["handle"], removed, assume_unique=True)
+        cur = {name: values[keep].copy() for name, values in prev.items()}
+        count = len(cur["handle"])
+        mask_bytes = (count + 7) // 8
+
+        bitfields = []
+        for _ in range(5):
+            bits = np.unpackbits(np.frombuffer(record, dtype=np.uint8, count=mask_bytes, offset=offset),
+                                 count=count).astype(bool)
+            bitfields.append(bits)
+            offset += mask_bytes
+        moved, role_changed, target_changed, health_changed, status_changed = bitfields
+
+        def read(dtype, n):
+            nonlocal offset
+            values = np.frombuffer(record, dtype=dtype, count=n, offset=offset)
+            offset += n * np.dtype(dtype).itemsize
+            return values
+
+        n_moved = int(moved.sum())
+        dx = read("<i2", n_moved).astype(np.int32)
+        dy = read("<i2", n_moved).astype(np.int32)
+        cur["xq"][moved] += dx
+        cur["yq"][moved] += dy
+        cur["role"][role_changed] = read("u1", int(role_changed.sum()))
+        cur["target"][target_changed] = read("<u4", int(target_changed.sum()))
+        cur["health"][health_changed] = read("u1", int(health_changed.sum()))
+        n_status = int(status_changed.sum())
+        cur["ammo"][status_changed] = read("u1", n_status)
+        cur["flags"][status_changed] = read("u1", n_status)
+        cur["timer"][status_changed] = read("<i2", n_status)
+
+        # Velocity is the displacement over the record interval
+        velocity_scale = VEL_SCALE / (POS_SCALE * max(1, frame - self.frame))
+        for name, delta in (("vxq", dx), ("vyq", dy)):
+            velocity = np.zeros(count, dtype=np.float64)
+            velocity[moved] = delta * velocity_scale
+            cur[name] = np.clip(np.rint(velocity), INT16_MIN, INT16_MAX).astype("<i2")
+
+        merged = {name: np.concatenate([cur[name], added[name].astype(cur[name].dtype)]) for name in cur}
+        order = np.argsort(merged["handle"], kind="stable")
+        return {name: values[order] for name, values in merged.items()}
+
+    def _snapshot(self, columns, g):
+        snapshot = Snapshot.empty(len(columns["handle"]))
+        a = snapshot.arrays
+        a["handle"] = columns["handle"].astype(np.uint32)
+        a["kind"] = columns["kind"].astype(np.uint8)
+        a["x"] = (columns["xq"] / POS_SCALE).astype(np.float32)
+        a["y"] = (columns["yq"] / POS_SCALE).astype(np.float32)
+        a["vx"] = (columns["vxq"] / VEL_SCALE).astype(np.float32)
+        a["vy"] = (columns["vyq"] / VEL_SCALE).astype(np.float32)
+        a["health"] = columns["health"].astype(np.uint8)
+        a["ammo"] = columns["ammo"].astype(np.uint8)
+        a["role"] = columns["role"].astype(np.uint8)
+        a["target"] = columns["target"].astype(np.uint32)
+        a["breach"] = (columns["flags"] & FLAG_BREACH).astype(np.uint8)
+        a["destroyed"] = ((columns["flags"] & FLAG_DESTROYED) >> 1).astype(np.uint8)
+        a["breach_timer"] = columns["timer"].astype(np.int16)
+        snapshot.globals.update(g)
+        return snapshot
+
+
+def frame_record(record):
+    return LENGTH.pack(len(record)) + record
+
+
+class FileSink:
+    """Appends framed records to a stream file."""
+
+    wants_keyframe = False
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.file.write(STREAM_MAGIC)
+
+    def write(self, record):
+        self.file.write(frame_record(record))
+
+    def close(self):
+        self.file.close()
+
+
+class _Viewer:
+    """One SocketSink connection and the framed records queued for it."""
+
+    def __init__(self, sock, now):
+        self.sock = sock
+        self.pending = deque()  # framed records, the first possibly part-sent
+        self.offset = 0  # bytes of pending[0] already sent
+        self.queued = 0  # unsent bytes
+        self.progress = now  # last time the socket took bytes, or the queue last filled from empty
+        self.resync = True  # waiting for a keyframe to start decoding from
+
+
+class SocketSink:
+    """Broadcasts framed records to every connected TCP viewer.
+
+    Sockets are non-blocking, so a slow viewer never stalls the simulation
+    thread: records queue per viewer and drain as its socket accepts them.
+    A viewer whose queue would pass max_buffer bytes falls behind - its
+    queued records are dropped (bar one already part-sent, to keep the
+    framing intact) and it skips the deltas until the next keyframe. One
+    that has no room for that keyframe either, or takes no bytes for
+    send_timeout seconds, is disconnected.
+
+    New viewers are accepted on each write; wants_keyframe tells the
+    publisher to start them off with a keyframe.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8766, send_timeout=1.0, max_buffer=1 << 20):
+        self.server = socket.create_server((host, port))
+        self.server.setblocking(False)
+        self.address = self.server.getsockname()
+        self.send_timeout = send_timeout
+        self.max_buffer = max_buffer
+        self.clients = []
+        self.wants_keyframe = False
+        self.skips = 0
+        self.dropped = 0
+
+    def _accept(self, now):
+        while select.select([self.server], [], [], 0)[0]:
+            try:
+                client, _ = self.server.accept()
+            except BlockingIOError:
+                break
+            client.setblocking(False)
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.clients.append(_Viewer(client, now))
+            self.wants_keyframe = True
+
+    def _drop(self, viewer):
+        viewer.sock.close()
+        self.clients.remove(viewer)
+        self.dropped += 1
+
+    def _fall_behind(self, viewer):
+        """Drop whatever has not started sending and wait for a keyframe."""
+        head = viewer.pending[0] if viewer.offset else None
+        viewer.pending.clear()
+        viewer.queued = 0
+        if head is not None:
+            viewer.pending.append(head)
+            viewer.queued = len(head) - viewer.offset
+        viewer.resync = True
+        self.skips += 1
+
+    def _flush(self, viewer, now):
+        """Send as much as the socket takes; False if the viewer was dropped."""
+        pending = viewer.pending
+        while pending:
+            head = pending[0]
+            try:
+                sent = viewer.sock.send(memoryview(head)[viewer.offset:])
+            except BlockingIOError:
+                break
+            except OSError:
+                self._drop(viewer)
+                return False
+            viewer.offset += sent
+            viewer.queued -= sent
+            viewer.progress = now
+            if viewer.offset == len(head):
+                pending.popleft()
+                viewer.offset = 0
+        if pending and now - viewer.progress > self.send_timeout:
+            self._drop(viewer)
+            return False
+        return True
+
+    def write(self, record):
+        data = frame_record(record)
+        keyframe = record[0] == RECORD_KEYFRAME
+        now = time.monotonic()
+        for viewer in self.clients[:]:
+            if viewer.resync and not keyframe:
+                pass  # skipping to the next keyframe
+            elif viewer.queued + len(data) <= self.max_buffer:
+                viewer.resync = False
+                if not viewer.pending:
+                    viewer.progress = now
+                viewer.pending.append(data)
+                viewer.queued += len(data)
+            elif viewer.resync:
+                self._drop(viewer)  # cannot catch up even from a keyframe
+                continue
+            else:
+                self._fall_behind(viewer)
+            self._flush(viewer, now)
+        self._accept(now)
+
+    def metrics(self):
+        return {
+            "clients": len(self.clients),
+            "queued_bytes": sum(viewer.queued for viewer in self.clients),
+            "skips": self.skips,
+            "dropped": self.dropped,
+        }
+
+    def close(self):
+        for viewer in self.clients:
+            viewer.sock.close()
+        self.server.close()
+
+
+class StreamPublisher:
+    """Captures, encodes and fans out the simulation state to sinks."""
+
+    def __init__(self, sim, sinks, keyframe_interval=60):
+        self.sim = sim
+        self.sinks = list(sinks)
+        self.encoder = StateEncoder(keyframe_interval)
+        self.handles = HandleTable()
+
+    def publish(self):
+        force = any(sink.wants_keyframe for sink in self.sinks)
+        record = self.encoder.encode(capture_snapshot(self.sim, self.handles), force_keyframe=force)
+        for sink in self.sinks:
+            sink.wants_keyframe = False
+            sink.write(record)
+        return record
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def read_stream_file(path):
+    """Yield records from a stream file."""
+    with open(path, "rb") as stream:
+        if stream.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+            raise ValueError(f"{path} is not an AEGIS state stream")
+        while True:
+            header = stream.read(LENGTH.size)
+            if len(header) < LENGTH.size:
+                return
+            (length,) = LENGTH.unpack(header)
+            yield stream.read(length)
+
+
+def read_stream_socket(host, port):
+    """Yield records received from a SocketSink."""
+    with socket.create_connection((host, port)) as connection:
+        reader = connection.makefile("rb")
+        while True:
+            header = reader.read(LENGTH.size)
+            if len(header) < LENGTH.size:
+                return
+            (length,) = LENGTH.unpack(header)
+            yield reader.read(length)
+
+
+def view(records, fps=60):
+    """Drive the regular pygame render() path from a record stream."""
+    import pygame
+    from simulation.simulation import AegisSimulation
+
+    viewer = None
+    decoder = StateDecoder()
+    cache = {}
+    for record in records:
+        snapshot = decoder.decode(record)
+        if snapshot is None:
+            continue
+        if viewer is None:
+            # The stream's world, in a default-sized window
+            viewer = AegisSimulation(int(snapshot.globals["world_width"]), int(snapshot.globals["world_height"]),
+                                     verbose=False, view_size=(1200, 800))
+        snapshot.apply_to(viewer, cache)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+                viewer.show_roles = not viewer.show_roles
+        viewer.render()
+        viewer.clock.tick(fps)
+    pygame.quit()
+
+
+def main():
+    from simulation.simulation import AegisSimulation
+
+    parser = argparse.ArgumentParser(description="AEGIS state streaming")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="run headless and record a stream file")
+    record.add_argument("path")
+    record.add_argument("--frames", type=int, default=3600)
+    record.add_argument("--seed", type=int)
+    record.add_argument("--keyframe-interval", type=int, default=60)
+    serve = commands.add_parser("serve", help="run headless and stream to TCP viewers")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8766)
+    serve.add_argument("--seed", type=int)
+    show = commands.add_parser("view", help="render a stream file or live socket")
+    source = show.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file")
+    source.add_argument("--connect", metavar="HOST:PORT")
+    args = parser.parse_args()
+
+    if args.command == "view":
+        if args.file:
+            view(read_stream_file(args.file))
+        else:
+            host, port = args.connect.rsplit(":", 1)
+            view(read_stream_socket(host, int(port)))
+        return
+
+    sim = AegisSimulation(headless=True, verbose=False, seed=args.seed)
+    if args.command == "record":
+        publisher = StreamPublisher(sim, [FileSink(args.path)], args.keyframe_interval)
+        for _ in range(args.frames):
+            sim.update()
+            publisher.publish()
+        publisher.close()
+        size = os.path.getsize(args.path)
+        print(f"Recorded {args.frames} frames to {args.path} ({size / args.frames:.0f} bytes/frame)")
+    else:
+        sink = SocketSink(args.host, args.port)
+        publisher = StreamPublisher(sim, [sink])
+        print(f"Streaming on {sink.address[0]}:{sink.address[1]}", flush=True)
+        try:
+            while True:
+                started = time.perf_counter()
+                sim.update()
+                publisher.publish()
+                time.sleep(max(0.0, 1 / 60 - (time.perf_counter() - started)))
+        except KeyboardInterrupt:
+            publisher.close()
+
+
+if __name__ == "__main__":
+    main()
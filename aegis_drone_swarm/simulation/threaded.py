@@ -0,0 +1,163 @@
+"""
+Threaded run mode: the simulation steps on a worker thread while the
+pygame main thread renders.
+
+The worker captures a Snapshot (fresh NumPy arrays, never mutated
+afterwards) after every step and publishes it through a SnapshotBuffer, so
+the viewer always has one complete frame to draw and neither side waits
+for the other. The viewer materializes the latest snapshot on its own
+AegisSimulation with Snapshot.apply_to() and draws it with the regular
+render() path. Key presses that change the simulation are forwarded to the
+worker as command names on a deque, whose append/popleft are atomic and
+need no lock.
+"""
+
+import threading
+import time
+from collections import deque
+
+from simulation.snapshot import HandleTable, capture_snapshot
+
+
+class SnapshotBuffer:
+    """Double buffer between one writer and one reader.
+
+    ready holds the newest complete snapshot, front the one the reader is
+    drawing. Snapshots are never mutated after publishing, so the writer
+    never needs a slot back and the exchange is two reference swaps; the
+    lock guards only those, never a copy or a render.
+    """
+
+    def __init__(self):
+        self._ready = None
+        self._front = None
+        self._fresh = False
+        self._swap = threading.Lock()
+        self.published = 0
+        self.taken = 0
+
+    def publish(self, snapshot):
+        with self._swap:
+            self._ready = snapshot
+            self._fresh = True
+        self.published += 1
+
+    def latest(self):
+        """Newest complete snapshot (None before the first publish)."""
+        with self._swap:
+            if self._fresh:
+                self._front = self._ready
+                self._fresh = False
+                self.taken += 1
+        return self._front
+
+
+def apply_command(sim, command):
+    """Simulation-side effect of a forwarded key press."""
+    if command == "reset":
+        sim.reset_simulation()
+    elif command == "add_enemies":
+        sim.add_enemy_drones(3)
+    elif command == "toggle_aegis":
+        sim.aegis_active = not sim.aegis_active
+        sim.on_aegis_toggle()
+        sim.log(f"Aegis Protocol: {'ACTIVE' if sim.aegis_active else 'STANDBY'}")
+    else:
+        raise ValueError(f"unknown command: {command!r}")
+
+
+class SimulationThread(threading.Thread):
+    """Steps a simulation and publishes a snapshot after every step.
+
+    steps_per_second paces the worker (None runs it flat out).
+    """
+
+    def __init__(self, sim, buffer, commands, steps_per_second=60):
+        super().__init__(name="aegis-simulation", daemon=True)
+        self.sim = sim
+        self.buffer = buffer
+        self.commands = commands
+        self.steps_per_second = steps_per_second
+        self.handles = HandleTable()
+        self.steps = 0
+        self.step_ms = 0.0
+        self._stop_requested = threading.Event()
+
+    def stop(self):
+        self._stop_requested.set()
+
+    def run(self):
+        period = 1 / self.steps_per_second if self.steps_per_second else 0.0
+        next_step = time.perf_counter()
+        while not self._stop_requested.is_set():
+            while self.commands:
+                apply_command(self.sim, self.commands.popleft())
+            started = time.perf_counter()
+            self.sim.update()
+            self.buffer.publish(capture_snapshot(self.sim, self.handles))
+            self.steps += 1
+            self.step_ms = (time.perf_counter() - started) * 1000
+            if period:
+                next_step = max(next_step + period, time.perf_counter() - period)
+                delay = next_step - time.perf_counter()
+                if delay > 0:
+                    self._stop_requested.wait(delay)
+
+
+KEY_COMMANDS = {
+    "r": "reset",
+    "space": "add_enemies",
+    "a": "toggle_aegis",
+}
+
+
+def run_threaded(sim, fps=60, steps_per_second=60):
+    """Render sim from the main thread while it steps on a worker."""
+    import pygame
+    from simulation.rendering import handle_camera_event, pan_with_keys
+    from simulation.simulation import AegisSimulation
+
+    viewer = AegisSimulation(sim.width, sim.height, headless=True, verbose=False)
+    viewer.screen = sim.screen
+    viewer.show_debug = sim.show_debug
+    viewer.show_roles = sim.show_roles
+
+    buffer = SnapshotBuffer()
+    commands = deque()
+    worker = SimulationThread(sim, buffer, commands, steps_per_second)
+    worker.start()
+
+    clock = pygame.time.Clock()
+    cache = {}
+    shown = None
+    try:
+        while sim.running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    sim.running = False
+                elif event.type == pygame.KEYDOWN:
+                    name = pygame.key.name(event.key)
+                    if event.key == pygame.K_ESCAPE:
+                        sim.running = False
+                    elif event.key == pygame.K_d:
+                        viewer.show_debug = not viewer.show_debug
+                    elif event.key == pygame.K_t:
+                        viewer.show_roles = not viewer.show_roles
+                    elif name in KEY_COMMANDS:
+                        commands.append(KEY_COMMANDS[name])
+                    else:
+                        handle_camera_event(viewer, event)
+                else:
+                    handle_camera_event(viewer, event)
+            pan_with_keys(viewer)
+
+            snapshot = buffer.latest()
+            if snapshot is not None and snapshot is not shown:
+                snapshot.apply_to(viewer, cache)
+                shown = snapshot
+            if shown is not None:
+                viewer.render()
+            clock.tick(fps)
+    finally:
+        worker.stop()
+        worker.join()
@@ -0,0 +1,263 @@
+"""
+Enemy threat clustering for saturation waves.
+
+Dense waves arrive as tight groups, and bidding on each enemy separately
+makes every friendly score every member of every group it can see. With
+a ThreatClusterer set, enemies are clustered once per protocol tick on a
+grid: cells are a few engagement ranges wide, cells holding at least
+`min_density` enemies are dense and merge with adjacent dense cells while
+the cluster stays within `max_extent`, and the rest become single-enemy
+clusters. Then:
+
+- Friendlies bid once per visible cluster. A cluster takes as many
+  pursuers as it has members; a friendly wins a cluster when fewer peers
+  in communication range bid lower, and keeps its cheapest win.
+- Per-enemy bidding and resolution run only among each cluster's winners
+  over that cluster's members.
+- Friendlies that win no cluster fall back to select_target() over the
+  visible members of clusters still short of pursuers, and hold in
+  reserve when there are none.
+- identify_priority_threats() skips clusters that at least two friendlies
+  see whole (in range and, with a World set, unoccluded), which cannot
+  hold an isolated threat.
+"""
+
+import math
+import time
+
+from simulation.models.drone import LOD_ASLEEP, Drone, Role
+
+
+class ThreatCluster:
+    """Enemies close enough to be bid on as one; quacks like a drone for scoring."""
+
+    __slots__ = ("id", "members", "member_ids", "x", "y", "velocity_x", "velocity_y",
+                 "radius", "health")
+
+    def __init__(self, cluster_id, members):
+        count = len(members)
+        self.id = cluster_id
+        self.members = members
+        self.member_ids = {e.id for e in members}
+        self.x = sum(e.x for e in members) / count
+        self.y = sum(e.y for e in members) / count
+        self.velocity_x = sum(e.velocity_x for e in members) / count
+        self.velocity_y = sum(e.velocity_y for e in members) / count
+        self.radius = max(math.hypot(e.x - self.x, e.y - self.y) for e in members)
+        self.health = 1
+
+
+class ThreatClusterer:
+    """Per-tick grid density clustering of enemies and cluster-first bidding."""
+
+    def __init__(self, cell_size=Drone.engagement_range * 3, min_density=2,
+                 max_extent=Drone.sensor_range / 2):
+        self.cell_size = cell_size
+        self.min_density = min_density
+        self.max_extent = max_extent  # widest a merged cluster's bounding box may get, px
+        self.clusters = []
+        self.cluster_bids = 0
+        self.member_bids = 0
+
+    def update(self, enemies):
+        """Recluster the live enemies."""
+        size = self.cell_size
+        cells = {}
+        for enemy in enemies:
+            if enemy.health > 0:
+                cells.setdefault((int(enemy.x // size), int(enemy.y // size)), []).append(enemy)
+
+        span = max(1, int(self.max_extent // size))
+        groups = []
+        merged = set()
+        for cell, members in cells.items():
+            if cell in merged:
+                continue
+            if len(members) < self.min_density:
+                groups.extend([enemy] for enemy in members)
+                continue
+            # Flood fill over adjacent dense cells within the extent limit
+            merged.add(cell)
+            group = list(members)
+            low_x = high_x = cell[0]
+            low_y = high_y = cell[1]
+            frontier = [cell]
+            while frontier:
+                cx, cy = frontier.pop()
+                for nx in (cx - 1, cx, cx + 1):
+                    for ny in (cy - 1, cy, cy + 1):
+                        neighbour = (nx, ny)
+                        if neighbour in merged:
+                            continue
+                        others = cells.get(neighbour)
+                        if others is None or len(others) < self.min_density:
+                            continue
+                        if (max(high_x, nx) - min(low_x, nx) >= span
+                                or max(high_y, ny) - min(low_y, ny) >= span):
+                            continue
+                        merged.add(neighbour)
+                        group.extend(others)
+                        low_x, high_x = min(low_x, nx), max(high_x, nx)
+                        low_y, high_y = min(low_y, ny), max(high_y, ny)
+                        frontier.append(neighbour)
+            groups.append(group)
+
+        # Negative ids keep cluster bids apart from enemy ids in the bid table
+        self.clusters = [ThreatCluster(-1 - i, group) for i, group in enumerate(groups)]
+        return self.clusters
+
+    def isolation_candidates(self, friendly_drones):
+        """Enemies that may be isolated: members of clusters not seen whole by two friendlies.
+
+        Seeing a cluster whole means every member is in sensor range (the
+        cluster lies within reach) and, with a World set, none is occluded
+        (can_see() for each member, via Drone.hidden).
+        """
+        candidates = []
+        for cluster in self.clusters:
+            if max(e.y for e in cluster.members) <= cluster.members[0].bounds.height - 400:
+                continue
+            reach = Drone.sensor_range - cluster.radius
+            covering = 0
+            if reach >= 0:
+                for friendly in friendly_drones:
+                    if friendly.health > 0 and friendly.distance_to(cluster) <= reach and (
+                            not friendly.hidden or friendly.hidden.isdisjoint(cluster.member_ids)):
+                        covering += 1
+                        if covering >= 2:
+                            break
+            if covering < 2:
+                candidates.extend(cluster.members)
+        return candidates
+
+    def cluster_bid(self, friendly, cluster, friendly_drones, targeters):
+        """calculate_bid() for a whole cluster, measured to its nearest edge."""
+        if friendly.ammo <= 0 or friendly.health <= 0 or friendly.is_destroyed:
+            return float('inf')
+        distance = max(0.0, friendly.distance_to(cluster) - cluster.radius)
+        if distance > friendly.sensor_range:
+            return float('inf')
+
+        isolation_level = friendly.calculate_isolation_level(cluster, friendly_drones)
+        threat_priority = friendly.calculate_threat_priority(cluster, friendly_drones)
+        weights = friendly.bid_weights
+        cost = distance * weights.distance
+        cost *= 1.0 - (isolation_level * weights.isolation)
+        # Over-targeting only once every member has a pursuer
+        share = targeters / len(cluster.members)
+        if share >= 1:
+            cost *= 1.0 + (share * weights.over_targeting)
+        cost *= 1.0 - (threat_priority * weights.threat)
+        cost *= (1.0 - (friendly.ammo / 30.0))
+        cost *= (friendly.health / 100.0)
+        if friendly.breach_response_mode:
+            cost *= weights.breach_response
+        if friendly.assigned_target in cluster.member_ids:
+            cost *= weights.commitment
+        return max(0.1, cost)
+
+    def run_auction(self, sim):
+        """Cluster auction, then per-enemy auctions inside won clusters."""
+        metrics = sim.metrics
+        started = time.perf_counter()
+        scans = Drone.peer_scans
+        friendlies = sim.friendly_drones
+        targeters = {}
+        for friendly in friendlies:
+            if friendly.health > 0 and friendly.assigned_target is not None:
+                targeters[friendly.assigned_target] = targeters.get(friendly.assigned_target, 0) + 1
+        cluster_targeters = [sum(targeters.get(i, 0) for i in c.member_ids) for c in self.clusters]
+
+        # Sleeping LOD drones have nothing in range
+        bidders = [f for f in friendlies
+                   if f.health > 0 and f.role != Role.LAST_DEFENSE and f.lod != LOD_ASLEEP]
+        bids = 0
+        for friendly in bidders:
+            friendly.clear_bids()
+            friendly.determine_role(sim.enemy_drones)
+            for cluster, pursuers in zip(self.clusters, cluster_targeters):
+                bid = self.cluster_bid(friendly, cluster, friendlies, pursuers)
+                if bid < float('inf'):
+                    friendly.add_bid(cluster, bid, None, 0.0)
+            bids += friendly.bid_count
+        self.cluster_bids += bids
+
+        # A cluster takes one pursuer per member, lowest bids first
+        winners = {}
+        for friendly in bidders:
+            won = None
+            for cluster, my_bid in sorted(friendly.iter_bids(), key=lambda pair: pair[1]):
+                Drone.peer_scans += len(friendlies)
+                lower = 0
+                for other in friendlies:
+                    if other is friendly or other.health <= 0 or other.is_destroyed:
+                        continue
+                    if friendly.distance_to(other) > friendly.communication_range:
+                        continue
+                    other_bid = other.bid_for(cluster.id)
+                    if other_bid is not None and other_bid < my_bid:
+                        lower += 1
+                if lower < len(cluster.members):
+                    won = cluster
+                    break
+            if won is not None:
+                winners.setdefault(won.id, (won, []))[1].append(friendly)
+        auctioned = time.perf_counter()
+
+        member_bids = 0
+        for cluster, squad in winners.values():
+            for friendly in squad:
+                friendly.participate_in_auction(cluster.members, squad)
+                member_bids += friendly.bid_count
+            for friendly in squad:
+                friendly.resolve_auctions(squad)
+        self.member_bids += member_bids
+        bids += member_bids
+        sim.total_bids += bids
+        metrics.on_bids(bids)
+        resolved = time.perf_counter()
+
+        for cluster, squad in winners.values():
+            for friendly in squad:
+                friendly.execute_assignment(cluster.members, squad)
+                metrics.on_assignment(friendly)
+        assigned = {f for _, squad in winners.values() for f in squad}
+
+        # Pursuers each cluster still lacks after the winners
+        cluster_of = {}
+        lacking = {}
+        for cluster in self.clusters:
+            lacking[cluster.id] = len(cluster.members)
+            for enemy_id in cluster.member_ids:
+                cluster_of[enemy_id] = cluster
+        for friendly in assigned:
+            cluster = cluster_of.get(friendly.assigned_target)
+            if cluster is not None:
+                lacking[cluster.id] -= 1
+        open_enemies = [e for c in self.clusters if lacking[c.id] > 0 for e in c.members]
+
+        for friendly in friendlies:
+            if friendly.health > 0 and friendly.lod != LOD_ASLEEP and friendly not in assigned:
+                # Last-line defenders keep their global target; reserves pick
+                # among visible enemies of clusters still short of pursuers
+                last_defense = friendly.role == Role.LAST_DEFENSE
+                friendly.clear_bids()
+                friendly.execute_assignment(sim.enemy_drones if last_defense else open_enemies, friendlies)
+                metrics.on_assignment(friendly)
+                cluster = cluster_of.get(friendly.assigned_target)
+                if cluster is not None and lacking[cluster.id] > 0:
+                    lacking[cluster.id] -= 1
+                    if not lacking[cluster.id]:
+                        open_enemies = [e for e in open_enemies if e.id not in cluster.member_ids]
+        metrics.on_coordination(Drone.peer_scans - scans)
+        metrics.add_stage_time("auction", auctioned - started)
+        metrics.add_stage_time("resolve", resolved - auctioned)
+        metrics.add_stage_time("assign", time.perf_counter() - resolved)
+
+    def metrics(self):
+        return {
+            "clusters": len(self.clusters),
+            "largest": max((len(c.members) for c in self.clusters), default=0),
+            "cluster_bids": self.cluster_bids,
+            "member_bids": self.member_bids,
+        }
@@ -0,0 +1,30 @@
+"""Steady-state stepping must not accumulate memory frame after frame."""
+
+import pytest
+
+from simulation.alloc_profile import STAGES, AllocationProfiler
+from simulation.scenarios import saturation_wave
+
+MAX_NET_PER_TICK = 256  # bytes, as benchmarks/allocations.py allows
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_steady_state_net_bytes_per_tick(seed):
+    sim = saturation_wave(20, 60, 6, 15.0, seed)
+    sim.steady_state = True
+    for _ in range(200):  # bid storage and pools grow to size, the wave closes in
+        sim.update()
+    profiler = AllocationProfiler()
+    profiler.start()
+    sim.alloc_profiler = profiler
+    try:
+        for _ in range(200):
+            sim.update()
+    finally:
+        sim.alloc_profiler = None
+        profiler.stop()
+
+    metrics = profiler.metrics()
+    assert metrics["ticks"] == 200
+    assert set(metrics["net_per_tick"]) == set(STAGES)
+    assert sum(metrics["net_per_tick"].values()) <= MAX_NET_PER_TICK
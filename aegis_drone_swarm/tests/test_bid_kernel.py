@@ -0,0 +1,75 @@
+"""BidKernel must reproduce the scalar auction bit for bit."""
+
+import random
+
+import pytest
+
+from simulation.bid_kernel import BidKernel
+from simulation.models.drone import Drone
+from simulation.scenarios import saturation_wave
+
+
+def random_swarm(rng):
+    """Dead, unarmed, breaching, committed and occluded drones; coarse grids give ties."""
+    friendlies, enemies = [], []
+    grid = rng.choice((1.0, 25.0))
+    for i in range(rng.randint(0, 25)):
+        enemy = Drone(round(rng.uniform(0, 1200) / grid) * grid, round(rng.uniform(0, 800) / grid) * grid,
+                      "enemy", i, rng=rng)
+        enemy.velocity_x, enemy.velocity_y = rng.uniform(-0.3, 0.3), rng.uniform(-0.3, 0.3)
+        if rng.random() < 0.15:
+            enemy.health = 0
+        enemies.append(enemy)
+    for i in range(rng.randint(1, 20)):
+        friendly = Drone(round(rng.uniform(0, 1200) / grid) * grid, round(rng.uniform(0, 800) / grid) * grid,
+                         "friendly", i, rng=rng)
+        friendly.health = rng.choice((0, 20, 60, 100, 100))
+        friendly.ammo = rng.choice((0, 2, 7, 15))
+        friendly.breach_response_mode = rng.random() < 0.3
+        if enemies and rng.random() < 0.5:
+            friendly.assigned_target = rng.choice(enemies).id
+        elif rng.random() < 0.1:
+            friendly.assigned_target = 999  # not in the enemy list
+        if enemies and rng.random() < 0.2:
+            friendly.hidden = {rng.choice(enemies).id for _ in range(3)}
+        friendlies.append(friendly)
+    return friendlies, enemies
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_bids_match_calculate_bid(seed):
+    friendlies, enemies = random_swarm(random.Random(seed))
+    kernel = BidKernel()
+    kernel.build(friendlies, enemies)
+    for i, friendly in enumerate(friendlies):
+        for j, enemy in enumerate(enemies):
+            assert kernel.bids[i, j] == friendly.calculate_bid(enemy, friendlies)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_select_target_matches_drone(seed):
+    friendlies, enemies = random_swarm(random.Random(seed))
+    kernel = BidKernel()
+    kernel.build(friendlies, enemies)
+    for friendly in friendlies:
+        if friendly.health <= 0:
+            continue
+        # Score against the scalar choice with targeter counts as they stand
+        expected = friendly.select_target(enemies, friendlies)
+        counts = kernel.targeters.copy()
+        assert kernel.select_target(friendly) is expected
+        kernel.targeters = counts
+
+
+def test_lockstep_with_scalar_auction():
+    plain = saturation_wave(20, 60, 6, 15.0, 0)
+    fast = saturation_wave(20, 60, 6, 15.0, 0)
+    fast.bid_kernel = BidKernel()
+    for _ in range(300):
+        plain.update()
+        fast.update()
+        a = [(d.id, d.x, d.y, d.health, d.assigned_target, d.role) for d in plain.all_drones()]
+        b = [(d.id, d.x, d.y, d.health, d.assigned_target, d.role) for d in fast.all_drones()]
+        assert a == b, f"diverged at frame {plain.frame_count}"
+        assert plain.total_bids == fast.total_bids
+    assert plain.total_bids > 0
@@ -0,0 +1,59 @@
+"""Swept engagement detection must catch tunnelling and agree with the discrete test."""
+
+import pytest
+
+from simulation.engagement import EngagementDetector, first_contact_time
+from simulation.models.drone import Drone
+from simulation.scenarios import saturation_wave
+
+
+def moved(drone_type, drone_id, start, end):
+    drone = Drone(end[0], end[1], drone_type, drone_id)
+    drone.prev_x, drone.prev_y = start
+    return drone
+
+
+def test_tunnelling_pair_caught_mid_frame():
+    # Starts 50 px short and ends 50 px past a target 5 px off its path
+    t = first_contact_time(0, 0, 100, 0, 50, 5, 50, 5, 10)
+    assert t == pytest.approx((50 - 75 ** 0.5) / 100)
+    # Neither end of the frame is within range, so an end-of-frame test misses it
+    assert t is not None and 0 < t < 1
+
+
+def test_no_contact():
+    assert first_contact_time(0, 0, 100, 0, 50, 30, 50, 30, 10) is None  # passes wide
+    assert first_contact_time(0, 0, -10, 0, 20, 0, 30, 0, 10) is None  # moving apart
+    assert first_contact_time(0, 0, 5, 0, 5, 50, 10, 50, 10) is None  # same velocity
+    assert first_contact_time(0, 0, 9, 0, 20, 0, 20, 0, 10) is None  # range reached after the frame
+
+
+def test_contact_at_frame_bounds():
+    assert first_contact_time(0, 0, 10, 0, 5, 0, 5, 0, 10) == 0.0  # already in range
+    assert first_contact_time(0, 0, 10, 0, 20, 0, 20, 0, 10) == 1.0  # in range exactly at the end
+
+
+def test_detector_reports_assigned_tunnelling_pair():
+    friendly = moved("friendly", 1, (0.0, 0.0), (100.0, 0.0))
+    enemy = moved("enemy", 7, (50.0, 5.0), (50.0, 5.0))
+    bystander = moved("enemy", 8, (50.0, -5.0), (50.0, -5.0))
+    detector = EngagementDetector(engagement_range=10)
+    assert detector.detect([friendly], [enemy, bystander]) == []  # no assignment, no contact
+
+    friendly.assigned_target = enemy.id
+    contacts = detector.detect([friendly], [enemy, bystander])
+    assert [(c.friendly, c.enemy) for c in contacts] == [(friendly, enemy)]
+    assert 0 < contacts[0].time < 1
+
+
+def test_swept_matches_discrete_for_slow_movers():
+    swept = saturation_wave(20, 60, 6, 15.0, 0)
+    discrete = saturation_wave(20, 60, 6, 15.0, 0)
+    discrete.engagement_mode = "discrete"
+    for _ in range(900):
+        swept.update()
+        discrete.update()
+        a = [(d.id, d.x, d.y, d.health) for d in swept.all_drones()]
+        b = [(d.id, d.x, d.y, d.health) for d in discrete.all_drones()]
+        assert a == b, f"diverged at frame {swept.frame_count}"
+    assert swept.enemies_neutralized == discrete.enemies_neutralized > 0
@@ -0,0 +1,26 @@
+"""ProtocolScheduler configuration and bookkeeping."""
+
+import pytest
+
+from simulation.bid_kernel import BidKernel
+from simulation.scenarios import saturation_wave
+from simulation.scheduler import ProtocolScheduler
+
+
+def test_rejects_alternative_auctions():
+    sim = saturation_wave(20, 60, 6, 15.0, 0)
+    sim.protocol_scheduler = ProtocolScheduler()
+    sim.bid_kernel = BidKernel()
+    with pytest.raises(ValueError):
+        sim.update()
+
+
+def test_urgent_keyed_by_drone_id():
+    sim = saturation_wave(20, 60, 6, 15.0, 0)
+    scheduler = sim.protocol_scheduler = ProtocolScheduler(budget_ms=50.0)
+    responder = sim.friendly_drones[0]
+    responder.breach_response_mode = True
+    responder.breach_response_timer = 1000
+    for _ in range(16):
+        sim.update()
+    assert scheduler.urgent == {responder.id}
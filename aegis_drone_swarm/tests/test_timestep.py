@@ -0,0 +1,34 @@
+"""A coarse dt must follow the 1/60 s reference trajectory."""
+
+import math
+
+import pytest
+
+from simulation.models.drone import Drone
+from simulation.physics import REFERENCE_DT, Integrator
+
+
+def fly(dt, integrator, target, seconds):
+    drone = Drone(200.0, 400.0, "friendly", 0)
+    drone.target_x, drone.target_y = target
+    for _ in range(round(seconds / dt)):
+        drone.move(1200, 800, dt=dt, integrator=integrator)
+    return drone
+
+
+@pytest.mark.parametrize("method", Integrator.METHODS)
+@pytest.mark.parametrize("target, seconds, tolerance", [
+    ((1100.0, 400.0), 10.0, 1.0),  # cruising: terminal speed must match
+    ((260.0, 360.0), 3.0, 1.0),  # steering from rest onto a nearby point
+])
+def test_coarse_step_tracks_reference(method, target, seconds, tolerance):
+    reference = fly(REFERENCE_DT, None, target, seconds)
+    coarse = fly(1 / 10, Integrator(method), target, seconds)
+    assert math.hypot(coarse.x - reference.x, coarse.y - reference.y) < tolerance
+
+
+def test_terminal_speed_independent_of_dt():
+    speeds = [math.hypot(d.velocity_x, d.velocity_y)
+              for d in (fly(dt, Integrator(), (1100.0, 400.0), 5.0) for dt in (REFERENCE_DT, 1 / 10, 1 / 4))]
+    assert speeds[0] == pytest.approx(Drone.max_speed_pixels * 0.97)
+    assert speeds[1] == pytest.approx(speeds[0]) and speeds[2] == pytest.approx(speeds[0])